@@ -0,0 +1,478 @@
+"""
+Автопилоты «Змейки» и их массовая проверка на нескольких процессах.
+
+Каждая партия играется движком snake_engine без окна. Партии делятся
+между процессами по номерам, у каждой партии своё зерно (seed + номер),
+поэтому итог не зависит от числа процессов. Результаты партий приходят
+через очередь пачками и сразу учитываются в потоковой статистике с
+гистограммами: в памяти не хранится список всех партий.
+
+Запуск: python autopilot.py --policy bfs --games 10000 --workers 4
+"""
+import argparse
+import multiprocessing
+import os
+import time
+import traceback
+from collections import deque
+
+from snake_engine import (DOWN, EVENT_COLLISION, EVENT_WIN, GRID_HEIGHT,
+                          GRID_WIDTH, LEFT, OPPOSITE, RIGHT, UP, Game)
+
+# Сколько результатов процесс накапливает перед отправкой в очередь:
+RESULTS_CHUNK = 64
+
+# Поля результата одной партии (в этом порядке передаются через очередь):
+RESULT_FIELDS = ('seed', 'length', 'record', 'steps', 'wins', 'collisions')
+
+
+def greedy_policy(game):
+    """
+    Простейший автопилот: поворачивает в сторону яблока.
+
+    Учитывает переход через края поля и не разворачивается назад.
+
+    Аргументы:
+        game (Game): Партия.
+
+    Возвращает:
+        tuple: Направление движения или None.
+    """
+    snake = game.snake
+    head_x, head_y = snake.get_head_position()
+    apple_x, apple_y = game.apple.position
+    dx = (apple_x - head_x) % snake.width
+    dy = (apple_y - head_y) % snake.height
+    if dx:
+        direction = RIGHT if dx <= snake.width // 2 else LEFT
+    elif dy:
+        direction = DOWN if dy <= snake.height // 2 else UP
+    else:
+        return None
+    if direction == OPPOSITE[snake.direction]:
+        direction = UP if direction in (LEFT, RIGHT) else RIGHT
+    return direction
+
+
+def make_bfs_policy(width=GRID_WIDTH, height=GRID_HEIGHT):
+    """
+    Создаёт автопилот по кратчайшему пути к яблоку в обход тела.
+
+    Путь ищется поиском в ширину по клеткам-числам y * width + x с
+    заранее построенной таблицей соседей. Клетка хвоста считается
+    свободной: за ход хвост её покинет. Если пути к яблоку нет, змейка
+    идёт в любую безопасную соседнюю клетку.
+
+    Аргументы:
+        width (int): Ширина поля в клетках.
+        height (int): Высота поля в клетках.
+
+    Возвращает:
+        callable: Функция game -> направление.
+
+    Сложность: O(W * H) на ход.
+    """
+    directions = (UP, DOWN, LEFT, RIGHT)
+    neighbours = [
+        [((x + dx) % width + (y + dy) % height * width, (dx, dy))
+         for dx, dy in directions]
+        for y in range(height) for x in range(width)
+    ]
+
+    def bfs_policy(game):
+        """Возвращает первый ход кратчайшего пути к яблоку."""
+        snake = game.snake
+        blocked = bytearray(width * height)
+        for x, y in snake.occupied:
+            blocked[y * width + x] = 1
+        tail_x, tail_y = snake.positions[-1]
+        blocked[tail_y * width + tail_x] = 0
+        head_x, head_y = snake.positions[0]
+        apple_x, apple_y = game.apple.position
+        target = apple_y * width + apple_x
+        reverse = None
+        if len(snake.positions) > 1:
+            reverse = OPPOSITE[snake.direction]
+
+        # Первый ход из головы для каждой достигнутой клетки
+        first_move = {}
+        for cell, direction in neighbours[head_y * width + head_x]:
+            if direction != reverse and not blocked[cell]:
+                blocked[cell] = 1
+                first_move[cell] = direction
+        queue = deque(first_move)
+        while queue:
+            cell = queue.popleft()
+            if cell == target:
+                return first_move[cell]
+            move = first_move[cell]
+            for neighbour, _ in neighbours[cell]:
+                if not blocked[neighbour]:
+                    blocked[neighbour] = 1
+                    first_move[neighbour] = move
+                    queue.append(neighbour)
+        # Пути нет: любой безопасный ход, иначе продолжаем движение
+        return next(iter(first_move.values()), None)
+
+    return bfs_policy
+
+
+def hamiltonian_cycle(width=GRID_WIDTH, height=GRID_HEIGHT):
+    """
+    Строит замкнутый обход всех клеток поля без переходов через края.
+
+    Путь идёт вправо по верхней строке, змейкой по столбцам 1..width-1
+    остальных строк и возвращается вверх по столбцу 0. Так обход
+    замыкается при чётной высоте; при нечётной высоте и чётной ширине
+    строки и столбцы меняются местами. Если обе стороны нечётные, такого
+    обхода не существует.
+
+    Аргументы:
+        width (int): Ширина поля в клетках.
+        height (int): Высота поля в клетках.
+
+    Возвращает:
+        list: Клетки в порядке обхода; последняя соседствует с первой.
+
+    Исключения:
+        ValueError: Если ширина и высота поля нечётные.
+    """
+    if height % 2:
+        if width % 2:
+            raise ValueError(
+                'Гамильтонов цикл без переходов через края требует чётной '
+                f'ширины или высоты поля, а поле {width}x{height}.'
+            )
+        return [(x, y) for y, x in hamiltonian_cycle(height, width)]
+    cycle = [(x, 0) for x in range(width)]
+    for y in range(1, height):
+        columns = range(width - 1, 0, -1) if y % 2 else range(1, width)
+        cycle.extend((x, y) for x in columns)
+    cycle.extend((0, y) for y in range(height - 1, 0, -1))
+    return cycle
+
+
+def make_hamiltonian_policy(width=GRID_WIDTH, height=GRID_HEIGHT):
+    """
+    Создаёт автопилот, обходящий поле по гамильтонову циклу.
+
+    Змейка на цикле никогда не врезается в себя и всегда заполняет поле,
+    но на это уходит порядка W * H шагов на яблоко.
+
+    Аргументы:
+        width (int): Ширина поля в клетках.
+        height (int): Высота поля в клетках (одна из сторон чётная).
+
+    Возвращает:
+        callable: Функция game -> направление.
+
+    Исключения:
+        ValueError: Если ширина и высота поля нечётные.
+    """
+    cycle = hamiltonian_cycle(width, height)
+    turns = {
+        cell: (following[0] - cell[0], following[1] - cell[1])
+        for cell, following in zip(cycle, cycle[1:] + cycle[:1])
+    }
+
+    def hamiltonian_policy(game):
+        """Возвращает направление к следующей клетке цикла."""
+        return turns[game.snake.get_head_position()]
+
+    return hamiltonian_policy
+
+
+# Автопилоты по именам: имя -> функция (width, height) -> автопилот
+POLICIES = {
+    'greedy': lambda width, height: greedy_policy,
+    'bfs': make_bfs_policy,
+    'hamiltonian': make_hamiltonian_policy,
+}
+
+
+class StreamingStats:
+    """
+    Потоковая статистика величины: среднее, разброс и гистограмма.
+
+    Среднее и дисперсия считаются методом Уэлфорда, а гистограмма хранит
+    только счётчики корзин, так что память не зависит от числа значений.
+
+    Атрибуты:
+        bin_width (int): Ширина корзины гистограммы.
+        count (int): Количество значений.
+        mean (float): Среднее.
+        minimum: Наименьшее значение.
+        maximum: Наибольшее значение.
+        histogram (dict): Начало корзины -> количество значений в ней.
+    """
+
+    def __init__(self, bin_width=1):
+        """
+        Создаёт пустую статистику.
+
+        Аргументы:
+            bin_width (int): Ширина корзины гистограммы.
+        """
+        self.bin_width = bin_width
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.histogram = {}
+
+    def add(self, value):
+        """
+        Учитывает значение.
+
+        Аргументы:
+            value: Число.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        bucket = value // self.bin_width * self.bin_width
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    @property
+    def stdev(self):
+        """Выборочное стандартное отклонение."""
+        if self.count < 2:
+            return 0.0
+        return (self._m2 / (self.count - 1)) ** 0.5
+
+    def format_histogram(self, width=40):
+        """
+        Рисует гистограмму текстом.
+
+        Аргументы:
+            width (int): Длина самой длинной полосы в символах.
+
+        Возвращает:
+            str: Строки вида 'начало-конец | ### количество'.
+        """
+        if not self.histogram:
+            return ''
+        peak = max(self.histogram.values())
+        lines = []
+        for bucket in sorted(self.histogram):
+            count = self.histogram[bucket]
+            label = (f'{bucket}' if self.bin_width == 1
+                     else f'{bucket}-{bucket + self.bin_width - 1}')
+            bar = '#' * max(1, round(count / peak * width))
+            lines.append(f'{label:>13} | {bar} {count}')
+        return '\n'.join(lines)
+
+
+class AutopilotStats:
+    """
+    Сводная статистика партий автопилота.
+
+    Атрибуты:
+        games (int): Количество партий.
+        wins (int): Количество побед (змейка заняла всё поле).
+        collisions (int): Количество столкновений с собой.
+        length (StreamingStats): Длина змейки в конце партии.
+        record (StreamingStats): Рекордная длина за партию.
+        steps (StreamingStats): Количество шагов партии.
+    """
+
+    def __init__(self, steps_bin=100):
+        """
+        Создаёт пустую статистику.
+
+        Аргументы:
+            steps_bin (int): Ширина корзины гистограммы шагов.
+        """
+        self.games = 0
+        self.wins = 0
+        self.collisions = 0
+        self.length = StreamingStats()
+        self.record = StreamingStats()
+        self.steps = StreamingStats(steps_bin)
+
+    def add(self, result):
+        """
+        Учитывает результат одной партии.
+
+        Аргументы:
+            result (dict): Результат play_game.
+        """
+        self.games += 1
+        self.wins += result['wins']
+        self.collisions += result['collisions']
+        self.length.add(result['length'])
+        self.record.add(result['record'])
+        self.steps.add(result['steps'])
+
+    def __str__(self):
+        """Возвращает сводку с гистограммой рекордов."""
+        lines = [
+            f'Партий: {self.games}, побед: {self.wins}, '
+            f'столкновений: {self.collisions}',
+        ]
+        for name, stats in (('Длина', self.length),
+                            ('Рекорд', self.record),
+                            ('Шаги', self.steps)):
+            lines.append(
+                f'{name}: среднее {stats.mean:.1f} ± {stats.stdev:.1f}, '
+                f'от {stats.minimum} до {stats.maximum}'
+            )
+        lines.append('Рекорды:')
+        lines.append(self.record.format_histogram())
+        return '\n'.join(lines)
+
+
+def play_game(policy, seed, width=GRID_WIDTH, height=GRID_HEIGHT,
+              max_steps=5000):
+    """
+    Играет одну партию автопилотом.
+
+    Партия длится max_steps шагов или до победы; после столкновения
+    змейка начинает заново, как в игре.
+
+    Аргументы:
+        policy (str): Имя автопилота из POLICIES.
+        seed (int): Зерно партии.
+        width (int): Ширина поля в клетках.
+        height (int): Высота поля в клетках.
+        max_steps (int): Наибольшее количество шагов.
+
+    Возвращает:
+        dict: Поля RESULT_FIELDS.
+    """
+    choose = POLICIES[policy](width, height)
+    game = Game(width, height, seed=seed)
+    collisions = 0
+    step = game.step
+    for _ in range(max_steps):
+        event = step(choose(game))
+        if event == EVENT_COLLISION:
+            collisions += 1
+        elif event == EVENT_WIN:
+            break
+    return {
+        'seed': seed,
+        'length': len(game.snake.positions),
+        'record': game.record_length,
+        'steps': game.steps,
+        'wins': game.wins,
+        'collisions': collisions,
+    }
+
+
+def _worker(policy, seeds, width, height, max_steps, queue):
+    """Играет партии seeds и отправляет результаты в очередь пачками."""
+    try:
+        chunk = []
+        for seed in seeds:
+            result = play_game(policy, seed, width, height, max_steps)
+            chunk.append(tuple(result[field] for field in RESULT_FIELDS))
+            if len(chunk) >= RESULTS_CHUNK:
+                queue.put(('results', chunk))
+                chunk = []
+        if chunk:
+            queue.put(('results', chunk))
+        queue.put(('done', None))
+    except Exception:  # Ошибка передаётся родителю, иначе он ждал бы вечно
+        queue.put(('error', traceback.format_exc()))
+
+
+def run_autopilot(policy='greedy', games=1000, workers=None, seed=0,
+                  width=GRID_WIDTH, height=GRID_HEIGHT, max_steps=5000,
+                  on_result=None):
+    """
+    Играет партии автопилотом на нескольких процессах.
+
+    Партия номер i получает зерно seed + i. Процесс w играет партии
+    w, w + workers, ..., поэтому набор партий и итоговая статистика не
+    зависят от числа процессов.
+
+    Аргументы:
+        policy (str): Имя автопилота из POLICIES.
+        games (int): Количество партий.
+        workers (int): Количество процессов (по умолчанию число ядер).
+        seed (int): Зерно первой партии.
+        width (int): Ширина поля в клетках.
+        height (int): Высота поля в клетках.
+        max_steps (int): Наибольшее количество шагов партии.
+        on_result (callable): Вызывается для результата каждой партии
+            по мере поступления.
+
+    Возвращает:
+        AutopilotStats: Сводная статистика.
+
+    Исключения:
+        ValueError: Неизвестный автопилот.
+        RuntimeError: Ошибка в одном из процессов.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f'Неизвестный автопилот: {policy}')
+    workers = max(1, min(workers or os.cpu_count() or 1, games))
+    queue = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(
+            target=_worker,
+            args=(policy, range(seed + w, seed + games, workers), width,
+                  height, max_steps, queue),
+            daemon=True,
+        )
+        for w in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    stats = AutopilotStats(steps_bin=max(1, max_steps // 20))
+    running = workers
+    try:
+        while running:
+            kind, payload = queue.get()
+            if kind == 'error':
+                raise RuntimeError(f'Ошибка в процессе автопилота:\n{payload}')
+            if kind == 'done':
+                running -= 1
+                continue
+            for values in payload:
+                result = dict(zip(RESULT_FIELDS, values))
+                stats.add(result)
+                if on_result is not None:
+                    on_result(result)
+    finally:
+        for process in processes:
+            if running:
+                process.terminate()
+            process.join()
+    return stats
+
+
+def main():
+    """Командная строка: проверка автопилота на множестве партий."""
+    parser = argparse.ArgumentParser(description='Проверка автопилотов.')
+    parser.add_argument('--policy', choices=POLICIES, default='greedy')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Количество процессов (по умолчанию - ядер).')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--width', type=int, default=GRID_WIDTH)
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT)
+    parser.add_argument('--max-steps', type=int, default=5000)
+    args = parser.parse_args()
+    if args.policy == 'hamiltonian' and args.width % 2 and args.height % 2:
+        parser.error('для hamiltonian ширина или высота поля должна быть '
+                     'чётной')
+
+    start = time.perf_counter()
+    stats = run_autopilot(args.policy, args.games, args.workers, args.seed,
+                          args.width, args.height, args.max_steps)
+    elapsed = time.perf_counter() - start
+    print(stats)
+    print(f'Время: {elapsed:.2f} с ({stats.games / elapsed:.1f} партий/с)')
+
+
+if __name__ == '__main__':
+    main()
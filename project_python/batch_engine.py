@@ -0,0 +1,323 @@
+"""
+Пакетный движок «Змейки»: тысячи партий, шагающих одновременно.
+
+Состояние всех партий хранится в массивах NumPy: тела змеек - кольцевые
+буферы клеток, занятость поля - булев массив, свободные клетки - такие же
+индексы с удалением переносом последней клетки, как FreeCells в
+snake_engine. Один вызов BatchGame.step сдвигает все партии сразу, без
+цикла Python по партиям.
+
+Правила совпадают с snake_engine.Game, включая сброс змейки после
+столкновения с собой и победу при заполнении поля. Партия номер i шаг в
+шаг совпадает с Game(rng=SplitMix64(seeds[i])) при тех же действиях.
+"""
+import numpy as np
+
+from snake_engine import (DIRECTIONS, EVENT_ATE, EVENT_COLLISION, EVENT_NONE,
+                          EVENT_WIN, GRID_HEIGHT, GRID_WIDTH, OPPOSITE,
+                          SplitMix64)
+
+# Код «без действия» в массиве действий (иначе - индекс в DIRECTIONS):
+NO_ACTION = -1
+
+# Коды направлений и смещения по ним:
+UP_CODE, DOWN_CODE, LEFT_CODE, RIGHT_CODE = range(4)
+DX = np.array([dx for dx, _ in DIRECTIONS])
+DY = np.array([dy for _, dy in DIRECTIONS])
+OPPOSITE_CODE = np.array([DIRECTIONS.index(OPPOSITE[d]) for d in DIRECTIONS])
+
+
+def splitmix64(state):
+    """
+    Векторный шаг генератора SplitMix64 (как SplitMix64.next).
+
+    Аргументы:
+        state (np.ndarray): Счётчики генераторов (uint64).
+
+    Возвращает:
+        tuple: Новые счётчики и случайные числа (оба uint64).
+    """
+    # Умножение uint64 в NumPy выполняется по модулю 2**64, как нужно
+    state = state + np.uint64(SplitMix64.GAMMA)
+    z = state
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return state, z ^ (z >> np.uint64(31))
+
+
+class BatchGame:
+    """
+    Набор партий на полях одинакового размера.
+
+    Клетка поля задаётся одним числом y * width + x. Двумерные таблицы
+    (партия × клетка) хранятся плоскими массивами, строка партии g
+    начинается с g * cells.
+
+    Атрибуты:
+        n_games (int): Количество партий.
+        width (int): Ширина поля в клетках.
+        height (int): Высота поля в клетках.
+        cells (int): Количество клеток поля.
+        direction (np.ndarray): Коды направлений змеек.
+        length (np.ndarray): Длины змеек.
+        head_slot (np.ndarray): Позиция головы в кольцевом буфере тела.
+        body (np.ndarray): Кольцевые буферы тел (голова в head_slot,
+            далее сегменты к хвосту).
+        occupied (np.ndarray): Занятость клеток змейками.
+        free_cells (np.ndarray): Свободные клетки каждой партии.
+        free_index (np.ndarray): Индекс клетки в free_cells или -1.
+        free_count (np.ndarray): Количество свободных клеток.
+        apple (np.ndarray): Клетки яблок.
+        rng_state (np.ndarray): Счётчики генераторов SplitMix64.
+        record_length (np.ndarray): Рекордные длины змеек.
+        wins (np.ndarray): Количество побед.
+        resets (np.ndarray): Количество сбросов змеек.
+        steps (int): Количество сделанных шагов.
+    """
+
+    def __init__(self, n_games, width=GRID_WIDTH, height=GRID_HEIGHT,
+                 seeds=None):
+        """
+        Создаёт партии в начальном состоянии.
+
+        Аргументы:
+            n_games (int): Количество партий.
+            width (int): Ширина поля в клетках.
+            height (int): Высота поля в клетках.
+            seeds: Зёрна партий: последовательность из n_games чисел или
+                одно число s (зёрна s, s + 1, ...); по умолчанию 0, 1, ...
+        """
+        self.n_games = n_games
+        self.width = width
+        self.height = height
+        self.cells = cells = width * height
+        self.center = (height // 2) * width + width // 2
+        self.offsets = np.arange(n_games, dtype=np.int64) * cells
+        self.all_games = np.arange(n_games)
+
+        self.direction = np.full(n_games, RIGHT_CODE, dtype=np.int64)
+        self.length = np.ones(n_games, dtype=np.int64)
+        self.head_slot = np.zeros(n_games, dtype=np.int64)
+        self.body = np.zeros(n_games * cells, dtype=np.int32)
+        self.body[self.offsets] = self.center
+        self.occupied = np.zeros(n_games * cells, dtype=bool)
+        self.occupied[self.offsets + self.center] = True
+        self.free_cells = np.tile(np.arange(cells, dtype=np.int32), n_games)
+        self.free_index = self.free_cells.copy()
+        self.free_count = np.full(n_games, cells, dtype=np.int64)
+        self._free_remove(self.all_games,
+                          np.full(n_games, self.center, dtype=np.int64))
+
+        if seeds is None:
+            seeds = 0
+        if np.ndim(seeds) == 0:
+            seeds = int(seeds) + np.arange(n_games)
+        self.rng_state = np.array(
+            [seed & SplitMix64.MASK for seed in map(int, seeds)],
+            dtype=np.uint64
+        )
+        self.apple = np.zeros(n_games, dtype=np.int64)
+        self._spawn(self.all_games)
+        self.record_length = np.ones(n_games, dtype=np.int64)
+        self.wins = np.zeros(n_games, dtype=np.int64)
+        self.resets = np.zeros(n_games, dtype=np.int64)
+        self.steps = 0
+
+    def _free_add(self, games, cells):
+        """Освобождает по одной клетке в каждой из партий games."""
+        offsets = self.offsets[games]
+        positions = offsets + cells
+        valid = self.free_index[positions] < 0
+        if not valid.all():
+            games, cells = games[valid], cells[valid]
+            offsets, positions = offsets[valid], positions[valid]
+        count = self.free_count[games]
+        self.free_cells[offsets + count] = cells
+        self.free_index[positions] = count
+        self.free_count[games] = count + 1
+
+    def _free_remove(self, games, cells):
+        """Занимает по одной клетке в каждой из партий games."""
+        offsets = self.offsets[games]
+        positions = offsets + cells
+        index = self.free_index[positions]
+        valid = index >= 0
+        if not valid.all():
+            games, index = games[valid], index[valid]
+            offsets, positions = offsets[valid], positions[valid]
+        count = self.free_count[games] - 1
+        self.free_count[games] = count
+        last = self.free_cells[offsets + count]
+        self.free_cells[offsets + index] = last
+        self.free_index[offsets + last] = index
+        self.free_index[positions] = -1
+
+    def _spawn(self, games):
+        """
+        Ставит яблоки в случайные свободные клетки партий games.
+
+        Возвращает:
+            np.ndarray: Партии, в которых свободных клеток не осталось.
+        """
+        count = self.free_count[games]
+        has_room = count > 0
+        placed = games[has_room]
+        state, value = splitmix64(self.rng_state[placed])
+        self.rng_state[placed] = state
+        choice = (value % count[has_room].astype(np.uint64)).astype(np.int64)
+        self.apple[placed] = self.free_cells[self.offsets[placed] + choice]
+        return games[~has_room]
+
+    def _reset(self, games):
+        """
+        Сбрасывает змейки партий games в начальное состояние.
+
+        Клетки прежних тел освобождаются в порядке от головы к хвосту,
+        как в Snake.place, поэтому индексы свободных клеток совпадают
+        со скалярным движком.
+        """
+        lengths = self.length[games]
+        starts = np.cumsum(lengths) - lengths
+        within = np.arange(lengths.sum()) - np.repeat(starts, lengths)
+        offsets = np.repeat(self.offsets[games], lengths)
+        slots = (np.repeat(self.head_slot[games], lengths) + within)
+        cells = self.body[offsets + slots % self.cells].astype(np.int64)
+        # После укуса клетка головы встречается в теле второй раз
+        heads = np.repeat(cells[starts], lengths)
+        keep = (within == 0) | (cells != heads)
+        kept = np.add.reduceat(keep, starts)
+        cells, offsets = cells[keep], offsets[keep]
+        rank = np.arange(cells.size) - np.repeat(np.cumsum(kept) - kept,
+                                                 kept)
+        count = np.repeat(self.free_count[games], kept) + rank
+        self.occupied[offsets + cells] = False
+        self.free_cells[offsets + count] = cells
+        self.free_index[offsets + cells] = count
+        self.free_count[games] += kept
+
+        self.head_slot[games] = 0
+        self.length[games] = 1
+        self.direction[games] = RIGHT_CODE
+        self.body[self.offsets[games]] = self.center
+        self.occupied[self.offsets[games] + self.center] = True
+        self._free_remove(games, np.full(games.size, self.center))
+
+    def heads(self):
+        """
+        Возвращает клетки голов всех змеек.
+
+        Возвращает:
+            np.ndarray: Клетки голов (y * width + x).
+        """
+        return self.body[self.offsets + self.head_slot].astype(np.int64)
+
+    def step(self, actions=None):
+        """
+        Выполняет один шаг во всех партиях (как Game.step).
+
+        Аргументы:
+            actions: Коды направлений для каждой партии (NO_ACTION -
+                продолжить движение) или None.
+
+        Возвращает:
+            np.ndarray: События шага EVENT_* для каждой партии.
+        """
+        offsets = self.offsets
+        direction = self.direction
+        if actions is not None:
+            actions = np.asarray(actions)
+            turn = (actions >= 0) & (actions != OPPOSITE_CODE[direction])
+            direction = np.where(turn, actions, direction)
+            self.direction = direction
+
+        head = self.heads()
+        new_head = (
+            (head // self.width + DY[direction]) % self.height * self.width
+            + (head % self.width + DX[direction]) % self.width
+        )
+        # Хвост освобождает клетку раньше, чем голова занимает новую
+        tail_slot = (self.head_slot + self.length - 1) % self.cells
+        tail = self.body[offsets + tail_slot].astype(np.int64)
+        self.occupied[offsets + tail] = False
+        self._free_add(self.all_games, tail)
+        bitten = self.occupied[offsets + new_head]
+        self.head_slot = (self.head_slot - 1) % self.cells
+        self.body[offsets + self.head_slot] = new_head
+        self.occupied[offsets + new_head] = True
+        self._free_remove(self.all_games, new_head)
+        self.steps += 1
+
+        events = np.full(self.n_games, EVENT_NONE, dtype=np.int8)
+        ate = np.flatnonzero(new_head == self.apple)
+        if ate.size:
+            # Рост: хвост остаётся в буфере сразу за последним сегментом
+            self.length[ate] += 1
+            self.occupied[offsets[ate] + tail[ate]] = True
+            self._free_remove(ate, tail[ate])
+            np.maximum(self.record_length, self.length,
+                       out=self.record_length)
+            events[ate] = EVENT_ATE
+            won = self._spawn(ate)
+            if won.size:
+                self.wins[won] += 1
+                self.resets[won] += 1
+                self._reset(won)
+                self._spawn(won)
+                events[won] = EVENT_WIN
+                bitten[won] = False
+
+        collided = np.flatnonzero(bitten)
+        if collided.size:
+            self._reset(collided)
+            self.resets[collided] += 1
+            events[collided] = EVENT_COLLISION
+        return events
+
+    def greedy_actions(self):
+        """
+        Векторный автопилот: поворачивает к яблоку (как greedy_policy).
+
+        Возвращает:
+            np.ndarray: Коды направлений или NO_ACTION для каждой партии.
+        """
+        head = self.heads()
+        dx = (self.apple % self.width - head % self.width) % self.width
+        dy = (self.apple // self.width - head // self.width) % self.height
+        actions = np.where(
+            dx != 0,
+            np.where(dx <= self.width // 2, RIGHT_CODE, LEFT_CODE),
+            np.where(dy == 0, NO_ACTION,
+                     np.where(dy <= self.height // 2, DOWN_CODE, UP_CODE))
+        )
+        reverse = actions == OPPOSITE_CODE[self.direction]
+        horizontal = (actions == LEFT_CODE) | (actions == RIGHT_CODE)
+        return np.where(reverse, np.where(horizontal, UP_CODE, RIGHT_CODE),
+                        actions)
+
+    def positions(self, game):
+        """
+        Возвращает клетки змейки одной партии.
+
+        Аргументы:
+            game (int): Номер партии.
+
+        Возвращает:
+            list: Клетки (x, y) от головы к хвосту.
+        """
+        slots = (self.head_slot[game] + np.arange(self.length[game]))
+        cells = self.body[self.offsets[game] + slots % self.cells]
+        return [(int(cell) % self.width, int(cell) // self.width)
+                for cell in cells]
+
+    def apple_position(self, game):
+        """
+        Возвращает клетку яблока одной партии.
+
+        Аргументы:
+            game (int): Номер партии.
+
+        Возвращает:
+            tuple: Клетка (x, y).
+        """
+        cell = int(self.apple[game])
+        return cell % self.width, cell // self.width
@@ -0,0 +1,314 @@
+"""
+Замеры производительности «Змейки».
+
+Запуск: python benchmarks.py [имя_замера ...]
+Без аргументов выполняются все замеры.
+"""
+import argparse
+import os
+import time
+from random import Random
+
+from autopilot import greedy_policy, hamiltonian_cycle, run_autopilot
+from snake_engine import EVENT_ATE, RIGHT, Apple, Game, Snake
+
+
+def bench_engine(steps=200_000, seed=0):
+    """
+    Замеряет скорость движка без отрисовки и без ограничения частоты.
+
+    Аргументы:
+        steps (int): Количество шагов.
+        seed (int): Зерно партии.
+
+    Возвращает:
+        dict: Шагов в секунду и количество съеденных яблок.
+    """
+    game = Game(seed=seed)
+    start = time.perf_counter()
+    eaten = game.run(steps, greedy_policy)
+    elapsed = time.perf_counter() - start
+    return {
+        'steps_per_s': steps / elapsed,
+        'apples': eaten,
+        'record_length': game.record_length,
+    }
+
+
+def bench_snake_length(lengths=(1, 48, 192, 384, 576, 767), ticks=100_000):
+    """
+    Замеряет стоимость одного хода змейки в зависимости от её длины.
+
+    Змейка заданной длины ходит по гамильтонову циклу поля 32×24 и никогда
+    не врезается в себя, поэтому каждый ход - это move и проверка
+    столкновения. При O(1) структуре тела время хода не зависит от длины.
+
+    Аргументы:
+        lengths (tuple): Длины змейки (до заполнения всего поля).
+        ticks (int): Количество ходов для каждой длины.
+
+    Возвращает:
+        dict: Время одного хода в микросекундах для каждой длины.
+    """
+    cycle = hamiltonian_cycle()
+    turns = [
+        ((x2 - x1), (y2 - y1))
+        for (x1, y1), (x2, y2) in zip(cycle, cycle[1:] + cycle[:1])
+    ]
+    result = {}
+    for length in lengths:
+        snake = Snake()
+        # Голова в клетке length - 1, тело тянется назад по циклу
+        snake.place(cycle[length - 1::-1], turns[length - 2])
+        index = length - 1
+        start = time.perf_counter()
+        for _ in range(ticks):
+            snake.turn(turns[index])
+            snake.update_direction()
+            snake.move()
+            if snake.collides_with_itself():
+                raise RuntimeError('Змейка на цикле не должна врезаться')
+            index = (index + 1) % len(cycle)
+        elapsed = time.perf_counter() - start
+        result[f'us_per_tick_len{length}'] = elapsed / ticks * 1e6
+    return result
+
+
+def bench_apple_spawn(fills=(0.0, 0.5, 0.9, 0.99, 767 / 768), spawns=2000):
+    """
+    Сравнивает выбор клетки для яблока по индексу и перебором.
+
+    Аргументы:
+        fills (tuple): Доли поля 32×24, занятые змейкой.
+        spawns (int): Количество выборов для каждой доли.
+
+    Возвращает:
+        dict: Время одного выбора в микросекундах: free - по индексу
+            свободных клеток, retry - случайным перебором клеток.
+    """
+    cycle = hamiltonian_cycle()
+    apple = Apple(rng=Random(0))
+    result = {}
+    for fill in fills:
+        snake = Snake()
+        snake.place(cycle[max(1, round(fill * len(cycle))) - 1::-1], RIGHT)
+        for name, options in (('free', {'free_cells': snake.free}),
+                              ('retry', {'snake_positions': snake.occupied})):
+            start = time.perf_counter()
+            for _ in range(spawns):
+                apple.randomize_position(**options)
+            elapsed = time.perf_counter() - start
+            result[f'{name}_us_fill{fill:.3f}'] = elapsed / spawns * 1e6
+    return result
+
+
+def bench_render(frames=2000, seed=0):
+    """
+    Замеряет время кадра при полной и инкрементальной отрисовке.
+
+    Окно не открывается (SDL_VIDEODRIVER=dummy), поэтому замер показывает
+    стоимость рисования и подготовки обновления экрана, без вывода на
+    настоящий дисплей.
+
+    Аргументы:
+        frames (int): Количество кадров для каждого режима.
+        seed (int): Зерно партии.
+
+    Возвращает:
+        dict: Среднее время кадра в микросекундах для каждого режима.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import the_snake  # Импорт здесь: остальным замерам pygame не нужен
+
+    result = {}
+    for name, incremental in (('full', False), ('incremental', True)):
+        game = Game(the_snake.GRID_WIDTH, the_snake.GRID_HEIGHT, seed=seed,
+                    snake=the_snake.Snake(), apple=the_snake.Apple())
+        renderer = the_snake.Renderer(incremental=incremental)
+        elapsed = 0.0
+        for _ in range(frames):
+            game.step(greedy_policy(game))
+            start = time.perf_counter()
+            renderer.draw(game)
+            elapsed += time.perf_counter() - start
+        result[f'{name}_us_per_frame'] = elapsed / frames * 1e6
+    return result
+
+
+def bench_tiles(width=200, height=200, cell=4, fill=0.5, frames=30):
+    """
+    Сравнивает полную перерисовку большого поля плитками и draw.rect.
+
+    Змейка занимает долю fill поля width×height по гамильтонову циклу.
+    Рисование идёт на отдельную поверхность, окно не нужно.
+
+    Аргументы:
+        width (int): Ширина поля в клетках.
+        height (int): Высота поля в клетках (чётная).
+        cell (int): Размер клетки в пикселях.
+        fill (float): Доля поля, занятая змейкой.
+        frames (int): Количество кадров для каждого способа.
+
+    Возвращает:
+        dict: Среднее время полного кадра в миллисекундах и длина змейки.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    import the_snake
+
+    cycle = hamiltonian_cycle(width, height)
+    length = round(fill * len(cycle))
+    game = Game(width, height, seed=0)
+    game.snake.place(cycle[length - 1::-1], RIGHT)
+    surface = pygame.Surface((width * cell, height * cell))
+
+    def draw_rects():
+        surface.fill(the_snake.BOARD_BACKGROUND_COLOR)
+        for x, y in list(game.snake.positions) + [game.apple.position]:
+            rect = pygame.Rect((x * cell, y * cell), (cell, cell))
+            pygame.draw.rect(surface, the_snake.SNAKE_COLOR, rect)
+            pygame.draw.rect(surface, the_snake.BORDER_COLOR, rect, 1)
+
+    renderer = the_snake.Renderer(incremental=False, surface=surface,
+                                  grid_size=cell)
+    result = {'snake_length': length}
+    for name, draw in (('rects', draw_rects),
+                       ('tiles', lambda: renderer.draw(game))):
+        start = time.perf_counter()
+        for _ in range(frames):
+            draw()
+        elapsed = time.perf_counter() - start
+        result[f'{name}_ms_per_frame'] = elapsed / frames * 1e3
+    return result
+
+
+def bench_large_board(sizes=(100, 1000, 5000), steps=20_000, frames=2000):
+    """
+    Замеряет шаг и кадр на больших полях разного размера.
+
+    Видимая область 64×48 клеток одинакова для всех полей, поэтому при
+    хранении поля по участкам время шага и кадра не растёт с размером
+    поля. Рисование идёт на отдельную поверхность, окно не нужно.
+
+    Аргументы:
+        sizes (tuple): Стороны квадратных полей в клетках.
+        steps (int): Количество шагов для замера шага.
+        frames (int): Количество кадров для замера отрисовки.
+
+    Возвращает:
+        dict: Время шага и кадра в микросекундах для каждого поля.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    import the_snake
+    from large_board import LargeGame
+
+    result = {}
+    for size in sizes:
+        game = LargeGame(size, size, seed=0)
+        start = time.perf_counter()
+        game.run(steps, greedy_policy)
+        result[f'step_us_{size}'] = (time.perf_counter() - start) / steps * 1e6
+        renderer = the_snake.ViewportRenderer(
+            surface=pygame.Surface((640, 480)), grid_size=10
+        )
+        elapsed = 0.0
+        for _ in range(frames):
+            game.step(greedy_policy(game))
+            start = time.perf_counter()
+            renderer.draw(game)
+            elapsed += time.perf_counter() - start
+        result[f'frame_us_{size}'] = elapsed / frames * 1e6
+    return result
+
+
+def bench_batch(n_games=4096, steps=200, seed=0):
+    """
+    Замеряет пакетный движок: все партии шагают одним вызовом NumPy.
+
+    Аргументы:
+        n_games (int): Количество партий.
+        steps (int): Количество шагов.
+        seed (int): Зерно первой партии.
+
+    Возвращает:
+        dict: Шагов партий в секунду, съеденных яблок и сбросов.
+    """
+    from batch_engine import BatchGame  # Импорт здесь: нужен NumPy
+
+    batch = BatchGame(n_games, seeds=seed)
+    eaten = 0
+    start = time.perf_counter()
+    for _ in range(steps):
+        eaten += int((batch.step(batch.greedy_actions()) == EVENT_ATE).sum())
+    elapsed = time.perf_counter() - start
+    return {
+        'game_steps_per_s': n_games * steps / elapsed,
+        'apples': eaten,
+        'resets': int(batch.resets.sum()),
+    }
+
+
+def bench_autopilot(games=400, policy='greedy', max_steps=2000):
+    """
+    Замеряет масштабирование проверки автопилота по числу процессов.
+
+    Одни и те же партии играются на 1, 2, 4, ... процессах (до числа
+    ядер); при линейном масштабировании ускорение равно числу процессов.
+
+    Аргументы:
+        games (int): Количество партий.
+        policy (str): Имя автопилота.
+        max_steps (int): Наибольшее количество шагов партии.
+
+    Возвращает:
+        dict: Партий в секунду и ускорение для каждого числа процессов.
+    """
+    cores = os.cpu_count() or 1
+    counts = sorted({1, cores} | {2 ** i for i in range(cores.bit_length())})
+    result = {'cores': cores}
+    base = None
+    for workers in counts:
+        start = time.perf_counter()
+        run_autopilot(policy, games, workers, max_steps=max_steps)
+        rate = games / (time.perf_counter() - start)
+        base = base or rate
+        result[f'games_per_s_w{workers}'] = rate
+        result[f'speedup_w{workers}'] = rate / base
+    return result
+
+
+BENCHMARKS = {
+    'engine': bench_engine,
+    'snake_length': bench_snake_length,
+    'apple_spawn': bench_apple_spawn,
+    'render': bench_render,
+    'tiles': bench_tiles,
+    'large_board': bench_large_board,
+    'batch': bench_batch,
+    'autopilot': bench_autopilot,
+}
+
+
+def main():
+    """Выполняет выбранные замеры и выводит результаты."""
+    parser = argparse.ArgumentParser(description='Замеры производительности.')
+    parser.add_argument('names', nargs='*',
+                        help=f'Имена замеров: {", ".join(BENCHMARKS)} '
+                             '(по умолчанию все).')
+    args = parser.parse_args()
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f'неизвестные замеры: {", ".join(sorted(unknown))}')
+    for name in args.names or BENCHMARKS:
+        result = BENCHMARKS[name]()
+        values = ', '.join(
+            f'{key}={value:,.1f}' if isinstance(value, float)
+            else f'{key}={value}'
+            for key, value in result.items()
+        )
+        print(f'{name}: {values}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,454 @@
+"""
+Большое поле «Змейки» (например, 1000×1000 клеток) с несколькими яблоками.
+
+На большом поле нельзя хранить список всех свободных клеток (FreeCells):
+это миллион кортежей и O(поля) на создание. Board хранит только занятые
+клетки, разложенные по квадратным участкам (chunk), и помечает участки,
+изменившиеся с прошлого кадра. Поэтому память и время шага зависят от
+длины змейки и числа яблок, а время кадра - от видимой области
+(Viewport), а не от размера поля. Модуль, как и snake_engine, не зависит
+от pygame; отрисовку делает the_snake.ViewportRenderer.
+"""
+from snake_engine import (EVENT_ATE, EVENT_COLLISION, EVENT_NONE, EVENT_WIN,
+                          Apple, Game, Snake)
+
+# Размер большого поля в клетках по умолчанию:
+LARGE_WIDTH = 1000
+LARGE_HEIGHT = 1000
+
+# Сторона участка поля в клетках:
+CHUNK_SIZE = 16
+
+# Количество яблок на большом поле по умолчанию:
+APPLE_COUNT = 50
+
+# Сколько случайных клеток проверяется при выборе свободной клетки,
+# прежде чем перебрать участки (на почти заполненном поле):
+RANDOM_TRIES = 32
+
+# На сколько клеток от края видимой области голова может подойти,
+# прежде чем область сдвинется:
+VIEW_MARGIN = 4
+
+
+class Board:
+    """
+    Занятость большого поля по участкам с флагами изменений.
+
+    Повторяет интерфейс FreeCells (add, remove, choice, len, in), поэтому
+    подходит как Snake.free, но хранит не свободные клетки, а занятые:
+    словарь участок -> множество занятых клеток участка. Пустые участки
+    не хранятся. Каждое изменение помечает участок в dirty, и отрисовка
+    перерисовывает только помеченные видимые участки.
+
+    Атрибуты:
+        width (int): Ширина поля в клетках.
+        height (int): Высота поля в клетках.
+        chunk_size (int): Сторона участка в клетках.
+        chunks (dict): Участок (cx, cy) -> множество занятых клеток.
+        count (int): Количество занятых клеток.
+        dirty (set): Участки, изменившиеся с последнего take_dirty.
+    """
+
+    def __init__(self, width=LARGE_WIDTH, height=LARGE_HEIGHT,
+                 chunk_size=CHUNK_SIZE):
+        """
+        Создаёт пустое поле.
+
+        Аргументы:
+            width (int): Ширина поля в клетках.
+            height (int): Высота поля в клетках.
+            chunk_size (int): Сторона участка в клетках.
+        """
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.chunks = {}
+        self.count = 0
+        self.dirty = set()
+
+    def chunk_of(self, cell):
+        """
+        Возвращает участок, в котором лежит клетка.
+
+        Аргументы:
+            cell (tuple): Клетка поля.
+
+        Возвращает:
+            tuple: Координаты участка (cx, cy).
+        """
+        return (cell[0] // self.chunk_size, cell[1] // self.chunk_size)
+
+    def __len__(self):
+        """Возвращает количество свободных клеток."""
+        return self.width * self.height - self.count
+
+    def __contains__(self, cell):
+        """Проверяет, свободна ли клетка."""
+        chunk = self.chunks.get(self.chunk_of(cell))
+        return chunk is None or cell not in chunk
+
+    def add(self, cell):
+        """
+        Освобождает клетку (повторное освобождение ничего не меняет).
+
+        Аргументы:
+            cell (tuple): Клетка поля.
+        """
+        key = self.chunk_of(cell)
+        chunk = self.chunks.get(key)
+        if chunk is None or cell not in chunk:
+            return
+        chunk.remove(cell)
+        if not chunk:
+            del self.chunks[key]
+        self.count -= 1
+        self.dirty.add(key)
+
+    def remove(self, cell):
+        """
+        Занимает клетку (занятая клетка остаётся занятой).
+
+        Аргументы:
+            cell (tuple): Клетка поля.
+        """
+        key = self.chunk_of(cell)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = set()
+        elif cell in chunk:
+            return
+        chunk.add(cell)
+        self.count += 1
+        self.dirty.add(key)
+
+    def touch(self, cell):
+        """
+        Помечает участок клетки изменившимся, не меняя занятость.
+
+        Аргументы:
+            cell (tuple): Клетка поля (например, съеденного яблока, которую
+                теперь занимает голова).
+        """
+        self.dirty.add(self.chunk_of(cell))
+
+    def occupied_in(self, key):
+        """
+        Возвращает занятые клетки участка.
+
+        Аргументы:
+            key (tuple): Участок (cx, cy).
+
+        Возвращает:
+            set: Занятые клетки (пустое множество для пустого участка).
+        """
+        return self.chunks.get(key, ())
+
+    def take_dirty(self):
+        """
+        Возвращает изменившиеся участки и снимает с них пометку.
+
+        Возвращает:
+            set: Участки, изменившиеся с прошлого вызова.
+        """
+        dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def choice(self, rng):
+        """
+        Выбирает случайную свободную клетку.
+
+        Сначала проверяются RANDOM_TRIES случайных клеток: на поле, которое
+        змейка занимает лишь частично, свободная находится с первой-второй
+        попытки. Если все попытки заняты, клетка выбирается равномерно
+        перебором участков: O(участков + клеток участка), а не O(поля).
+
+        Аргументы:
+            rng (Random): Генератор случайных чисел.
+
+        Возвращает:
+            tuple: Клетка или None, если свободных клеток нет.
+        """
+        free = len(self)
+        if free == 0:
+            return None
+        randrange = rng.randrange
+        for _ in range(RANDOM_TRIES):
+            cell = (randrange(self.width), randrange(self.height))
+            if cell in self:
+                return cell
+        return self._nth_free(randrange(free))
+
+    def _nth_free(self, index):
+        """Возвращает свободную клетку с номером index в порядке участков."""
+        size = self.chunk_size
+        for cy in range(0, self.height, size):
+            rows = range(cy, min(cy + size, self.height))
+            for cx in range(0, self.width, size):
+                columns = range(cx, min(cx + size, self.width))
+                occupied = self.occupied_in((cx // size, cy // size))
+                free = len(rows) * len(columns) - len(occupied)
+                if index >= free:
+                    index -= free
+                    continue
+                for y in rows:
+                    for x in columns:
+                        if (x, y) not in occupied:
+                            if index == 0:
+                                return (x, y)
+                            index -= 1
+        return None
+
+
+class Viewport:
+    """
+    Видимая область большого поля, которая следует за головой змейки.
+
+    Область сдвигается, только когда голова подходит к её краю ближе
+    margin клеток, и тогда снова ставит голову в центр. Остальные кадры
+    перерисовывают только изменившиеся участки. Поле замкнуто, поэтому
+    область может переходить через край поля.
+
+    Атрибуты:
+        board_width (int): Ширина поля в клетках.
+        board_height (int): Высота поля в клетках.
+        width (int): Ширина области в клетках.
+        height (int): Высота области в клетках.
+        margin (int): Отступ от края области, при котором она сдвигается.
+        left (int): Левая клетка области на поле.
+        top (int): Верхняя клетка области на поле.
+    """
+
+    def __init__(self, board_width, board_height, width, height,
+                 margin=VIEW_MARGIN):
+        """
+        Создаёт область в левом верхнем углу поля.
+
+        Аргументы:
+            board_width (int): Ширина поля в клетках.
+            board_height (int): Высота поля в клетках.
+            width (int): Ширина области в клетках.
+            height (int): Высота области в клетках.
+            margin (int): Отступ от края области, при котором она
+                сдвигается.
+        """
+        self.board_width = board_width
+        self.board_height = board_height
+        self.width = min(width, board_width)
+        self.height = min(height, board_height)
+        self.margin = margin
+        self.left = 0
+        self.top = 0
+
+    @staticmethod
+    def _follow_axis(origin, head, view, board, margin):
+        """Возвращает начало области по одной оси после сдвига за головой."""
+        if view >= board:
+            return 0
+        offset = (head - origin) % board
+        if min(margin, view // 2) <= offset < view - min(margin, view // 2):
+            return origin
+        return (head - view // 2) % board
+
+    def follow(self, head):
+        """
+        Сдвигает область, если голова подошла к её краю.
+
+        Аргументы:
+            head (tuple): Клетка головы змейки.
+
+        Возвращает:
+            bool: True, если область сдвинулась.
+        """
+        left = self._follow_axis(self.left, head[0], self.width,
+                                 self.board_width, self.margin)
+        top = self._follow_axis(self.top, head[1], self.height,
+                                self.board_height, self.margin)
+        moved = (left, top) != (self.left, self.top)
+        self.left, self.top = left, top
+        return moved
+
+    def to_view(self, cell):
+        """
+        Переводит клетку поля в клетку области.
+
+        Аргументы:
+            cell (tuple): Клетка поля.
+
+        Возвращает:
+            tuple: Клетка области или None, если клетка не видна.
+        """
+        x = (cell[0] - self.left) % self.board_width
+        y = (cell[1] - self.top) % self.board_height
+        if x < self.width and y < self.height:
+            return (x, y)
+        return None
+
+    @staticmethod
+    def _spans(start, size, origin, view, board):
+        """Возвращает видимые отрезки [начало, конец) диапазона клеток."""
+        first = (start - origin) % board
+        spans = []
+        if first < view:
+            spans.append((first, min(first + size, view)))
+        if first + size > board:
+            # Диапазон переходит через край области (и поля)
+            spans.append((0, min(first + size - board, view)))
+        return spans
+
+    def chunk_spans(self, key, chunk_size):
+        """
+        Возвращает видимые части участка в клетках области.
+
+        Аргументы:
+            key (tuple): Участок (cx, cy).
+            chunk_size (int): Сторона участка в клетках.
+
+        Возвращает:
+            list: Прямоугольники (x0, y0, x1, y1) в клетках области,
+                пустой список, если участок не виден.
+        """
+        cx, cy = key[0] * chunk_size, key[1] * chunk_size
+        columns = self._spans(cx, min(chunk_size, self.board_width - cx),
+                              self.left, self.width, self.board_width)
+        rows = self._spans(cy, min(chunk_size, self.board_height - cy),
+                           self.top, self.height, self.board_height)
+        return [(x0, y0, x1, y1) for x0, x1 in columns for y0, y1 in rows]
+
+    def visible_chunks(self, chunk_size):
+        """
+        Возвращает участки, которые хотя бы частично видны.
+
+        Аргументы:
+            chunk_size (int): Сторона участка в клетках.
+
+        Возвращает:
+            list: Участки (cx, cy); O(размера области).
+        """
+        columns = {(self.left + i) % self.board_width // chunk_size
+                   for i in range(self.width)}
+        rows = {(self.top + i) % self.board_height // chunk_size
+                for i in range(self.height)}
+        return [(cx, cy) for cy in rows for cx in columns]
+
+
+class LargeGame(Game):
+    """
+    Партия на большом поле с несколькими яблоками.
+
+    Змейка хранит свободные клетки в Board, а яблоки занимают свои клетки
+    в той же Board, поэтому новые яблоки не появляются ни на змейке, ни
+    друг на друге. Правила те же, что у Game; победа - когда змейка
+    съела яблоко, а положить новые яблоки больше некуда.
+
+    Атрибуты:
+        Наследует атрибуты от Game; apple - первое яблоко из apples.
+        board (Board): Занятость поля змейкой и яблоками.
+        apples (list): Яблоки партии.
+        apple_at (dict): Клетка -> лежащее в ней яблоко.
+    """
+
+    def __init__(self, width=LARGE_WIDTH, height=LARGE_HEIGHT,
+                 apples=APPLE_COUNT, seed=None, rng=None,
+                 chunk_size=CHUNK_SIZE):
+        """
+        Создаёт партию.
+
+        Аргументы:
+            width (int): Ширина поля в клетках.
+            height (int): Высота поля в клетках.
+            apples (int): Количество яблок.
+            seed (int): Зерно генератора случайных чисел.
+            rng: Генератор партии вместо Random(seed).
+            chunk_size (int): Сторона участка Board в клетках.
+        """
+        self.board = Board(width, height, chunk_size)
+        self.apples = [Apple(width=width, height=height, rng=rng)
+                       for _ in range(apples)]
+        self.apple_at = {}
+        super().__init__(width, height, seed=seed,
+                         snake=Snake(width=width, height=height,
+                                     free=self.board),
+                         apple=self.apples[0], rng=rng)
+        # Apple и Game уже выбрали яблокам клетки, но не заняли их в board
+        for apple in self.apples:
+            apple.rng = self.rng
+            apple.position = None
+        for apple in self.apples:
+            self._spawn(apple)
+
+    def _spawn(self, apple):
+        """
+        Кладёт яблоко в случайную свободную клетку.
+
+        Прежнюю клетку яблока к этому моменту занимает змейка, поэтому она
+        остаётся занятой в board, но её участок нужно перерисовать.
+
+        Аргументы:
+            apple (Apple): Яблоко.
+
+        Возвращает:
+            bool: False, если свободных клеток нет (position равно None).
+        """
+        if apple.position is not None:
+            self.apple_at.pop(apple.position, None)
+            self.board.touch(apple.position)
+        if not apple.randomize_position(free_cells=self.board):
+            return False
+        self.board.remove(apple.position)
+        self.apple_at[apple.position] = apple
+        return True
+
+    def _reset_snake(self):
+        """
+        Сбрасывает змейку и раскладывает яблоки заново там, где нужно.
+
+        Переносятся яблоки из-под новой клетки змейки, а яблоки, которым
+        раньше не хватило свободной клетки (position равно None),
+        возвращаются на освободившееся поле.
+        """
+        self.snake.reset()
+        self.resets += 1
+        for cell in self.snake.positions:
+            apple = self.apple_at.get(cell)
+            if apple is not None:
+                self._spawn(apple)
+        for apple in self.apples:
+            if apple.position is None:
+                self._spawn(apple)
+
+    def step(self, action=None):
+        """
+        Выполняет один шаг игры.
+
+        Аргументы:
+            action (tuple): Новое направление или None (продолжить движение).
+
+        Возвращает:
+            int: Событие шага: EVENT_NONE, EVENT_ATE, EVENT_COLLISION
+                или EVENT_WIN.
+        """
+        snake = self.snake
+        if action is not None:
+            snake.turn(action)
+        snake.update_direction()
+        snake.move()
+        self.steps += 1
+
+        event = EVENT_NONE
+        apple = self.apple_at.get(snake.positions[0])
+        if apple is not None:
+            snake.grow()
+            if len(snake.positions) > self.record_length:
+                self.record_length = len(snake.positions)
+            event = EVENT_ATE
+            if not self._spawn(apple) and not self.apple_at:
+                # Ни одного яблока не осталось на поле: победа
+                self.wins += 1
+                self._reset_snake()
+                return EVENT_WIN
+
+        if snake.collides_with_itself():
+            self._reset_snake()
+            event = EVENT_COLLISION
+        return event
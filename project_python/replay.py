@@ -0,0 +1,305 @@
+"""
+Запись и воспроизведение партий «Змейки».
+
+Партия полностью определяется зерном и поворотами (см. snake_engine.Game),
+поэтому запись хранит только заголовок с зерном и размером поля и
+повороты с номерами шагов. Формат файла:
+
+    заголовок: b'SNKR', версия (1 байт), ширина и высота (по 2 байта),
+               зерно (8 байт), всё little-endian;
+    записи:    varint((шагов с предыдущей записи) * 5 + код), где код -
+               индекс направления в DIRECTIONS или 4 - конец записи.
+
+Каждая запись сбрасывается на диск сразу, так что файл остаётся читаемым,
+даже если игра завершилась аварийно (тогда в нём нет записи конца).
+
+Запуск: python replay.py файл.replay --seek 100000
+"""
+import argparse
+import copy
+import struct
+import time
+
+from snake_engine import DIRECTIONS, Game
+
+REPLAY_MAGIC = b'SNKR'
+REPLAY_VERSION = 1
+HEADER = struct.Struct('<4sBHHQ')
+
+# Код записи «конец партии» (коды 0-3 - направления):
+END_CODE = 4
+CODES = END_CODE + 1
+
+# Через сколько шагов воспроизведение запоминает снимок состояния:
+SNAPSHOT_INTERVAL = 1000
+
+
+def encode_varint(value):
+    """
+    Кодирует неотрицательное число в varint (7 бит на байт).
+
+    Аргументы:
+        value (int): Число.
+
+    Возвращает:
+        bytes: Закодированное число.
+    """
+    out = bytearray()
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def decode_varints(data):
+    """
+    Декодирует последовательность varint.
+
+    Оборванное последнее число (аварийно записанный файл) пропускается.
+
+    Аргументы:
+        data (bytes): Закодированные числа.
+
+    Возвращает:
+        list: Числа.
+    """
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        values.append(value)
+        value = shift = 0
+    return values
+
+
+class Replay:
+    """
+    Запись партии.
+
+    Атрибуты:
+        width (int): Ширина поля в клетках.
+        height (int): Высота поля в клетках.
+        seed (int): Зерно партии.
+        actions (dict): Номер шага -> направление, переданное в Game.step.
+        length (int): Количество шагов партии или None, если запись
+            оборвалась (тогда известно только последнее действие).
+    """
+
+    def __init__(self, width, height, seed, actions=None, length=None):
+        """
+        Создаёт запись.
+
+        Аргументы:
+            width (int): Ширина поля в клетках.
+            height (int): Высота поля в клетках.
+            seed (int): Зерно партии.
+            actions (dict): Номер шага -> направление.
+            length (int): Количество шагов партии.
+        """
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.actions = actions or {}
+        self.length = length
+
+    def make_game(self, **objects):
+        """
+        Создаёт партию в начальном состоянии записи.
+
+        Аргументы:
+            **objects: snake и apple для Game (например, умеющие рисоваться).
+
+        Возвращает:
+            Game: Партия.
+        """
+        return Game(self.width, self.height, seed=self.seed, **objects)
+
+
+class ReplayWriter:
+    """
+    Запись партии в файл по ходу игры.
+
+    Атрибуты:
+        file: Открытый двоичный файл.
+        last_tick (int): Номер шага последней записи.
+    """
+
+    def __init__(self, path, width, height, seed):
+        """
+        Создаёт файл записи и пишет заголовок.
+
+        Аргументы:
+            path (str): Путь к файлу.
+            width (int): Ширина поля в клетках.
+            height (int): Высота поля в клетках.
+            seed (int): Зерно партии (до 2**64).
+        """
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, width,
+                                    height, seed))
+        self.file.flush()
+        self.last_tick = 0
+
+    def _write(self, tick, code):
+        """Пишет запись и сразу сбрасывает её на диск."""
+        self.file.write(encode_varint((tick - self.last_tick) * CODES + code))
+        self.file.flush()
+        self.last_tick = tick
+
+    def record(self, tick, action):
+        """
+        Записывает действие шага.
+
+        Аргументы:
+            tick (int): Номер шага (game.steps до вызова step).
+            action (tuple): Направление или None (ничего не пишется).
+        """
+        if action is not None:
+            self._write(tick, DIRECTIONS.index(action))
+
+    def close(self, length):
+        """
+        Завершает запись.
+
+        Аргументы:
+            length (int): Количество шагов партии.
+        """
+        if not self.file.closed:
+            self._write(length, END_CODE)
+            self.file.close()
+
+
+def read_replay(path):
+    """
+    Читает запись партии из файла.
+
+    Аргументы:
+        path (str): Путь к файлу.
+
+    Возвращает:
+        Replay: Запись.
+
+    Исключения:
+        ValueError: Файл не является записью партии.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f'Файл {path} слишком короткий для записи партии.')
+    magic, version, width, height, seed = HEADER.unpack_from(data)
+    if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+        raise ValueError(f'Файл {path} не является записью партии.')
+    replay = Replay(width, height, seed)
+    tick = 0
+    for value in decode_varints(data[HEADER.size:]):
+        delta, code = divmod(value, CODES)
+        tick += delta
+        if code == END_CODE:
+            replay.length = tick
+            break
+        replay.actions[tick] = DIRECTIONS[code]
+    return replay
+
+
+class ReplayPlayer:
+    """
+    Воспроизведение записи с быстрой перемоткой.
+
+    По ходу воспроизведения каждые snapshot_interval шагов запоминается
+    снимок партии. Перемотка начинается с ближайшего снимка до нужного
+    шага, а не с начала партии; назад перематывать тоже можно.
+
+    Атрибуты:
+        replay (Replay): Запись.
+        game (Game): Текущее состояние партии.
+        snapshot_interval (int): Шагов между снимками.
+        snapshots (dict): Номер шага -> снимок партии.
+    """
+
+    def __init__(self, replay, snapshot_interval=SNAPSHOT_INTERVAL,
+                 make_game=None):
+        """
+        Создаёт воспроизведение с начала партии.
+
+        Аргументы:
+            replay (Replay): Запись.
+            snapshot_interval (int): Шагов между снимками.
+            make_game (callable): Создаёт начальную партию (по умолчанию
+                replay.make_game).
+        """
+        self.replay = replay
+        self.snapshot_interval = snapshot_interval
+        self.game = (make_game or replay.make_game)()
+        self.snapshots = {0: copy.deepcopy(self.game)}
+
+    @property
+    def finished(self):
+        """Дошло ли воспроизведение до конца записи."""
+        return (self.replay.length is not None
+                and self.game.steps >= self.replay.length)
+
+    def step(self):
+        """
+        Выполняет один шаг записи.
+
+        Возвращает:
+            int: Событие шага (EVENT_*).
+        """
+        game = self.game
+        event = game.step(self.replay.actions.get(game.steps))
+        if game.steps % self.snapshot_interval == 0:
+            self.snapshots.setdefault(game.steps, copy.deepcopy(game))
+        return event
+
+    def seek(self, tick):
+        """
+        Перематывает партию к шагу tick без отрисовки.
+
+        Аргументы:
+            tick (int): Номер шага.
+
+        Возвращает:
+            Game: Состояние партии после tick шагов.
+        """
+        start = max(
+            (snapshot for snapshot in self.snapshots if snapshot <= tick),
+            default=0
+        )
+        if tick < self.game.steps or start > self.game.steps:
+            self.game = copy.deepcopy(self.snapshots[start])
+        while self.game.steps < tick:
+            self.step()
+        return self.game
+
+
+def main():
+    """Командная строка: перемотка записи к шагу и вывод состояния."""
+    parser = argparse.ArgumentParser(description='Воспроизведение записи.')
+    parser.add_argument('path', help='Файл записи.')
+    parser.add_argument('--seek', type=int, default=None,
+                        help='Номер шага (по умолчанию - конец записи).')
+    args = parser.parse_args()
+
+    replay = read_replay(args.path)
+    tick = args.seek
+    if tick is None:
+        tick = replay.length or max(replay.actions, default=0) + 1
+    player = ReplayPlayer(replay)
+    start = time.perf_counter()
+    game = player.seek(tick)
+    elapsed = time.perf_counter() - start
+    print(f'Поле {replay.width}×{replay.height}, зерно {replay.seed}, '
+          f'шагов в записи: {replay.length or "неизвестно"}')
+    print(f'Шаг {game.steps}: голова {game.snake.get_head_position()}, '
+          f'длина {len(game.snake.positions)}, яблоко {game.apple.position}, '
+          f'рекорд {game.record_length}')
+    print(f'Перемотка: {elapsed:.3f} с ({tick / max(elapsed, 1e-9):,.0f} '
+          'шагов/с)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,494 @@
+"""
+Игровая логика «Змейки» без зависимости от pygame.
+
+Координаты здесь задаются в клетках поля, а не в пикселях, поэтому движок
+можно запускать без окна и без ограничения частоты кадров: для ботов,
+нагрузочного тестирования и проверки правил. Модуль the_snake рисует
+состояние движка средствами pygame.
+"""
+from collections import deque
+from random import Random
+
+# Размер поля в клетках по умолчанию (640×480 пикселей при клетке 20 px):
+GRID_WIDTH = 32
+GRID_HEIGHT = 24
+
+# Направления движения:
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+
+# Противоположные направления (разворот на месте запрещён):
+OPPOSITE = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+
+# Направления в порядке их числовых кодов (для пакетного движка):
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+# События, которые возвращает Game.step:
+EVENT_NONE = 0  # Змейка просто сдвинулась
+EVENT_ATE = 1  # Змейка съела яблоко и выросла
+EVENT_COLLISION = 2  # Змейка врезалась в себя и начала заново
+EVENT_WIN = 3  # Змейка заняла всё поле и начала заново
+
+
+class SplitMix64:
+    """
+    Генератор случайных чисел SplitMix64 со счётчиком.
+
+    Каждое число - это перемешанное значение счётчика, поэтому генератор
+    легко повторить векторно для тысяч партий (batch_engine). Задаёт
+    только randrange, которого достаточно для выбора клетки яблока;
+    смещение от взятия по модулю пренебрежимо мало для размеров поля.
+
+    Атрибуты:
+        state (int): Текущее значение счётчика (64 бита).
+    """
+
+    GAMMA = 0x9E3779B97F4A7C15
+    MASK = (1 << 64) - 1
+
+    def __init__(self, seed=0):
+        """
+        Создаёт генератор.
+
+        Аргументы:
+            seed (int): Зерно (начальное значение счётчика).
+        """
+        self.state = seed & self.MASK
+
+    def next(self):
+        """
+        Возвращает следующее 64-битное случайное число.
+
+        Возвращает:
+            int: Число от 0 до 2**64 - 1.
+        """
+        self.state = (self.state + self.GAMMA) & self.MASK
+        z = self.state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & self.MASK
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & self.MASK
+        return z ^ (z >> 31)
+
+    def randrange(self, n):
+        """
+        Возвращает случайное число от 0 до n - 1.
+
+        Аргументы:
+            n (int): Количество вариантов.
+
+        Возвращает:
+            int: Случайное число.
+        """
+        return self.next() % n
+
+
+class FreeCells:
+    """
+    Свободные клетки поля с выбором случайной клетки за O(1).
+
+    Клетки хранятся в списке, а словарь хранит индекс каждой клетки в нём.
+    Удаление переносит последнюю клетку списка на место удалённой, поэтому
+    добавление, удаление и выбор не зависят от заполненности поля.
+
+    Атрибуты:
+        cells (list): Свободные клетки в произвольном порядке.
+        index (dict): Клетка -> её индекс в cells.
+    """
+
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, occupied=()):
+        """
+        Создаёт индекс, в котором свободны все клетки, кроме occupied.
+
+        Аргументы:
+            width (int): Ширина поля в клетках.
+            height (int): Высота поля в клетках.
+            occupied: Занятые клетки.
+        """
+        self.cells = [(x, y) for y in range(height) for x in range(width)]
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+        for cell in occupied:
+            self.remove(cell)
+
+    def __len__(self):
+        """Возвращает количество свободных клеток."""
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        """Проверяет, свободна ли клетка."""
+        return cell in self.index
+
+    def add(self, cell):
+        """
+        Освобождает клетку (повторное освобождение ничего не меняет).
+
+        Аргументы:
+            cell (tuple): Клетка поля.
+        """
+        if cell not in self.index:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def remove(self, cell):
+        """
+        Занимает клетку (занятая клетка остаётся занятой).
+
+        Аргументы:
+            cell (tuple): Клетка поля.
+        """
+        i = self.index.pop(cell, None)
+        if i is None:
+            return
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+
+    def choice(self, rng):
+        """
+        Выбирает случайную свободную клетку.
+
+        Аргументы:
+            rng (Random): Генератор случайных чисел.
+
+        Возвращает:
+            tuple: Клетка или None, если свободных клеток нет.
+        """
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+class GameObject:
+    """
+    Базовый класс для всех игровых объектов.
+
+    Атрибуты:
+        position (tuple): Позиция объекта на игровом поле.
+        body_color (tuple): Цвет объекта.
+
+    Методы:
+        __init__: Инициализация объекта.
+        draw: Абстрактный метод для отрисовки объекта.
+    """
+
+    def __init__(self, position=(0, 0), body_color=None):
+        """
+        Инициализация объекта.
+
+        Аргументы:
+            position (tuple): Позиция объекта на игровом поле
+                (по умолчанию (0, 0)).
+            body_color (tuple): Цвет объекта (по умолчанию None).
+        """
+        self.position = position
+        self.body_color = body_color
+
+    def draw(self):
+        """
+        Абстрактный метод для отрисовки объекта.
+        Должен быть переопределён в дочерних классах.
+        """
+        pass
+
+
+class Apple(GameObject):
+    """
+    Яблоко на игровом поле.
+
+    Атрибуты:
+        Наследует атрибуты от GameObject.
+        width (int): Ширина поля в клетках.
+        height (int): Высота поля в клетках.
+        rng (Random): Генератор случайных чисел для выбора позиции.
+    """
+
+    def __init__(self, body_color=None, width=GRID_WIDTH, height=GRID_HEIGHT,
+                 rng=None):
+        """
+        Инициализация яблока.
+
+        Аргументы:
+            body_color (tuple): Цвет яблока.
+            width (int): Ширина поля в клетках.
+            height (int): Высота поля в клетках.
+            rng (Random): Генератор случайных чисел (по умолчанию новый).
+        """
+        super().__init__(body_color=body_color)
+        self.width = width
+        self.height = height
+        self.rng = rng or Random()
+        self.randomize_position()
+
+    def randomize_position(self, snake_positions=None, free_cells=None):
+        """
+        Устанавливает случайное положение яблока на игровом поле.
+        Если переданы позиции змейки, яблоко не появится на её теле.
+
+        С индексом свободных клеток выбор занимает O(1) при любой
+        заполненности поля. Без него клетки перебираются случайно до
+        первой свободной, и при почти заполненном поле попыток много.
+
+        Аргументы:
+            snake_positions: Позиции змейки (по умолчанию None). Лучше
+                передавать множество Snake.occupied: проверка в нём O(1).
+            free_cells (FreeCells): Индекс свободных клеток (Snake.free).
+
+        Возвращает:
+            bool: False, если свободных клеток нет (position равно None).
+        """
+        if free_cells is not None:
+            self.position = free_cells.choice(self.rng)
+            return self.position is not None
+        if (snake_positions is not None
+                and len(snake_positions) >= self.width * self.height):
+            self.position = None
+            return False
+        randrange = self.rng.randrange
+        while True:
+            self.position = (randrange(self.width), randrange(self.height))
+            if snake_positions is None or self.position not in snake_positions:
+                return True
+
+
+class Snake(GameObject):
+    """
+    Змейка на игровом поле.
+
+    Атрибуты:
+        Наследует атрибуты от GameObject.
+        width (int): Ширина поля в клетках.
+        height (int): Высота поля в клетках.
+        positions (deque): Позиции сегментов змейки, голова - первая.
+        occupied (set): Клетки, занятые змейкой (для проверок за O(1)).
+        free (FreeCells): Клетки поля, не занятые змейкой (или другой
+            индекс с теми же методами, например large_board.Board).
+        direction (tuple): Текущее направление движения змейки.
+        next_direction (tuple): Следующее направление движения змейки.
+        last (tuple): Последняя позиция хвоста змейки.
+        bitten (bool): Врезалась ли голова в тело на последнем ходу.
+    """
+
+    def __init__(self, body_color=None, width=GRID_WIDTH, height=GRID_HEIGHT,
+                 free=None):
+        """
+        Инициализация змейки.
+
+        Аргументы:
+            body_color (tuple): Цвет змейки.
+            width (int): Ширина поля в клетках.
+            height (int): Высота поля в клетках.
+            free: Индекс свободных клеток (по умолчанию FreeCells на всё
+                поле, создаётся при первой расстановке).
+        """
+        super().__init__(body_color=body_color)
+        self.width = width
+        self.height = height
+        self.free = free
+        self.positions = ()
+        self.reset()
+
+    def reset(self):
+        """
+        Сбрасывает змейку в начальное состояние: одна клетка в центре поля.
+        """
+        self.place([(self.width // 2, self.height // 2)], RIGHT)
+
+    def place(self, positions, direction):
+        """
+        Ставит змейку в заданные клетки.
+
+        Аргументы:
+            positions (list): Клетки сегментов, голова - первая.
+            direction (tuple): Направление движения.
+        """
+        free = self.free
+        if free is None:
+            self.free = free = FreeCells(self.width, self.height)
+        else:
+            # Освобождаем только клетки прежнего тела: O(длины), а не O(поля)
+            for cell in self.positions:
+                free.add(cell)
+        self.positions = deque(positions)
+        self.occupied = set(self.positions)
+        for cell in self.positions:
+            free.remove(cell)
+        self.position = self.positions[0]
+        self.direction = direction
+        self.next_direction = None
+        self.last = None
+        self.bitten = False
+
+    def get_head_position(self):
+        """
+        Возвращает позицию головы змейки.
+
+        Возвращает:
+            tuple: Позиция головы змейки.
+        """
+        return self.positions[0]
+
+    def turn(self, direction):
+        """
+        Запоминает новое направление, если это не разворот назад.
+
+        Аргументы:
+            direction (tuple): Одно из направлений UP, DOWN, LEFT, RIGHT.
+        """
+        if direction != OPPOSITE[self.direction]:
+            self.next_direction = direction
+
+    def update_direction(self):
+        """
+        Обновляет направление движения змейки.
+        """
+        if self.next_direction:
+            self.direction = self.next_direction
+            self.next_direction = None
+
+    def move(self):
+        """
+        Сдвигает змейку на одну клетку с переходом через края поля.
+
+        Хвост освобождает клетку раньше, чем голова занимает новую, поэтому
+        голова может заехать в клетку, которую хвост покидает на этом ходу.
+        Все операции O(1): deque с обоих концов и множество occupied.
+        """
+        positions = self.positions
+        head_x, head_y = positions[0]
+        direction = self.direction
+        new_head = (
+            (head_x + direction[0]) % self.width,
+            (head_y + direction[1]) % self.height
+        )
+        occupied = self.occupied
+        self.last = tail = positions.pop()
+        occupied.discard(tail)
+        self.free.add(tail)
+        self.bitten = new_head in occupied
+        positions.appendleft(new_head)
+        occupied.add(new_head)
+        self.free.remove(new_head)
+        self.position = new_head
+
+    def grow(self):
+        """
+        Удлиняет змейку на один сегмент: возвращает хвост, убранный move.
+        """
+        self.positions.append(self.last)
+        self.occupied.add(self.last)
+        self.free.remove(self.last)
+
+    def collides_with_itself(self):
+        """
+        Проверяет, врезалась ли голова в тело на последнем ходу (O(1)).
+
+        После столкновения множество occupied не отражает двойную клетку,
+        поэтому змейку нужно сбросить (так делает Game.step).
+
+        Возвращает:
+            bool: True, если голова совпала с одним из сегментов тела.
+        """
+        return self.bitten
+
+
+class Game:
+    """
+    Состояние одной партии: змейка, яблоко и правила.
+
+    Атрибуты:
+        snake (Snake): Змейка.
+        apple (Apple): Яблоко.
+        rng (Random): Генератор случайных чисел партии (любой объект
+            с методом randrange).
+        record_length (int): Рекордная длина змейки.
+        steps (int): Количество сделанных шагов.
+        wins (int): Сколько раз змейка заняла всё поле.
+        resets (int): Сколько раз змейка начинала заново (после
+            столкновения или победы).
+    """
+
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, seed=None,
+                 snake=None, apple=None, rng=None):
+        """
+        Создаёт партию.
+
+        Аргументы:
+            width (int): Ширина поля в клетках.
+            height (int): Высота поля в клетках.
+            seed (int): Зерно генератора случайных чисел
+                (для воспроизводимости).
+            snake (Snake): Готовая змейка (например, умеющая рисоваться).
+            apple (Apple): Готовое яблоко (например, умеющее рисоваться);
+                его генератор заменяется генератором партии.
+            rng: Генератор партии вместо Random(seed), например
+                SplitMix64 для сверки с пакетным движком.
+        """
+        self.rng = rng if rng is not None else Random(seed)
+        self.snake = snake or Snake(width=width, height=height)
+        self.apple = apple or Apple(width=width, height=height)
+        # Все случайные решения партии берутся из одного генератора,
+        # поэтому партия полностью определяется зерном и действиями
+        self.apple.rng = self.rng
+        self.apple.randomize_position(free_cells=self.snake.free)
+        self.record_length = len(self.snake.positions)
+        self.steps = 0
+        self.wins = 0
+        self.resets = 0
+
+    def step(self, action=None):
+        """
+        Выполняет один шаг игры по правилам оригинальной функции main.
+
+        Аргументы:
+            action (tuple): Новое направление или None (продолжить движение).
+
+        Возвращает:
+            int: Событие шага: EVENT_NONE, EVENT_ATE, EVENT_COLLISION
+                или EVENT_WIN (змейка заняла всё поле, партия начата заново).
+        """
+        snake = self.snake
+        if action is not None:
+            snake.turn(action)
+        snake.update_direction()
+        snake.move()
+        self.steps += 1
+
+        event = EVENT_NONE
+        if snake.positions[0] == self.apple.position:
+            snake.grow()
+            if len(snake.positions) > self.record_length:
+                self.record_length = len(snake.positions)
+            event = EVENT_ATE
+            # Яблоко выбирается только среди свободных клеток
+            if not self.apple.randomize_position(free_cells=snake.free):
+                self.wins += 1
+                self.resets += 1
+                snake.reset()
+                self.apple.randomize_position(free_cells=snake.free)
+                return EVENT_WIN
+
+        if snake.collides_with_itself():
+            snake.reset()
+            self.resets += 1
+            event = EVENT_COLLISION
+        return event
+
+    def run(self, steps, policy=None):
+        """
+        Выполняет заданное число шагов без ограничения скорости.
+
+        Аргументы:
+            steps (int): Количество шагов.
+            policy (callable): Функция game -> направление или None.
+
+        Возвращает:
+            int: Количество съеденных яблок.
+        """
+        eaten = 0
+        step = self.step
+        for _ in range(steps):
+            event = step(policy(self) if policy else None)
+            if event == EVENT_ATE or event == EVENT_WIN:
+                eaten += 1
+        return eaten
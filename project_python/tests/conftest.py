@@ -1,6 +1,5 @@
 import os
 import sys
-from multiprocessing import Process
 from pathlib import Path
 from typing import Any
 
@@ -25,23 +24,8 @@ TIMEOUT_ASSERT_MSG = (
 )
 
 
-def import_the_snake():
-    import the_snake  # noqa
-
-
-@pytest.fixture(scope='session')
-def snake_import_test():
-    check_import_process = Process(target=import_the_snake)
-    check_import_process.start()
-    pid = check_import_process.pid
-    check_import_process.join(timeout=1)
-    if check_import_process.is_alive():
-        os.kill(pid, 9)
-        raise AssertionError(TIMEOUT_ASSERT_MSG)
-
-
 @pytest.fixture(scope='session')
-def _the_snake(snake_import_test):
+def _the_snake():
     try:
         import the_snake
     except ImportError as error:
@@ -49,6 +33,8 @@ def _the_snake(snake_import_test):
             'При импорте модуль `the_snake` произошла ошибка:\n'
             f'{type(error).__name__}: {error}'
         )
+    # Окно и часы создаются не при импорте, а явным вызовом
+    the_snake.init_display()
     for class_name in ('GameObject', 'Snake', 'Apple'):
         assert hasattr(the_snake, class_name), (
             f'Убедитесь, что в модуле `the_snake` определен класс `{class_name}`.'
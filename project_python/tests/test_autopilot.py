@@ -0,0 +1,77 @@
+import statistics
+
+import pytest
+
+import autopilot
+
+
+def test_streaming_stats_match_statistics():
+    values = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5]
+    stats = autopilot.StreamingStats(bin_width=3)
+    for value in values:
+        stats.add(value)
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.stdev == pytest.approx(statistics.stdev(values))
+    assert (stats.minimum, stats.maximum) == (1, 9)
+    assert stats.histogram == {0: 3, 3: 6, 6: 1, 9: 1}
+    assert sum(stats.histogram.values()) == len(values)
+
+
+def test_results_do_not_depend_on_workers():
+    def run(workers):
+        seen = []
+        stats = autopilot.run_autopilot('greedy', games=12, workers=workers,
+                                        seed=5, max_steps=300,
+                                        on_result=seen.append)
+        return stats, sorted(result['seed'] for result in seen)
+
+    single, seeds = run(1)
+    multi, multi_seeds = run(3)
+    assert seeds == multi_seeds == list(range(5, 17))
+    assert single.record.histogram == multi.record.histogram, (
+        'Статистика не должна зависеть от числа процессов.'
+    )
+    assert single.steps.mean == multi.steps.mean == 300
+
+
+def test_hamiltonian_policy_always_wins():
+    result = autopilot.play_game('hamiltonian', seed=1, width=6, height=4,
+                                 max_steps=10_000)
+    assert result['wins'] == 1 and result['collisions'] == 0
+    assert result['record'] == 24
+
+
+@pytest.mark.parametrize('width, height', [(6, 4), (6, 5), (4, 7)])
+def test_hamiltonian_cycle_covers_board(width, height):
+    cycle = autopilot.hamiltonian_cycle(width, height)
+    assert sorted(cycle) == [(x, y) for x in range(width)
+                             for y in range(height)]
+    for (x1, y1), (x2, y2) in zip(cycle, cycle[1:] + cycle[:1]):
+        assert abs(x2 - x1) + abs(y2 - y1) == 1, (
+            'Соседние клетки цикла не должны переходить через край поля.'
+        )
+
+
+def test_hamiltonian_policy_wins_on_odd_height():
+    result = autopilot.play_game('hamiltonian', seed=1, width=6, height=5,
+                                 max_steps=10_000)
+    assert result['wins'] == 1 and result['collisions'] == 0
+
+
+def test_hamiltonian_cycle_rejects_odd_board():
+    with pytest.raises(ValueError):
+        autopilot.hamiltonian_cycle(5, 5)
+
+
+def test_bfs_beats_greedy():
+    def mean_record(policy):
+        stats = autopilot.run_autopilot(policy, games=4, workers=1,
+                                        max_steps=1500)
+        return stats.record.mean
+
+    assert mean_record('bfs') > mean_record('greedy')
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        autopilot.run_autopilot('random', games=1)
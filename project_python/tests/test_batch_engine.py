@@ -0,0 +1,52 @@
+import pytest
+
+from autopilot import greedy_policy
+from snake_engine import DIRECTIONS, EVENT_WIN, Game, SplitMix64
+
+np = pytest.importorskip('numpy')
+batch_engine = pytest.importorskip('batch_engine')
+
+
+def test_splitmix_matches_scalar():
+    scalar = SplitMix64(12345)
+    state = np.array([12345], dtype=np.uint64)
+    for _ in range(100):
+        state, value = batch_engine.splitmix64(state)
+        assert int(value[0]) == scalar.next()
+
+
+@pytest.mark.parametrize('width, height, steps', (
+    (32, 24, 600),
+    (6, 4, 600),
+    (4, 2, 300),
+))
+def test_batch_matches_scalar_engine(width, height, steps):
+    n_games = 8
+    batch = batch_engine.BatchGame(n_games, width, height, seeds=100)
+    games = [Game(width, height, rng=SplitMix64(100 + i))
+             for i in range(n_games)]
+    rng = np.random.default_rng(width)
+    events_seen = set()
+    for step in range(steps):
+        greedy = batch.greedy_actions()
+        for i, game in enumerate(games):
+            action = greedy_policy(game)
+            expected = (batch_engine.NO_ACTION if action is None
+                        else DIRECTIONS.index(action))
+            assert greedy[i] == expected, 'Автопилоты должны совпадать.'
+        # Случайные повороты нужны, чтобы змейки врезались в себя
+        actions = np.where(rng.random(n_games) < 0.2,
+                           rng.integers(-1, 4, n_games), greedy)
+        events = batch.step(actions)
+        for i, game in enumerate(games):
+            action = None if actions[i] < 0 else DIRECTIONS[actions[i]]
+            assert game.step(action) == events[i]
+            assert list(game.snake.positions) == batch.positions(i), (
+                f'Шаг {step}, партия {i}: змейки должны совпадать.'
+            )
+            assert game.apple.position == batch.apple_position(i)
+            assert game.record_length == batch.record_length[i]
+        events_seen.update(events.tolist())
+    assert len(events_seen) >= 3
+    if width * height == 8:
+        assert EVENT_WIN in events_seen, 'На поле 4×2 змейки должны побеждать.'
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import the_snake
+
+
+def test_import_does_not_open_window():
+    code = (
+        'import the_snake, pygame\n'
+        'assert the_snake.screen is None and the_snake.clock is None\n'
+        'assert not pygame.display.get_init()\n'
+        'snake = the_snake.Snake()\n'
+        'snake.move()\n'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.abspath(the_snake.__file__)),
+        env={**os.environ, 'PYGAME_HIDE_SUPPORT_PROMPT': '1'},
+    )
+    assert result.returncode == 0, (
+        'Импорт `the_snake` не должен создавать окно игры:\n'
+        f'{result.stderr}'
+    )
+
+
+def test_init_display_is_idempotent(_the_snake):
+    screen = _the_snake.init_display()
+    clock = _the_snake.clock
+    assert _the_snake.init_display() is screen
+    assert _the_snake.screen is screen and _the_snake.clock is clock, (
+        'Повторный вызов `init_display` не должен пересоздавать окно и часы.'
+    )
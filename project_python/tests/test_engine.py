@@ -0,0 +1,174 @@
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+import snake_engine
+from snake_engine import (DOWN, EVENT_ATE, EVENT_COLLISION, EVENT_NONE,
+                          EVENT_WIN, LEFT, RIGHT, UP, Apple, FreeCells, Game,
+                          Snake)
+
+
+def test_engine_does_not_require_pygame():
+    result = subprocess.run(
+        [sys.executable, '-c',
+         "import sys; sys.modules['pygame'] = None; import snake_engine"],
+        cwd=os.path.dirname(os.path.abspath(snake_engine.__file__)),
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 0, (
+        'Модуль `snake_engine` должен импортироваться без pygame:\n'
+        f'{result.stderr}'
+    )
+
+
+def test_step_moves_head_one_cell():
+    game = Game(seed=1)
+    head_x, head_y = game.snake.get_head_position()
+    assert game.step() in (EVENT_NONE, EVENT_ATE)
+    assert game.snake.get_head_position() == (
+        (head_x + 1) % game.snake.width, head_y
+    ), 'За один шаг голова должна сдвинуться на одну клетку вправо.'
+
+
+def test_step_wraps_around_board():
+    game = Game(width=4, height=3, seed=1)
+    game.apple.position = (0, 0)
+    for _ in range(4):
+        game.step()
+    assert game.snake.get_head_position()[0] == 4 // 2, (
+        'Змейка должна проходить сквозь край поля.'
+    )
+
+
+def test_reverse_turn_is_ignored():
+    game = Game(seed=1)
+    game.step(LEFT)
+    assert game.snake.direction == RIGHT, (
+        'Разворот назад должен игнорироваться.'
+    )
+
+
+def grow_snake(game, length):
+    while len(game.snake.positions) < length:
+        head_x, head_y = game.snake.get_head_position()
+        game.apple.position = ((head_x + 1) % game.snake.width, head_y)
+        assert game.step() == EVENT_ATE
+
+
+def test_eating_apple_grows_snake():
+    game = Game(seed=3)
+    grow_snake(game, 2)
+    assert len(game.snake.positions) == 2
+    assert game.record_length == 2
+    assert game.apple.position not in game.snake.positions, (
+        'Новое яблоко не должно появляться на змейке.'
+    )
+
+
+def test_self_collision_resets_snake():
+    game = Game(seed=5)
+    grow_snake(game, 5)
+    game.apple.position = (0, 0)
+    events = [game.step(action) for action in (DOWN, LEFT, UP)]
+    assert events[-1] == EVENT_COLLISION
+    assert len(game.snake.positions) == 1, (
+        'После столкновения с собой змейка должна начинать заново.'
+    )
+    assert game.record_length == 5
+
+
+@pytest.mark.parametrize('seed', (0, 7, 42))
+def test_same_seed_gives_same_game(seed):
+    def play():
+        game = Game(seed=seed)
+        trace = []
+        for step in range(2000):
+            game.step((UP, LEFT, DOWN, RIGHT)[step // 7 % 4])
+            trace.append((game.snake.get_head_position(), game.apple.position))
+        return trace
+
+    assert play() == play(), 'Партии с одинаковым зерном должны совпадать.'
+
+
+def test_head_may_follow_tail():
+    snake = Snake()
+    snake.place([(1, 0), (0, 0), (0, 1), (1, 1)], RIGHT)
+    for direction in (DOWN, LEFT, UP, RIGHT) * 3:
+        snake.turn(direction)
+        snake.update_direction()
+        snake.move()
+        assert not snake.collides_with_itself(), (
+            'Голова может занять клетку, которую хвост покидает на этом ходу.'
+        )
+
+
+def test_occupied_matches_positions():
+    game = Game(seed=3)
+    rng = random.Random(3)
+    for _ in range(5000):
+        game.step(rng.choice((UP, DOWN, LEFT, RIGHT)))
+        snake = game.snake
+        assert snake.occupied == set(snake.positions)
+        assert len(snake.occupied) == len(snake.positions), (
+            'Множество занятых клеток должно совпадать с телом змейки.'
+        )
+        assert len(snake.free) + len(snake.occupied) == 32 * 24
+        assert all(cell not in snake.free for cell in snake.positions), (
+            'Индекс свободных клеток не должен содержать клетки змейки.'
+        )
+
+
+def test_free_cells_swap_remove():
+    free = FreeCells(3, 2, occupied=[(0, 0)])
+    assert len(free) == 5 and (0, 0) not in free
+    free.remove((2, 1))
+    free.remove((2, 1))
+    free.add((0, 0))
+    free.add((0, 0))
+    assert sorted(free.cells) == [(0, 0), (0, 1), (1, 0), (1, 1), (2, 0)]
+    assert all(free.cells[i] == cell for cell, i in free.index.items())
+
+
+def test_apple_spawn_is_seeded():
+    free = FreeCells(occupied=[(x, 0) for x in range(32)])
+
+    def spawns(seed):
+        apple = Apple(rng=random.Random(seed))
+        positions = []
+        for _ in range(50):
+            apple.randomize_position(free_cells=free)
+            positions.append(apple.position)
+        return positions
+
+    assert spawns(1) == spawns(1), (
+        'Яблоки с одинаковым зерном должны появляться в одних клетках.'
+    )
+    assert all(y != 0 for _, y in spawns(2))
+
+
+def test_apple_on_full_board():
+    apple = Apple(width=2, height=1)
+    full = [(0, 0), (1, 0)]
+    assert not apple.randomize_position(free_cells=FreeCells(2, 1, full))
+    assert apple.position is None
+    assert not apple.randomize_position(set(full)), (
+        'На заполненном поле поиск клетки для яблока должен завершаться.'
+    )
+
+
+def test_filling_board_is_a_win():
+    # Обход поля 4×2 по кругу: змейка съедает каждое яблоко на пути
+    route = {(2, 1): RIGHT, (3, 1): UP, (3, 0): LEFT, (2, 0): LEFT,
+             (1, 0): LEFT, (0, 0): DOWN, (0, 1): RIGHT, (1, 1): RIGHT}
+    game = Game(width=4, height=2, seed=11)
+    events = []
+    while EVENT_WIN not in events and len(events) < 100:
+        events.append(game.step(route[game.snake.get_head_position()]))
+    assert events[-1] == EVENT_WIN, 'Заполнение всего поля - победа.'
+    assert EVENT_COLLISION not in events
+    assert game.wins == 1 and game.record_length == 8
+    assert len(game.snake.positions) == 1
+    assert game.apple.position not in game.snake.positions
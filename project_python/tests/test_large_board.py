@@ -0,0 +1,200 @@
+import random
+import time
+
+import pygame
+import pytest
+
+from autopilot import greedy_policy
+from large_board import Board, LargeGame, Viewport
+from snake_engine import (DIRECTIONS, DOWN, EVENT_COLLISION, EVENT_WIN, LEFT,
+                          RIGHT, UP, FreeCells)
+
+
+def check_invariants(game):
+    snake_cells = set(game.snake.positions)
+    apple_cells = set(game.apple_at)
+    assert not snake_cells & apple_cells, 'Яблоко лежит на змейке.'
+    assert all(game.apple_at[apple.position] is apple
+               for apple in game.apples if apple.position is not None)
+    occupied = set().union(*game.board.chunks.values())
+    assert occupied == snake_cells | apple_cells, (
+        'Board должна хранить ровно клетки змейки и яблок.'
+    )
+    assert game.board.count == len(occupied)
+
+
+def test_board_matches_free_cells():
+    rng = random.Random(0)
+    board = Board(7, 5, chunk_size=3)
+    free = FreeCells(7, 5)
+    for _ in range(2000):
+        cell = (rng.randrange(7), rng.randrange(5))
+        if rng.random() < 0.5:
+            board.remove(cell)
+            free.remove(cell)
+        else:
+            board.add(cell)
+            free.add(cell)
+        assert len(board) == len(free)
+        assert (cell in board) == (cell in free)
+    assert all(not chunk == set() for chunk in board.chunks.values()), (
+        'Пустые участки не должны храниться.'
+    )
+
+
+def test_choice_on_almost_full_board():
+    board = Board(10, 10, chunk_size=4)
+    for x in range(10):
+        for y in range(10):
+            board.remove((x, y))
+    assert board.choice(random.Random(0)) is None
+    board.add((7, 3))
+    board.add((2, 9))
+    rng = random.Random(1)
+    picks = {board.choice(rng) for _ in range(200)}
+    assert picks == {(7, 3), (2, 9)}, (
+        'Перебор участков должен находить все свободные клетки.'
+    )
+
+
+def test_dirty_chunks():
+    board = Board(64, 64, chunk_size=16)
+    board.remove((1, 1))
+    board.remove((40, 20))
+    board.add((40, 20))
+    board.add((5, 5))  # Свободная клетка: ничего не меняется
+    assert board.take_dirty() == {(0, 0), (2, 1)}
+    assert board.take_dirty() == set()
+
+
+def test_large_board_does_not_scale_with_size():
+    start = time.perf_counter()
+    game = LargeGame(5000, 5000, apples=20, seed=0)
+    for _ in range(1000):
+        game.step(greedy_policy(game))
+    elapsed = time.perf_counter() - start
+    assert elapsed < 2, 'Партия на большом поле не должна перебирать поле.'
+    assert len(game.board.chunks) <= len(game.snake.positions) + 20
+    check_invariants(game)
+
+
+def test_apples_are_eaten_and_respawned():
+    game = LargeGame(60, 40, apples=30, seed=2, chunk_size=8)
+    rng = random.Random(2)
+    events = []
+    for _ in range(5000):
+        action = greedy_policy(game)
+        if rng.random() < 0.2:
+            action = rng.choice(DIRECTIONS)
+        events.append(game.step(action))
+        check_invariants(game)
+    assert len(game.apple_at) == 30
+    assert game.record_length > 10
+    assert EVENT_COLLISION in events
+
+
+def test_large_game_win():
+    route = {(2, 1): RIGHT, (3, 1): UP, (3, 0): LEFT, (2, 0): LEFT,
+             (1, 0): LEFT, (0, 0): DOWN, (0, 1): RIGHT, (1, 1): RIGHT}
+    game = LargeGame(4, 2, apples=3, seed=11, chunk_size=3)
+    events = []
+    while EVENT_WIN not in events and len(events) < 100:
+        events.append(game.step(route[game.snake.get_head_position()]))
+        check_invariants(game)
+    assert events[-1] == EVENT_WIN, 'Заполнение всего поля - победа.'
+    assert game.wins == 1 and game.record_length == 8
+    assert len(game.apple_at) == 3
+
+
+def test_construction_places_every_apple():
+    for _ in range(100):
+        game = LargeGame(4, 2, apples=3, seed=11, chunk_size=3)
+        assert len(game.apple_at) == 3, (
+            'Каждое яблоко должно лечь в свою клетку при создании партии.'
+        )
+        check_invariants(game)
+
+
+def test_missing_apples_return_after_reset():
+    game = LargeGame(4, 2, apples=3, seed=0, chunk_size=3)
+    rng = random.Random(0)
+    returned = 0
+    for _ in range(3000):
+        missing = len(game.apple_at) < 3
+        event = game.step(rng.choice(DIRECTIONS))
+        check_invariants(game)
+        if event == EVENT_COLLISION:
+            assert len(game.apple_at) == 3, (
+                'После сброса змейки все яблоки снова лежат на поле.'
+            )
+            returned += missing
+    assert returned > 0, 'Яблокам должно не хватать места до сброса.'
+
+
+def test_viewport_follows_head_with_margin():
+    view = Viewport(100, 100, 20, 10, margin=3)
+    assert not view.follow((10, 5))
+    assert not view.follow((16, 6))
+    assert view.follow((17, 6)), 'Голова у края - область сдвигается.'
+    assert (view.left, view.top) == (7, 0)
+    assert view.follow((99, 98)), 'Область переходит через край поля.'
+    assert view.to_view((99, 98)) == (10, 5)
+    assert view.to_view((8, 2)) == (19, 9)
+    assert view.to_view((9, 2)) is None
+
+
+def test_viewport_chunk_spans_wrap():
+    view = Viewport(40, 40, 12, 12)
+    view.left, view.top = 34, 0
+    assert view.chunk_spans((4, 0), 8) == [(0, 0, 6, 8)]
+    assert view.chunk_spans((0, 0), 8) == [(6, 0, 12, 8)]
+    assert view.chunk_spans((2, 0), 8) == []
+    assert sorted(view.visible_chunks(8)) == [(0, 0), (0, 1), (4, 0), (4, 1)]
+
+
+def test_incremental_viewport_matches_full_redraw(_the_snake):
+    game = LargeGame(90, 70, apples=40, seed=4, chunk_size=8)
+    size = (24 * 6, 18 * 6)
+    incremental = _the_snake.ViewportRenderer(
+        surface=pygame.Surface(size), grid_size=6
+    )
+    full = _the_snake.ViewportRenderer(
+        incremental=False, surface=pygame.Surface(size), grid_size=6
+    )
+    rng = random.Random(4)
+    partial = 0
+    for step in range(1500):
+        action = greedy_policy(game)
+        if rng.random() < 0.2:
+            action = rng.choice(DIRECTIONS)
+        game.step(action)
+        # Обе отрисовки забирают пометки участков: сохраняем их для второй
+        dirty = set(game.board.dirty)
+        rects = incremental.draw(game)
+        game.board.dirty = dirty
+        full.draw(game)
+        partial += rects is not None
+        assert (pygame.image.tostring(incremental.surface, 'RGB')
+                == pygame.image.tostring(full.surface, 'RGB')), (
+            f'Кадр {step}: инкрементальная отрисовка области отличается '
+            'от полной.'
+        )
+    assert partial > 1000, 'Большинство кадров должны быть частичными.'
+
+
+@pytest.mark.parametrize('chunk_size', [5, 16])
+def test_viewport_draws_only_visible_cells(_the_snake, chunk_size):
+    game = LargeGame(300, 300, apples=1, seed=0, chunk_size=chunk_size)
+    game.snake.place([(x, 150) for x in range(299, 49, -1)], RIGHT)
+    renderer = _the_snake.ViewportRenderer(
+        surface=pygame.Surface((200, 100)), grid_size=10
+    )
+    renderer.draw(game)
+    pixels = pygame.PixelArray(renderer.surface)
+    drawn = {(x, y) for x in range(20) for y in range(10)
+             if renderer.surface.unmap_rgb(pixels[x * 10 + 5, y * 10 + 5])
+             != _the_snake.BOARD_BACKGROUND_COLOR}
+    pixels.close()
+    cells = set(game.snake.positions) | set(game.apple_at)
+    expected = {renderer.viewport.to_view(cell) for cell in cells} - {None}
+    assert drawn == expected
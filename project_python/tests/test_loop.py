@@ -0,0 +1,54 @@
+from collections import deque
+
+from snake_engine import DOWN, LEFT, RIGHT, UP, Game
+
+
+def make_game():
+    return Game(seed=0)
+
+
+def test_quick_turns_are_not_lost(_the_snake):
+    game = make_game()
+    inputs = deque(maxlen=_the_snake.INPUT_QUEUE_SIZE)
+    # Два нажатия между шагами: вверх и сразу влево
+    _the_snake.queue_turn(inputs, game.snake, UP)
+    _the_snake.queue_turn(inputs, game.snake, LEFT)
+    x, y = game.snake.get_head_position()
+    tick = 1 / _the_snake.SPEED
+    _the_snake.run_ticks(game, 2 * tick, inputs)
+    assert game.snake.get_head_position() == (x - 1, y - 1), (
+        'Оба поворота из очереди должны выполниться на следующих шагах.'
+    )
+    assert not inputs
+
+
+def test_queue_drops_reversals_and_overflow(_the_snake):
+    game = make_game()
+    inputs = deque(maxlen=3)
+    for direction in (LEFT, RIGHT, UP, UP, DOWN, LEFT, DOWN, RIGHT, UP):
+        _the_snake.queue_turn(inputs, game.snake, direction)
+    assert list(inputs) == [UP, LEFT, DOWN], (
+        'Развороты и повторы отбрасываются, очередь ограничена.'
+    )
+
+
+def test_fixed_timestep_keeps_remainder(_the_snake):
+    game = make_game()
+    tick = 1 / _the_snake.SPEED
+    metrics = _the_snake.LoopMetrics()
+    remainder = _the_snake.run_ticks(game, 3.5 * tick, deque(), metrics)
+    assert game.steps == 3, 'Число шагов зависит только от времени.'
+    assert abs(remainder - 0.5 * tick) < 1e-9
+    assert metrics.ticks == 3 and metrics.tick_ms > 0
+    assert _the_snake.run_ticks(game, remainder, deque()) == remainder
+    assert game.steps == 3
+
+
+def test_caption_shows_metrics(_the_snake):
+    game = make_game()
+    metrics = _the_snake.LoopMetrics()
+    metrics.add_frame(0.004)
+    metrics.add_frame(0.002)
+    assert 3.7 < metrics.frame_ms < 3.9
+    caption = _the_snake.format_caption(game, metrics)
+    assert 'Рекорд: 1' in caption and 'мс' in caption
@@ -0,0 +1,165 @@
+"""
+Замеры скорости игрового цикла с сохранёнными базовыми значениями.
+
+Каждый замер - лучшее из нескольких повторений время одного вызова,
+делённое на время итерации калибровочного цикла (работа с кортежами,
+множеством и deque, как в движке). Так результаты разных машин сравнимы,
+и тест падает, если замер хуже базового значения из perf_baselines.json
+больше чем в PERF_THRESHOLD раз: это ловит алгоритмические ухудшения
+(например, O(длины) вместо O(1)), а не шум.
+
+Обновить базовые значения: SNAKE_PERF_UPDATE=1 pytest tests/test_performance.py
+Порог можно изменить переменной окружения SNAKE_PERF_THRESHOLD.
+"""
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from random import Random
+
+import pygame
+import pytest
+
+from autopilot import hamiltonian_cycle
+from snake_engine import RIGHT, Apple, Game, Snake
+
+pytestmark = pytest.mark.perf
+
+BASELINES_PATH = Path(__file__).with_name('perf_baselines.json')
+PERF_THRESHOLD = float(os.environ.get('SNAKE_PERF_THRESHOLD', 3.0))
+UPDATE_BASELINES = os.environ.get('SNAKE_PERF_UPDATE') == '1'
+
+CYCLE = hamiltonian_cycle()
+TURNS = [(x2 - x1, y2 - y1)
+         for (x1, y1), (x2, y2) in zip(CYCLE, CYCLE[1:] + CYCLE[:1])]
+
+
+def best_time(func, number, rounds):
+    """Лучшее из rounds повторений время одного вызова func в секундах."""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def calibration_loop(iterations=20_000):
+    cells = deque()
+    occupied = set()
+    for i in range(iterations):
+        cell = (i % 32, i % 24)
+        cells.appendleft(cell)
+        occupied.add(cell)
+        if len(cells) > 16:
+            occupied.discard(cells.pop())
+
+
+@pytest.fixture(scope='module')
+def calibration():
+    return best_time(calibration_loop, 5, 5) / 20_000
+
+
+@pytest.fixture(scope='module')
+def baselines():
+    stored = {}
+    if BASELINES_PATH.exists():
+        stored = json.loads(BASELINES_PATH.read_text(encoding='utf-8'))
+    measured = {}
+    yield stored, measured
+    if UPDATE_BASELINES and measured:
+        BASELINES_PATH.write_text(
+            json.dumps({**stored, **measured}, indent=2, sort_keys=True)
+            + '\n', encoding='utf-8'
+        )
+
+
+@pytest.fixture
+def benchmark(request, calibration, baselines):
+    """Замер в стиле pytest-benchmark: benchmark(func, number, rounds)."""
+    stored, measured = baselines
+    name = request.node.name
+
+    def run(func, number=2000, rounds=5, key=''):
+        cost = best_time(func, number, rounds) / calibration
+        full_name = f'{name}{key}'
+        measured[full_name] = round(cost, 3)
+        baseline = stored.get(full_name)
+        if baseline is not None and not UPDATE_BASELINES:
+            assert cost <= baseline * PERF_THRESHOLD, (
+                f'Замер {full_name} стал медленнее: {cost:.2f} вместо '
+                f'{baseline:.2f} калибровочных единиц (порог '
+                f'{PERF_THRESHOLD}×).'
+            )
+        return cost
+    return run
+
+
+def snake_on_cycle(length):
+    """Змейка длины length на гамильтоновом цикле и функция её хода."""
+    snake = Snake()
+    snake.place(CYCLE[length - 1::-1], TURNS[length - 2])
+    index = length - 1
+
+    def tick():
+        nonlocal index
+        snake.turn(TURNS[index])
+        snake.update_direction()
+        snake.move()
+        index = (index + 1) % len(CYCLE)
+    return snake, tick
+
+
+def test_snake_move(benchmark):
+    costs = {}
+    for length in (1, 767):
+        _, tick = snake_on_cycle(length)
+        costs[length] = benchmark(tick, key=f'[len{length}]')
+    assert costs[767] < costs[1] * PERF_THRESHOLD, (
+        'Время хода не должно зависеть от длины змейки.'
+    )
+
+
+def test_collision_check(benchmark):
+    snake, tick = snake_on_cycle(767)
+
+    def check():
+        tick()
+        if snake.collides_with_itself():
+            raise AssertionError('Змейка на цикле не должна врезаться.')
+    benchmark(check)
+
+
+def test_apple_randomize_at_high_fill(benchmark):
+    costs = {}
+    apple = Apple(rng=Random(0))
+    for fill in (0.0, 0.99, 767 / 768):
+        snake = Snake()
+        snake.place(CYCLE[max(1, round(fill * len(CYCLE))) - 1::-1], RIGHT)
+
+        def spawn():
+            apple.randomize_position(free_cells=snake.free)
+        costs[fill] = benchmark(spawn, key=f'[fill{fill:.3f}]')
+    assert costs[767 / 768] < costs[0.0] * PERF_THRESHOLD, (
+        'Выбор клетки яблока не должен зависеть от заполненности поля.'
+    )
+
+
+@pytest.mark.parametrize('incremental', [False, True],
+                         ids=['full', 'incremental'])
+def test_render_frame(_the_snake, benchmark, incremental):
+    game = Game(_the_snake.GRID_WIDTH, _the_snake.GRID_HEIGHT, seed=0,
+                snake=_the_snake.Snake(), apple=_the_snake.Apple())
+    game.snake.place(CYCLE[383::-1], TURNS[382])
+    renderer = _the_snake.Renderer(incremental=incremental)
+    index = 383
+
+    def frame():
+        nonlocal index
+        game.step(TURNS[index])
+        index = (index + 1) % len(CYCLE)
+        renderer.draw(game)
+    benchmark(frame, number=100)
+    assert pygame.display.get_surface() is not None
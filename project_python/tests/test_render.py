@@ -0,0 +1,75 @@
+import random
+
+import pygame
+import pytest
+
+from autopilot import greedy_policy
+from snake_engine import DOWN, LEFT, RIGHT, UP, Game
+
+
+def frame_bytes(module):
+    return pygame.image.tostring(module.screen, 'RGB')
+
+
+@pytest.mark.parametrize('seed', (0, 1))
+def test_incremental_frames_match_full_redraw(_the_snake, seed):
+    game = Game(_the_snake.GRID_WIDTH, _the_snake.GRID_HEIGHT, seed=seed,
+                snake=_the_snake.Snake(), apple=_the_snake.Apple())
+    incremental = _the_snake.Renderer(incremental=True)
+    full = _the_snake.Renderer(incremental=False)
+    rng = random.Random(seed)
+    # Автопилот ест яблоки, а случайные повороты приводят к столкновениям
+    for step in range(500):
+        if step % 4:
+            game.step(greedy_policy(game))
+        else:
+            game.step(rng.choice((UP, DOWN, LEFT, RIGHT)))
+        incremental.draw(game)
+        frame = frame_bytes(_the_snake)
+        full.draw(game)
+        assert frame == frame_bytes(_the_snake), (
+            f'Кадр {step} в инкрементальном режиме отличается от полного.'
+        )
+
+
+def test_incremental_frame_updates_few_rects(_the_snake):
+    game = Game(_the_snake.GRID_WIDTH, _the_snake.GRID_HEIGHT, seed=0,
+                snake=_the_snake.Snake(), apple=_the_snake.Apple())
+    renderer = _the_snake.Renderer(incremental=True)
+    assert renderer.draw(game) is None, 'Первый кадр рисуется целиком.'
+    assert renderer.draw(game) == [], 'Без шага перерисовывать нечего.'
+    game.step()
+    rects = renderer.draw(game)
+    assert rects is not None and len(rects) <= 4, (
+        'После шага перерисовываются только изменившиеся клетки.'
+    )
+
+
+def test_tiles_match_cell_drawing(_the_snake):
+    game = Game(_the_snake.GRID_WIDTH, _the_snake.GRID_HEIGHT, seed=3,
+                snake=_the_snake.Snake(head_color=(255, 255, 0)),
+                apple=_the_snake.Apple())
+    for _ in range(200):
+        game.step(greedy_policy(game))
+    _the_snake.Renderer(incremental=False).draw(game)
+    frame = frame_bytes(_the_snake)
+    _the_snake.screen.fill(_the_snake.BOARD_BACKGROUND_COLOR)
+    game.snake.draw()
+    game.apple.draw()
+    assert frame == frame_bytes(_the_snake), (
+        'Кадр из плиток должен совпадать с покадровым рисованием клеток.'
+    )
+
+
+def test_tile_cache_invalidation(_the_snake, monkeypatch):
+    cache = _the_snake.TileCache()
+    colors = {'background': (0, 0, 0), 'body': (0, 255, 0)}
+    tiles = cache.get(20, colors)
+    assert cache.get(20, dict(colors)) is tiles, 'Плитки рисуются один раз.'
+    assert cache.get(10, colors)['body'].get_size() == (10, 10), (
+        'При смене размера клетки плитки должны перерисовываться.'
+    )
+    recolored = cache.get(10, {**colors, 'body': (0, 0, 255)})
+    assert recolored['body'].get_at((5, 5))[:3] == (0, 0, 255)
+    monkeypatch.setattr(_the_snake, 'BORDER_COLOR', (1, 2, 3))
+    assert cache.get(10, {**colors, 'body': (0, 0, 255)}) is not recolored
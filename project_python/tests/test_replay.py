@@ -0,0 +1,118 @@
+import random
+from collections import deque
+
+import pytest
+
+from autopilot import greedy_policy
+from conftest import StopInfiniteLoop
+from replay import (HEADER, ReplayPlayer, ReplayWriter, decode_varints,
+                    encode_varint, read_replay)
+from snake_engine import DIRECTIONS, GRID_HEIGHT, GRID_WIDTH, Game
+
+
+def state(game):
+    return (list(game.snake.positions), game.snake.direction,
+            game.apple.position, game.steps, game.resets,
+            game.record_length)
+
+
+def play_and_record(path, seed=5, steps=3000, close=True):
+    """Играет партию со случайными поворотами и записывает её."""
+    game = Game(seed=seed)
+    writer = ReplayWriter(path, GRID_WIDTH, GRID_HEIGHT, seed)
+    turns = random.Random(seed)
+    history = [state(game)]
+    for _ in range(steps):
+        action = greedy_policy(game)
+        if turns.random() < 0.2:
+            action = turns.choice(DIRECTIONS)
+        writer.record(game.steps, action)
+        game.step(action)
+        history.append(state(game))
+    if close:
+        writer.close(game.steps)
+    else:
+        writer.file.close()
+    return history
+
+
+def test_varint_round_trip():
+    values = [0, 1, 127, 128, 300, 2 ** 32, 2 ** 63]
+    data = b''.join(encode_varint(value) for value in values)
+    assert decode_varints(data) == values
+    assert decode_varints(data + b'\x80') == values, (
+        'Оборванное последнее число должно пропускаться.'
+    )
+
+
+def test_replay_reproduces_game(tmp_path):
+    path = tmp_path / 'game.replay'
+    history = play_and_record(path)
+    replay = read_replay(path)
+    assert replay.length == len(history) - 1
+    assert path.stat().st_size < HEADER.size + 3 * len(history) // 2, (
+        'Запись должна хранить только повороты, а не каждый шаг.'
+    )
+    player = ReplayPlayer(replay)
+    for expected in history[1:]:
+        player.step()
+        assert state(player.game) == expected, (
+            'Воспроизведение должно повторять партию шаг в шаг.'
+        )
+    assert player.finished
+
+
+def test_seek_forward_and_backward(tmp_path):
+    path = tmp_path / 'game.replay'
+    history = play_and_record(path)
+    player = ReplayPlayer(read_replay(path), snapshot_interval=500)
+    for tick in (2500, 700, 1999, 0, 3000, 1000):
+        assert state(player.seek(tick)) == history[tick], (
+            f'Перемотка к шагу {tick} дала другое состояние.'
+        )
+    assert set(player.snapshots) == {0, 500, 1000, 1500, 2000, 2500, 3000}
+
+
+def test_unfinished_replay_is_readable(tmp_path):
+    path = tmp_path / 'game.replay'
+    history = play_and_record(path, steps=500, close=False)
+    replay = read_replay(path)
+    assert replay.length is None
+    player = ReplayPlayer(replay)
+    last_action = max(replay.actions)
+    assert state(player.seek(last_action + 1)) == history[last_action + 1]
+
+
+def test_bad_file_is_rejected(tmp_path):
+    path = tmp_path / 'game.replay'
+    path.write_bytes(b'not a replay at all')
+    with pytest.raises(ValueError):
+        read_replay(path)
+
+
+def test_run_ticks_records_actions(_the_snake, tmp_path):
+    path = tmp_path / 'game.replay'
+    game = Game(seed=3)
+    writer = ReplayWriter(path, GRID_WIDTH, GRID_HEIGHT, 3)
+    inputs = deque([DIRECTIONS[0], DIRECTIONS[2]])
+    _the_snake.run_ticks(game, 4 / _the_snake.SPEED, inputs,
+                         recorder=writer)
+    writer.close(game.steps)
+    replay = read_replay(path)
+    assert replay.actions == {0: DIRECTIONS[0], 1: DIRECTIONS[2]}
+    assert replay.length == 4
+
+
+@pytest.mark.usefixtures('modified_clock')
+def test_main_records_only_when_asked(_the_snake, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(StopInfiniteLoop):
+        _the_snake.main()
+    assert not list(tmp_path.iterdir()), (
+        'Без replay_path партия не должна записываться.'
+    )
+    path = tmp_path / 'game.replay'
+    with pytest.raises(StopInfiniteLoop):
+        _the_snake.main(replay_path=path)
+    replay = read_replay(path)
+    assert (replay.width, replay.height) == (GRID_WIDTH, GRID_HEIGHT)
@@ -1,17 +1,24 @@
-from random import choice, randint
+import argparse
+import random
+import time
+from collections import deque
+from itertools import islice, repeat
+
 import pygame
 
+import snake_engine
+from large_board import APPLE_COUNT, LargeGame, Viewport
+from replay import ReplayPlayer, ReplayWriter, read_replay
+from snake_engine import DOWN, LEFT, OPPOSITE, RIGHT, UP, Game
+from snake_engine import GameObject  # noqa: F401 - базовый класс объектов
+
 # Константы для размеров поля и сетки:
 SCREEN_WIDTH, SCREEN_HEIGHT = 640, 480  # Ширина и высота игрового поля
 GRID_SIZE = 20  # Размер одной ячейки сетки
 GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE  # Количество ячеек по ширине
 GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE  # Количество ячеек по высоте
 
-# Направления движения:
-UP = (0, -1)  # Движение вверх
-DOWN = (0, 1)  # Движение вниз
-LEFT = (-1, 0)  # Движение влево
-RIGHT = (1, 0)  # Движение вправо
+# Направления движения UP, DOWN, LEFT, RIGHT импортируются из snake_engine.
 
 # Цвет фона - черный:
 BOARD_BACKGROUND_COLOR = (0, 0, 0)
@@ -25,247 +32,860 @@ APPLE_COLOR = (255, 0, 0)
 # Цвет змейки:
 SNAKE_COLOR = (0, 255, 0)
 
-# Скорость движения змейки:
+# Цвет головы змейки:
+SNAKE_HEAD_COLOR = SNAKE_COLOR
+
+# Скорость движения змейки (шагов игры в секунду):
 SPEED = 20
 
-# Настройка игрового окна:
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), 0, 32)
+# Наибольшая частота кадров (0 - без ограничения):
+MAX_FPS = 60
+
+# Сколько поворотов запоминается между шагами игры:
+INPUT_QUEUE_SIZE = 3
+
+# Наибольшее время кадра, которое догоняет симуляция (в секундах); после
+# долгой паузы игра не прокручивает пропущенные шаги разом:
+MAX_FRAME_TIME = 0.25
+
+# Как часто обновлять метрики в заголовке окна (в секундах):
+CAPTION_INTERVAL = 1.0
+
+# Файл записи партии для ключа --record без пути:
+REPLAY_FILE = 'last_game.replay'
 
-# Заголовок окна игрового поля:
-pygame.display.set_caption('Змейка')
+# Клавиши управления:
+KEY_DIRECTIONS = {
+    pygame.K_UP: UP,
+    pygame.K_DOWN: DOWN,
+    pygame.K_LEFT: LEFT,
+    pygame.K_RIGHT: RIGHT,
+}
 
-# Настройка времени:
-clock = pygame.time.Clock()
+# Перерисовывать только изменившиеся клетки (иначе - весь кадр):
+INCREMENTAL_RENDERING = True
 
+# Размер клетки в пикселях на большом поле (режим --board):
+LARGE_GRID_SIZE = 10
 
-class GameObject:
+# Игровое окно и часы создаются в init_display(), а не при импорте, чтобы
+# классы модуля можно было использовать без окна:
+screen = None
+clock = None
+
+
+def init_display():
     """
-    Базовый класс для всех игровых объектов.
+    Создаёт игровое окно и часы, если они ещё не созданы.
 
-    Атрибуты:
-        position (tuple): Позиция объекта на игровом поле.
-        body_color (tuple): Цвет объекта.
+    Повторный вызов ничего не меняет, а уже заданные screen или clock
+    (например, подменённые в тестах) не пересоздаются.
 
-    Методы:
-        __init__: Инициализация объекта.
-        draw: Абстрактный метод для отрисовки объекта.
+    Возвращает:
+        pygame.Surface: Поверхность игрового окна.
     """
+    global screen, clock
+    if screen is None:
+        # Настройка игрового окна:
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), 0, 32)
 
-    def __init__(self, position=(0, 0), body_color=None):
-        """
-        Инициализация объекта.
+        # Заголовок окна игрового поля:
+        pygame.display.set_caption('Змейка')
+    if clock is None:
+        # Настройка времени:
+        clock = pygame.time.Clock()
+    return screen
 
-        Аргументы:
-            position (tuple): Позиция объекта на игровом поле (по умолчанию (0, 0)).
-            body_color (tuple): Цвет объекта (по умолчанию None).
-        """
-        self.position = position
-        self.body_color = body_color
 
-    def draw(self):
-        """
-        Абстрактный метод для отрисовки объекта.
-        Должен быть переопределён в дочерних классах.
-        """
-        pass
+def cell_rect(position):
+    """
+    Возвращает прямоугольник клетки на экране.
 
+    Аргументы:
+        position (tuple): Координаты клетки (в клетках, не в пикселях).
 
-class Apple(GameObject):
-    """Класс для яблока на игровом поле."""
+    Возвращает:
+        pygame.Rect: Прямоугольник клетки в пикселях.
+    """
+    return pygame.Rect(
+        (position[0] * GRID_SIZE, position[1] * GRID_SIZE),
+        (GRID_SIZE, GRID_SIZE)
+    )
 
-    def __init__(self, body_color=APPLE_COLOR):
-        """
-        Инициализация яблока.
 
-        :param body_color: Цвет яблока (по умолчанию APPLE_COLOR).
-        """
-        super().__init__(body_color=body_color)
-        self.randomize_position()
+def draw_cell(position, color):
+    """
+    Рисует одну клетку поля с рамкой.
 
-    def randomize_position(self, snake_positions=None):
+    Аргументы:
+        position (tuple): Координаты клетки (в клетках, не в пикселях).
+        color (tuple): Цвет заливки.
+
+    Возвращает:
+        pygame.Rect: Перерисованный прямоугольник.
+    """
+    rect = cell_rect(position)
+    surface = init_display()
+    pygame.draw.rect(surface, color, rect)
+    pygame.draw.rect(surface, BORDER_COLOR, rect, 1)
+    return rect
+
+
+def erase_cell(position):
+    """
+    Закрашивает клетку цветом фона.
+
+    Аргументы:
+        position (tuple): Координаты клетки (в клетках, не в пикселях).
+
+    Возвращает:
+        pygame.Rect: Перерисованный прямоугольник.
+    """
+    rect = cell_rect(position)
+    pygame.draw.rect(init_display(), BOARD_BACKGROUND_COLOR, rect)
+    return rect
+
+
+class Apple(snake_engine.Apple):
+    """Яблоко на игровом поле, умеющее рисоваться средствами pygame."""
+
+    def __init__(self, body_color=APPLE_COLOR, rng=None):
         """
-        Устанавливает случайное положение яблока на игровом поле.
-        Если переданы позиции змейки, яблоко не появится на её теле.
+        Инициализация яблока.
 
-        :param snake_positions: Список позиций змейки (по умолчанию None).
+        :param body_color: Цвет яблока (по умолчанию APPLE_COLOR).
+        :param rng: Генератор случайных чисел (по умолчанию новый).
         """
-        while True:
-            self.position = (
-                randint(0, GRID_WIDTH - 1) * GRID_SIZE,
-                randint(0, GRID_HEIGHT - 1) * GRID_SIZE
-            )
-            # Если позиции змейки переданы, проверяем, не совпадает ли яблоко с её телом
-            if snake_positions is None or self.position not in snake_positions:
-                break
+        super().__init__(body_color=body_color, width=GRID_WIDTH,
+                         height=GRID_HEIGHT, rng=rng)
 
     def draw(self):
         """
         Отрисовывает яблоко на игровом поле.
         """
-        rect = pygame.Rect(self.position, (GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(screen, self.body_color, rect)
-        pygame.draw.rect(screen, BORDER_COLOR, rect, 1)
+        draw_cell(self.position, self.body_color)
 
 
-class Snake(GameObject):
+class Snake(snake_engine.Snake):
     """
-    Класс для змейки на игровом поле.
+    Змейка на игровом поле, умеющая рисоваться средствами pygame.
 
-    Атрибуты:
-        Наследует атрибуты от GameObject.
-        positions (list): Список позиций сегментов змейки.
+    Атрибуты и методы движения наследуются от snake_engine.Snake:
+        positions (deque): Позиции сегментов змейки (в клетках).
+        head_color (tuple): Цвет головы змейки.
         direction (tuple): Текущее направление движения змейки.
         next_direction (tuple): Следующее направление движения змейки.
         last (tuple): Последняя позиция хвоста змейки.
 
     Методы:
-        __init__: Инициализация змейки.
-        reset: Сбрасывает змейку в начальное состояние.
-        get_head_position: Возвращает позицию головы змейки.
-        update_direction: Обновляет направление движения змейки.
-        move: Обновляет позицию змейки на игровом поле.
         draw: Отрисовывает змейку на игровом поле.
     """
 
-    def __init__(self, body_color=SNAKE_COLOR):
+    def __init__(self, body_color=SNAKE_COLOR, head_color=SNAKE_HEAD_COLOR):
         """
         Инициализация змейки.
 
         Аргументы:
             body_color (tuple): Цвет змейки (по умолчанию SNAKE_COLOR).
+            head_color (tuple): Цвет головы (по умолчанию SNAKE_HEAD_COLOR).
         """
-        super().__init__(body_color=body_color)
-        self.reset()
+        super().__init__(body_color=body_color, width=GRID_WIDTH,
+                         height=GRID_HEIGHT)
+        self.head_color = head_color
 
-    def reset(self):
+    def draw(self):
         """
-        Сбрасывает змейку в начальное состояние.
+        Отрисовывает змейку на игровом поле.
         """
-        self.positions = [((SCREEN_WIDTH // 2), (SCREEN_HEIGHT // 2))]
-        self.direction = RIGHT
-        self.next_direction = None
-        self.last = None
+        # Затирание последнего сегмента (до отрисовки тела: клетка хвоста
+        # может быть снова занята, если змейка выросла)
+        if self.last:
+            erase_cell(self.last)
+
+        for position in islice(self.positions, 1, None):
+            draw_cell(position, self.body_color)
+        draw_cell(self.positions[0], self.head_color)
+
 
-    def get_head_position(self):
+class CellPixels(dict):
+    """
+    Кеш координат клеток в пикселях: клетка -> левый верхний угол.
+
+    Координаты вычисляются при первом обращении к клетке, после чего кадр
+    собирается без арифметики и создания кортежей на каждую клетку.
+    """
+
+    def __init__(self, size):
+        """
+        Создаёт пустой кеш для клеток размером size пикселей.
+
+        Аргументы:
+            size (int): Размер клетки в пикселях.
+        """
+        super().__init__()
+        self.size = size
+
+    def __missing__(self, cell):
+        """Вычисляет и запоминает координаты клетки."""
+        pixel = self[cell] = (cell[0] * self.size, cell[1] * self.size)
+        return pixel
+
+
+class TileCache:
+    """
+    Заранее нарисованные клетки поля: фон, тело и голова змейки, яблоко.
+
+    Каждая плитка рисуется один раз (заливка и рамка), а кадры собираются
+    копированием плиток пакетом через Surface.blits вместо двух вызовов
+    pygame.draw.rect и нового Rect на клетку. Плитки перерисовываются
+    при смене размера клетки или любого из цветов.
+
+    Атрибуты:
+        key (tuple): Размер клетки и цвета, для которых нарисованы плитки.
+        tiles (dict): Тип клетки -> pygame.Surface.
+        pixels (CellPixels): Координаты клеток в пикселях.
+    """
+
+    def __init__(self):
+        """Создаёт пустой кеш: плитки рисуются при первом обращении."""
+        self.key = None
+        self.tiles = {}
+        self.pixels = CellPixels(0)
+
+    def get(self, size, colors):
+        """
+        Возвращает плитки для размера клетки и цветов.
+
+        Аргументы:
+            size (int): Размер клетки в пикселях.
+            colors (dict): Тип клетки ('background', 'body', 'head',
+                'apple') -> цвет заливки.
+
+        Возвращает:
+            dict: Тип клетки -> pygame.Surface.
+        """
+        key = (size, BORDER_COLOR, tuple(colors.items()))
+        if key != self.key:
+            self.tiles = {
+                name: self.render_tile(size, color, name != 'background')
+                for name, color in colors.items()
+            }
+            self.key = key
+            if self.pixels.size != size:
+                self.pixels = CellPixels(size)
+        return self.tiles
+
+    @staticmethod
+    def render_tile(size, color, bordered):
         """
-        Возвращает позицию головы змейки.
+        Рисует одну плитку.
+
+        Аргументы:
+            size (int): Размер клетки в пикселях.
+            color (tuple): Цвет заливки.
+            bordered (bool): Рисовать ли рамку клетки.
 
         Возвращает:
-            tuple: Позиция головы змейки.
+            pygame.Surface: Плитка в формате экрана (если окно создано).
+        """
+        tile = pygame.Surface((size, size))
+        tile.fill(color)
+        if bordered:
+            pygame.draw.rect(tile, BORDER_COLOR, tile.get_rect(), 1)
+        return tile.convert() if pygame.display.get_surface() else tile
+
+
+class Renderer:
+    """
+    Отрисовка партии на экране.
+
+    В инкрементальном режиме после одного шага перерисовываются только
+    изменившиеся клетки: стёртый хвост, новая и прежняя голова и
+    переместившееся яблоко, а на экран выводятся только их прямоугольники.
+    Первый кадр, кадр после сброса змейки и кадр, между которым и
+    предыдущим прошло больше одного шага, рисуются целиком. Клетки
+    копируются из TileCache пакетами через Surface.blits.
+
+    Атрибуты:
+        incremental (bool): Перерисовывать ли только изменившиеся клетки.
+        surface (pygame.Surface): Поверхность для рисования (None - экран).
+        grid_size (int): Размер клетки в пикселях (None - GRID_SIZE).
+        tiles (TileCache): Кеш нарисованных клеток.
+        steps (int): Номер шага партии на последнем кадре.
+        resets (int): Количество сбросов змейки на последнем кадре.
+        apple_position (tuple): Позиция яблока на последнем кадре.
+    """
+
+    def __init__(self, incremental=INCREMENTAL_RENDERING, surface=None,
+                 grid_size=None):
+        """
+        Инициализация отрисовки.
+
+        Аргументы:
+            incremental (bool): Перерисовывать ли только изменившиеся клетки.
+            surface (pygame.Surface): Поверхность для рисования
+                (по умолчанию экран игры).
+            grid_size (int): Размер клетки в пикселях (по умолчанию
+                GRID_SIZE на момент рисования).
+        """
+        self.incremental = incremental
+        self.surface = surface
+        self.grid_size = grid_size
+        self.tiles = TileCache()
+        self.steps = None
+        self.resets = None
+        self.apple_position = None
+
+    def draw(self, game):
         """
-        return self.positions[0]
+        Рисует кадр и выводит его на экран.
 
-    def update_direction(self):
+        Аргументы:
+            game (Game): Партия.
+
+        Возвращает:
+            list: Выведенные прямоугольники или None, если выведен весь кадр.
         """
-        Обновляет направление движения змейки.
+        if (not self.incremental or self.steps is None
+                or game.resets != self.resets
+                or game.steps - self.steps not in (0, 1)):
+            rects = self.draw_full(game)
+        elif game.steps == self.steps:
+            rects = []
+        else:
+            rects = self.draw_changes(game)
+        self.steps = game.steps
+        self.resets = game.resets
+        self.apple_position = game.apple.position
+
+        if self.target() is not pygame.display.get_surface():
+            return rects
+        if rects is None:
+            pygame.display.update()
+        elif rects:
+            pygame.display.update(rects)
+        return rects
+
+    def target(self):
+        """Возвращает поверхность, на которой рисуется кадр."""
+        if self.surface is not None:
+            return self.surface
+        return init_display()
+
+    def tile_set(self, game):
         """
-        if self.next_direction:
-            self.direction = self.next_direction
-            self.next_direction = None
+        Возвращает плитки для текущих цветов и размера клетки.
 
-    def move(self):
+        Аргументы:
+            game (Game): Партия.
+
+        Возвращает:
+            dict: Тип клетки -> pygame.Surface.
         """
-        Обновляет позицию змейки на игровом поле.
+        snake = game.snake
+        body_color = snake.body_color or SNAKE_COLOR
+        return self.tiles.get(self.grid_size or GRID_SIZE, {
+            'background': BOARD_BACKGROUND_COLOR,
+            'body': body_color,
+            'head': getattr(snake, 'head_color', None) or body_color,
+            'apple': game.apple.body_color or APPLE_COLOR,
+        })
+
+    def draw_full(self, game):
         """
-        head_x, head_y = self.get_head_position()
-        new_head = (
-            (head_x + self.direction[0] * GRID_SIZE) % SCREEN_WIDTH,
-            (head_y + self.direction[1] * GRID_SIZE) % SCREEN_HEIGHT
+        Рисует весь кадр заново.
+
+        Аргументы:
+            game (Game): Партия.
+
+        Возвращает:
+            None: Обновить нужно весь экран.
+        """
+        tiles = self.tile_set(game)
+        pixels = self.tiles.pixels
+        positions = game.snake.positions
+        surface = self.target()
+        surface.fill(BOARD_BACKGROUND_COLOR)
+        surface.blits(
+            zip(repeat(tiles['body']), map(pixels.__getitem__, positions)),
+            doreturn=False
         )
-        self.positions.insert(0, new_head)
-        self.last = self.positions.pop()
+        surface.blit(tiles['head'], pixels[positions[0]])
+        surface.blit(tiles['apple'], pixels[game.apple.position])
+        return None
 
-    def draw(self):
+    def draw_changes(self, game):
         """
-        Отрисовывает змейку на игровом поле.
+        Перерисовывает клетки, изменившиеся за один шаг.
+
+        Аргументы:
+            game (Game): Партия.
+
+        Возвращает:
+            list: Перерисованные прямоугольники.
         """
-        for position in self.positions[:-1]:
-            rect = pygame.Rect(position, (GRID_SIZE, GRID_SIZE))
-            pygame.draw.rect(screen, self.body_color, rect)
-            pygame.draw.rect(screen, BORDER_COLOR, rect, 1)
+        snake = game.snake
+        tiles = self.tile_set(game)
+        pixels = self.tiles.pixels
+        cells = []
+        # Хвост стирается, только если клетку не заняли снова (змейка
+        # выросла или голова въехала в клетку, которую покинул хвост)
+        if snake.last is not None and snake.last not in snake.occupied:
+            cells.append((tiles['background'], snake.last))
+        if len(snake.positions) > 1:
+            cells.append((tiles['body'], snake.positions[1]))
+        cells.append((tiles['head'], snake.positions[0]))
+        if game.apple.position != self.apple_position:
+            cells.append((tiles['apple'], game.apple.position))
+        return self.target().blits(
+            [(tile, pixels[cell]) for tile, cell in cells]
+        )
 
-        # Отрисовка головы змейки
-        head_rect = pygame.Rect(self.positions[0], (GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(screen, self.body_color, head_rect)
-        pygame.draw.rect(screen, BORDER_COLOR, head_rect, 1)
 
-        # Затирание последнего сегмента
-        if self.last:
-            last_rect = pygame.Rect(self.last, (GRID_SIZE, GRID_SIZE))
-            pygame.draw.rect(screen, BOARD_BACKGROUND_COLOR, last_rect)
+class ViewportRenderer(Renderer):
+    """
+    Отрисовка видимой области большого поля (large_board.LargeGame).
 
+    Область (Viewport) размером с поверхность следует за головой змейки.
+    Пока область не сдвинулась, перерисовываются только видимые участки
+    поля, помеченные Board как изменившиеся, и участок прежней головы;
+    после сдвига рисуются все видимые участки. Время кадра зависит от
+    размера области и числа занятых клеток в ней, а не от размера поля.
 
-def handle_keys(snake):
+    Атрибуты:
+        Наследует атрибуты от Renderer.
+        viewport (Viewport): Видимая область (создаётся при первом кадре).
+        head (tuple): Клетка головы на последнем кадре.
+    """
+
+    def __init__(self, incremental=INCREMENTAL_RENDERING, surface=None,
+                 grid_size=LARGE_GRID_SIZE):
+        """
+        Инициализация отрисовки.
+
+        Аргументы:
+            incremental (bool): Перерисовывать ли только изменившиеся
+                участки.
+            surface (pygame.Surface): Поверхность для рисования
+                (по умолчанию экран игры).
+            grid_size (int): Размер клетки в пикселях.
+        """
+        super().__init__(incremental, surface, grid_size)
+        self.viewport = None
+        self.head = None
+
+    def draw(self, game):
+        """
+        Рисует кадр и выводит его на экран.
+
+        Аргументы:
+            game (LargeGame): Партия на большом поле.
+
+        Возвращает:
+            list: Выведенные прямоугольники или None, если выведен весь кадр.
+        """
+        board = game.board
+        surface = self.target()
+        head = game.snake.positions[0]
+        full = not self.incremental or self.viewport is None
+        if self.viewport is None:
+            width, height = surface.get_size()
+            self.viewport = Viewport(board.width, board.height,
+                                     width // self.grid_size,
+                                     height // self.grid_size)
+        if self.viewport.follow(head):
+            full = True
+        dirty = board.take_dirty()
+
+        if full:
+            surface.fill(BOARD_BACKGROUND_COLOR)
+            rects = None
+            chunks = self.viewport.visible_chunks(board.chunk_size)
+        else:
+            rects = []
+            # Прежняя голова стала телом, не меняя занятость участка
+            if self.head is not None:
+                dirty.add(board.chunk_of(self.head))
+            chunks = self.clear_chunks(dirty, board.chunk_size, rects)
+        self.draw_chunks(game, chunks)
+        self.head = head
+
+        if surface is not pygame.display.get_surface():
+            return rects
+        if rects is None:
+            pygame.display.update()
+        elif rects:
+            pygame.display.update(rects)
+        return rects
+
+    def clear_chunks(self, chunks, chunk_size, rects):
+        """
+        Закрашивает фоном видимые части участков.
+
+        Аргументы:
+            chunks: Участки (cx, cy).
+            chunk_size (int): Сторона участка в клетках.
+            rects (list): Список, в который добавляются закрашенные
+                прямоугольники.
+
+        Возвращает:
+            list: Участки, которые хотя бы частично видны.
+        """
+        size = self.grid_size
+        surface = self.target()
+        visible = []
+        for key in chunks:
+            spans = self.viewport.chunk_spans(key, chunk_size)
+            for x0, y0, x1, y1 in spans:
+                rect = pygame.Rect(x0 * size, y0 * size, (x1 - x0) * size,
+                                   (y1 - y0) * size)
+                surface.fill(BOARD_BACKGROUND_COLOR, rect)
+                rects.append(rect)
+            if spans:
+                visible.append(key)
+        return visible
+
+    def draw_chunks(self, game, chunks):
+        """
+        Рисует занятые клетки участков, попавшие в видимую область.
+
+        Аргументы:
+            game (LargeGame): Партия на большом поле.
+            chunks: Участки (cx, cy).
+        """
+        tiles = self.tile_set(game)
+        pixels = self.tiles.pixels
+        to_view = self.viewport.to_view
+        occupied_in = game.board.occupied_in
+        apple_at = game.apple_at
+        head = game.snake.positions[0]
+        cells = []
+        for key in chunks:
+            for cell in occupied_in(key):
+                view = to_view(cell)
+                if view is None:
+                    continue
+                if cell in apple_at:
+                    tile = tiles['apple']
+                elif cell == head:
+                    tile = tiles['head']
+                else:
+                    tile = tiles['body']
+                cells.append((tile, pixels[view]))
+        self.target().blits(cells, doreturn=False)
+
+
+class LoopMetrics:
+    """
+    Метрики игрового цикла: время кадра и время шага игры.
+
+    Времена сглаживаются экспоненциальным скользящим средним, чтобы
+    значения в заголовке окна не скакали от кадра к кадру.
+
+    Атрибуты:
+        frame_ms (float): Среднее время работы кадра (без ожидания) в мс.
+        tick_ms (float): Среднее время одного шага игры в мс.
+        frames (int): Количество кадров.
+        ticks (int): Количество шагов игры.
+    """
+
+    # Вес нового значения в скользящем среднем:
+    SMOOTHING = 0.1
+
+    def __init__(self):
+        """Инициализация пустых метрик."""
+        self.frame_ms = 0.0
+        self.tick_ms = 0.0
+        self.frames = 0
+        self.ticks = 0
+
+    @classmethod
+    def _average(cls, current, value, count):
+        """Добавляет значение в скользящее среднее."""
+        if count == 0:
+            return value
+        return current + cls.SMOOTHING * (value - current)
+
+    def add_frame(self, seconds):
+        """
+        Учитывает время работы кадра.
+
+        Аргументы:
+            seconds (float): Время кадра в секундах.
+        """
+        self.frame_ms = self._average(self.frame_ms, seconds * 1000,
+                                      self.frames)
+        self.frames += 1
+
+    def add_tick(self, seconds):
+        """
+        Учитывает время шага игры.
+
+        Аргументы:
+            seconds (float): Время шага в секундах.
+        """
+        self.tick_ms = self._average(self.tick_ms, seconds * 1000,
+                                     self.ticks)
+        self.ticks += 1
+
+
+def queue_turn(inputs, snake, direction):
+    """
+    Добавляет поворот в очередь ввода.
+
+    Поворот сравнивается с последним поворотом в очереди (или с текущим
+    направлением змейки): разворот назад и повтор направления
+    отбрасываются. Переполненная очередь новые повороты не принимает.
+
+    Аргументы:
+        inputs (deque): Очередь поворотов.
+        snake (Snake): Объект змейки.
+        direction (tuple): Новое направление.
+    """
+    previous = inputs[-1] if inputs else snake.direction
+    if (direction in (previous, OPPOSITE[previous])
+            or len(inputs) == inputs.maxlen):
+        return
+    inputs.append(direction)
+
+
+def run_ticks(game, accumulator, inputs, metrics=None, recorder=None):
+    """
+    Выполняет все шаги игры, накопившиеся за время кадров.
+
+    Каждый шаг длится ровно 1 / SPEED секунды, поэтому скорость игры не
+    зависит от частоты кадров. На каждый шаг из очереди берётся не больше
+    одного поворота, так что быстрые последовательности клавиш не теряются.
+
+    Аргументы:
+        game (Game): Партия.
+        accumulator (float): Накопленное время в секундах.
+        inputs (deque): Очередь поворотов.
+        metrics (LoopMetrics): Метрики цикла (по умолчанию не собираются).
+        recorder (ReplayWriter): Запись партии (по умолчанию не ведётся).
+
+    Возвращает:
+        float: Остаток накопленного времени (меньше одного шага).
+    """
+    tick_interval = 1 / SPEED
+    while accumulator >= tick_interval:
+        accumulator -= tick_interval
+        action = inputs.popleft() if inputs else None
+        if recorder is not None:
+            recorder.record(game.steps, action)
+        start = time.perf_counter()
+        game.step(action)
+        if metrics is not None:
+            metrics.add_tick(time.perf_counter() - start)
+    return accumulator
+
+
+def format_caption(game, metrics):
+    """
+    Формирует заголовок окна с рекордом и метриками цикла.
+
+    Аргументы:
+        game (Game): Партия.
+        metrics (LoopMetrics): Метрики цикла.
+
+    Возвращает:
+        str: Заголовок окна.
+    """
+    caption = f'Змейка | Рекорд: {game.record_length}'
+    if game.wins:
+        caption += f' | Побед: {game.wins}'
+    return (f'{caption} | {clock.get_fps():.0f} FPS, '
+            f'кадр {metrics.frame_ms:.2f} мс, шаг {metrics.tick_ms:.3f} мс')
+
+
+def handle_keys(snake, inputs=None):
     """
     Обрабатывает нажатия клавиш для управления змейкой.
 
     Аргументы:
         snake (Snake): Объект змейки.
+        inputs (deque): Очередь поворотов (по умолчанию поворот сразу
+            записывается в snake.next_direction).
     """
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             pygame.quit()
             raise SystemExit
         elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_UP and snake.direction != DOWN:
-                snake.next_direction = UP
-            elif event.key == pygame.K_DOWN and snake.direction != UP:
-                snake.next_direction = DOWN
-            elif event.key == pygame.K_LEFT and snake.direction != RIGHT:
-                snake.next_direction = LEFT
-            elif event.key == pygame.K_RIGHT and snake.direction != LEFT:
-                snake.next_direction = RIGHT
-            elif event.key == pygame.K_ESCAPE:  # Закрытие игры на ESC
+            if event.key == pygame.K_ESCAPE:  # Закрытие игры на ESC
                 pygame.quit()
                 raise SystemExit
+            direction = KEY_DIRECTIONS.get(event.key)
+            if direction is None:
+                continue
+            if inputs is not None:
+                queue_turn(inputs, snake, direction)
+            elif direction != OPPOSITE[snake.direction]:
+                snake.next_direction = direction
 
 
-def main():
+def main(replay_path=None, board=None, apples=APPLE_COUNT):
     """
-    Основная функция игры.
+    Основная функция игры: отрисовка состояния движка snake_engine.Game.
+
+    Цикл с фиксированным шагом: время кадров копится, и игра делает
+    столько шагов длиной 1 / SPEED секунды, сколько накопилось. Кадры
+    рисуются с частотой до MAX_FPS, медленный кадр не замедляет игру.
+    Если задан replay_path, партия записывается в него (зерно и повороты),
+    чтобы её можно было воспроизвести: python the_snake.py --record, затем
+    python the_snake.py --replay last_game.replay
+
+    С board игра идёт на большом поле large_board.LargeGame с несколькими
+    яблоками, а на экране видна область вокруг головы (ViewportRenderer).
+    Такие партии не записываются.
+
+    Аргументы:
+        replay_path (str): Файл записи партии (по умолчанию не
+            записывается).
+        board (tuple): Ширина и высота большого поля в клетках
+            (по умолчанию обычное поле GRID_WIDTH×GRID_HEIGHT).
+        apples (int): Количество яблок на большом поле.
     """
     pygame.init()
+    init_display()
+    if board is not None:
+        run_game(LargeGame(*board, apples=apples),
+                 renderer=ViewportRenderer())
+        return
+
+    # Создание партии со змейкой и яблоком, которые умеют рисоваться;
+    # зерно случайное, но записывается вместе с поворотами
+    seed = random.getrandbits(63)
+    game = Game(GRID_WIDTH, GRID_HEIGHT, seed=seed, snake=Snake(),
+                apple=Apple())
+    recorder = None
+    if replay_path is not None:
+        recorder = ReplayWriter(replay_path, GRID_WIDTH, GRID_HEIGHT, seed)
+    try:
+        run_game(game, recorder)
+    finally:
+        if recorder is not None:
+            recorder.close(game.steps)
+
+
+def run_game(game, recorder=None, renderer=None):
+    """
+    Игровой цикл с фиксированным шагом.
 
-    # Создание объектов змейки и яблока
-    snake = Snake()
-    apple = Apple()
-
-    # Переменная для хранения рекордного размера змейки
-    record_length = 1
+    Аргументы:
+        game (Game): Партия.
+        recorder (ReplayWriter): Запись партии (по умолчанию не ведётся).
+        renderer (Renderer): Отрисовка (по умолчанию Renderer()).
+    """
+    renderer = renderer or Renderer()
+    inputs = deque(maxlen=INPUT_QUEUE_SIZE)
+    metrics = LoopMetrics()
+    accumulator = 0.0
+    previous = time.perf_counter()
+    caption_time = previous
+    caption_state = None
 
     while True:
-        clock.tick(SPEED)
+        clock.tick(MAX_FPS)
+        frame_start = time.perf_counter()
+        accumulator += min(frame_start - previous, MAX_FRAME_TIME)
+        previous = frame_start
+
+        # Обработка нажатий клавиш: повороты ждут своего шага в очереди
+        handle_keys(game.snake, inputs)
+
+        # Шаги игры: движение, поедание яблока, столкновение с собой
+        accumulator = run_ticks(game, accumulator, inputs, metrics,
+                                recorder)
+
+        # Отрисовка изменившихся клеток и обновление экрана
+        renderer.draw(game)
+        metrics.add_frame(time.perf_counter() - frame_start)
+
+        # Заголовок обновляется при новом рекорде и раз в CAPTION_INTERVAL
+        state = (game.record_length, game.wins)
+        if (state != caption_state
+                or frame_start - caption_time >= CAPTION_INTERVAL):
+            pygame.display.set_caption(format_caption(game, metrics))
+            caption_state = state
+            caption_time = frame_start
 
-        # Обработка нажатий клавиш
-        handle_keys(snake)
 
-        # Обновление направления и движения змейки
-        snake.update_direction()
-        snake.move()
+def play_replay(path, start_tick=0):
+    """
+    Показывает записанную партию в окне с обычной скоростью.
+
+    Аргументы:
+        path (str): Файл записи.
+        start_tick (int): Шаг, к которому партия сначала перематывается
+            без отрисовки.
+
+    Исключения:
+        ValueError: Запись сделана на поле другого размера.
+    """
+    replay = read_replay(path)
+    if (replay.width, replay.height) != (GRID_WIDTH, GRID_HEIGHT):
+        raise ValueError(
+            f'Запись сделана на поле {replay.width}×{replay.height}, '
+            f'а игра рисует поле {GRID_WIDTH}×{GRID_HEIGHT}.'
+        )
+    pygame.init()
+    init_display()
+    pygame.display.set_caption(f'Змейка | Запись {path}')
+
+    player = ReplayPlayer(replay, make_game=lambda: replay.make_game(
+        snake=Snake(), apple=Apple()
+    ))
+    player.seek(start_tick)
+    renderer = Renderer()
+    while not player.finished:
+        clock.tick(SPEED)
+        # Нажатия клавиш не влияют на запись: обрабатываются только
+        # закрытие окна и ESC
+        handle_keys(player.game.snake, deque(maxlen=0))
+        renderer.draw(player.game)
+        player.step()
+    renderer.draw(player.game)
 
-        # Проверка на съедание яблока
-        if snake.get_head_position() == apple.position:
-            snake.positions.append(snake.last)
-            # Передаём позиции змейки, чтобы яблоко не появилось внутри неё
-            apple.randomize_position(snake.positions)
 
-            # Обновление рекордного размера змейки
-            if len(snake.positions) > record_length:
-                record_length = len(snake.positions)
-                pygame.display.set_caption(f'Змейка | Рекорд: {record_length}')
+def parse_board_size(text):
+    """
+    Разбирает размер поля вида 1000x1000.
 
-        # Проверка на столкновение с самой собой
-        if snake.get_head_position() in snake.positions[1:]:
-            snake.reset()
+    Аргументы:
+        text (str): Ширина и высота через «x».
 
-        # Отрисовка объектов
-        screen.fill(BOARD_BACKGROUND_COLOR)
-        snake.draw()
-        apple.draw()
+    Возвращает:
+        tuple: Ширина и высота в клетках.
 
-        # Обновление экрана
-        pygame.display.update()
+    Исключения:
+        argparse.ArgumentTypeError: Размер записан неверно.
+    """
+    try:
+        width, height = map(int, text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f'Размер поля {text!r} должен иметь вид ШИРИНАxВЫСОТА.'
+        )
+    if width < 1 or height < 1:
+        raise argparse.ArgumentTypeError('Размер поля должен быть больше 0.')
+    return width, height
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Игра «Змейка».')
+    parser.add_argument('--replay', help='Показать записанную партию.')
+    parser.add_argument('--seek', type=int, default=0,
+                        help='Начать показ записи с этого шага.')
+    parser.add_argument('--record', nargs='?', const=REPLAY_FILE,
+                        help='Записать партию в файл (по умолчанию '
+                             f'{REPLAY_FILE}).')
+    parser.add_argument('--board', type=parse_board_size,
+                        help='Большое поле, например 1000x1000.')
+    parser.add_argument('--apples', type=int, default=APPLE_COUNT,
+                        help='Количество яблок на большом поле.')
+    args = parser.parse_args()
+    if args.replay:
+        play_replay(args.replay, args.seek)
+    else:
+        main(args.record, args.board, args.apples)
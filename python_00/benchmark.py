@@ -0,0 +1,300 @@
+# benchmark.py
+"""Модуль для статистически корректных замеров времени выполнения."""
+
+
+import gc
+import json
+import math
+import statistics
+import time
+import timeit
+from typing import Any, Callable, Dict, List, Tuple
+
+
+# Критические значения t-распределения Стьюдента для 95% доверительного
+# интервала (двусторонний) по числу степеней свободы
+T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+    8: 2.306, 9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086,
+    25: 2.060, 30: 2.042, 40: 2.021, 60: 2.000, 120: 1.980,
+}
+Z_CRITICAL_95 = 1.960
+
+
+def t_critical_95(df: int) -> float:
+    """
+    Возвращает критическое значение t для 95% доверительного интервала.
+
+    Для промежуточных степеней свободы берётся ближайшее меньшее табличное
+    значение (интервал получается чуть шире, то есть консервативнее).
+
+    Аргументы:
+        df (int): Число степеней свободы (n - 1).
+
+    Возвращает:
+        float: Критическое значение t.
+    """
+    if df < 1:
+        return math.inf
+    if df > max(T_CRITICAL_95):
+        return Z_CRITICAL_95
+    return T_CRITICAL_95[max(key for key in T_CRITICAL_95 if key <= df)]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Возвращает перцентиль q (0..100) с линейной интерполяцией.
+
+    Аргументы:
+        values (List[float]): Значения (в любом порядке).
+        q (float): Номер перцентиля от 0 до 100.
+
+    Возвращает:
+        float: Значение перцентиля.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return math.nan
+    position = (len(ordered) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    fraction = position - lower
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
+
+
+def reject_outliers(samples: List[float], k: float = 1.5) -> Tuple[List[float], List[float]]:
+    """
+    Отбрасывает выбросы по правилу Тьюки (за пределами k межквартильных размахов).
+
+    Аргументы:
+        samples (List[float]): Замеры.
+        k (float): Множитель межквартильного размаха.
+
+    Возвращает:
+        Tuple[List[float], List[float]]: Оставленные и отброшенные замеры.
+    """
+    if len(samples) < 4:
+        return list(samples), []
+    q1 = percentile(samples, 25)
+    q3 = percentile(samples, 75)
+    low = q1 - k * (q3 - q1)
+    high = q3 + k * (q3 - q1)
+    kept = [value for value in samples if low <= value <= high]
+    rejected = [value for value in samples if not low <= value <= high]
+    return kept, rejected
+
+
+class BenchmarkResult:
+    """
+    Результат замера времени выполнения функции.
+
+    Атрибуты:
+        name (str): Название замера (обычно имя функции).
+        size (int): Размер входных данных.
+        samples_ms (List[float]): Замеры в мс на один вызов без выбросов.
+        rejected_ms (List[float]): Отброшенные выбросы.
+        loops (int): Количество вызовов функции в одном замере.
+        warmup (int): Количество прогревочных замеров.
+        gc_disabled (bool): Был ли отключён сборщик мусора.
+    """
+
+    def __init__(self, name: str, size: int, samples_ms: List[float],
+                 rejected_ms: List[float] = None, loops: int = 1,
+                 warmup: int = 0, gc_disabled: bool = True) -> None:
+        """
+        Инициализирует результат замера.
+
+        Аргументы:
+            name (str): Название замера.
+            size (int): Размер входных данных.
+            samples_ms (List[float]): Замеры в мс на один вызов.
+            rejected_ms (List[float]): Отброшенные выбросы.
+            loops (int): Количество вызовов функции в одном замере.
+            warmup (int): Количество прогревочных замеров.
+            gc_disabled (bool): Был ли отключён сборщик мусора.
+        """
+        self.name = name
+        self.size = size
+        self.samples_ms = list(samples_ms)
+        self.rejected_ms = list(rejected_ms or [])
+        self.loops = loops
+        self.warmup = warmup
+        self.gc_disabled = gc_disabled
+
+    @property
+    def runs(self) -> int:
+        """Количество учтённых замеров."""
+        return len(self.samples_ms)
+
+    @property
+    def mean(self) -> float:
+        """Среднее время в мс."""
+        return statistics.fmean(self.samples_ms)
+
+    @property
+    def median(self) -> float:
+        """Медиана времени в мс."""
+        return statistics.median(self.samples_ms)
+
+    @property
+    def stdev(self) -> float:
+        """Стандартное отклонение в мс."""
+        return statistics.stdev(self.samples_ms) if self.runs > 1 else 0.0
+
+    @property
+    def p95(self) -> float:
+        """95-й перцентиль времени в мс."""
+        return percentile(self.samples_ms, 95)
+
+    @property
+    def ci95(self) -> float:
+        """Полуширина 95% доверительного интервала среднего в мс."""
+        if self.runs < 2:
+            return math.inf
+        return t_critical_95(self.runs - 1) * self.stdev / math.sqrt(self.runs)
+
+    @property
+    def relative_ci(self) -> float:
+        """Полуширина доверительного интервала относительно среднего."""
+        return self.ci95 / self.mean if self.mean > 0 else math.inf
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Возвращает результат в виде словаря для сохранения в JSON.
+
+        Возвращает:
+            Dict[str, Any]: Исходные замеры и вычисленная статистика.
+        """
+        return {
+            'name': self.name,
+            'size': self.size,
+            'loops': self.loops,
+            'warmup': self.warmup,
+            'gc_disabled': self.gc_disabled,
+            'samples_ms': self.samples_ms,
+            'rejected_ms': self.rejected_ms,
+            'mean_ms': self.mean,
+            'median_ms': self.median,
+            'p95_ms': self.p95,
+            'stdev_ms': self.stdev,
+            'ci95_ms': self.ci95 if self.runs > 1 else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BenchmarkResult':
+        """
+        Восстанавливает результат из словаря (см. to_dict).
+
+        Аргументы:
+            data (Dict[str, Any]): Словарь из JSON.
+
+        Возвращает:
+            BenchmarkResult: Восстановленный результат.
+        """
+        return cls(data['name'], data['size'], data['samples_ms'],
+                   data.get('rejected_ms'), data.get('loops', 1),
+                   data.get('warmup', 0), data.get('gc_disabled', True))
+
+    def __str__(self) -> str:
+        """Возвращает краткую сводку замера."""
+        return (f"{self.name}[{self.size}]: медиана {self.median:.4f} мс, "
+                f"p95 {self.p95:.4f} мс, σ {self.stdev:.4f} мс, "
+                f"±{self.relative_ci:.1%} ({self.runs} замеров)")
+
+
+def run_benchmark(func: Callable[[Any], Any], data: Any, name: str = None,
+                  warmup: int = 3, min_runs: int = 10, max_runs: int = 200,
+                  target_relative_ci: float = 0.02, min_sample_s: float = 0.005,
+                  max_total_s: float = 10.0, disable_gc: bool = True) -> BenchmarkResult:
+    """
+    Измеряет время выполнения func(data) с прогревом и адаптивным числом замеров.
+
+    Как и measure_time, опирается на timeit, но:
+    - подбирает число вызовов в одном замере, чтобы замер длился не меньше
+      min_sample_s (разрешение таймера перестаёт влиять на результат);
+    - делает warmup прогревочных замеров (кеши, частота процессора);
+    - повторяет замеры, пока полуширина 95% доверительного интервала
+      не станет меньше target_relative_ci от среднего, но не более
+      max_runs замеров и max_total_s секунд;
+    - отбрасывает выбросы по правилу Тьюки;
+    - отключает сборщик мусора на время замера (disable_gc).
+
+    Аргументы:
+        func (Callable): Функция, время выполнения которой измеряется.
+        data (Any): Данные для передачи в функцию.
+        name (str): Название замера (по умолчанию имя функции).
+        warmup (int): Количество прогревочных замеров.
+        min_runs (int): Минимальное количество замеров.
+        max_runs (int): Максимальное количество замеров.
+        target_relative_ci (float): Требуемая относительная точность.
+        min_sample_s (float): Минимальная длительность одного замера в секундах.
+        max_total_s (float): Ограничение общего времени замеров в секундах.
+        disable_gc (bool): Отключать ли сборщик мусора на время замеров.
+
+    Возвращает:
+        BenchmarkResult: Замеры и их статистика.
+    """
+    name = name or getattr(func, '__name__', 'func')
+    size = len(data) if hasattr(data, '__len__') else 0
+    # timeit сам отключает сборщик мусора; при disable_gc=False включаем его
+    timer = timeit.Timer(lambda: func(data), setup='pass' if disable_gc else gc.enable)
+
+    gc.collect()  # Мусор от подготовки данных не должен попадать в замеры
+    loops = 1
+    while timer.timeit(loops) < min_sample_s:
+        loops *= 2
+
+    for _ in range(warmup):
+        timer.timeit(loops)
+
+    samples = []
+    kept = []
+    rejected = []
+    start = time.perf_counter()
+    while len(samples) < max_runs:
+        samples.append(timer.timeit(loops) / loops * 1000)
+        if len(samples) < min_runs:
+            continue
+        kept, rejected = reject_outliers(samples)
+        result = BenchmarkResult(name, size, kept, rejected, loops, warmup, disable_gc)
+        if result.relative_ci <= target_relative_ci:
+            break
+        if time.perf_counter() - start > max_total_s:
+            break
+    if len(samples) < min_runs or not kept:  # max_runs меньше min_runs
+        kept, rejected = reject_outliers(samples)
+    return BenchmarkResult(name, size, kept, rejected, loops, warmup, disable_gc)
+
+
+def save_results_json(results: List[BenchmarkResult], filename: str,
+                      meta: Dict[str, Any] = None) -> None:
+    """
+    Сохраняет результаты замеров в JSON-файл.
+
+    Аргументы:
+        results (List[BenchmarkResult]): Результаты замеров.
+        filename (str): Имя файла для записи.
+        meta (Dict[str, Any]): Дополнительные сведения о запуске.
+    """
+    payload = {
+        'meta': meta or {},
+        'results': [result.to_dict() for result in results],
+    }
+    with open(filename, 'w', encoding='utf-8') as file:
+        json.dump(payload, file, ensure_ascii=False, indent=2)
+
+
+def load_results_json(filename: str) -> Tuple[Dict[str, Any], List[BenchmarkResult]]:
+    """
+    Загружает результаты замеров из JSON-файла (см. save_results_json).
+
+    Аргументы:
+        filename (str): Имя файла для чтения.
+
+    Возвращает:
+        Tuple[Dict[str, Any], List[BenchmarkResult]]: Сведения о запуске и результаты.
+    """
+    with open(filename, 'r', encoding='utf-8') as file:
+        payload = json.load(file)
+    results = [BenchmarkResult.from_dict(item) for item in payload['results']]
+    return payload.get('meta', {}), results
@@ -0,0 +1,308 @@
+# complexity.py
+"""Модуль для эмпирической оценки асимптотической сложности функций."""
+
+
+import argparse
+import importlib
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from benchmark import BenchmarkResult, run_benchmark
+from data_generation import generate_data
+
+
+# Модели сложности в порядке возрастания: имя -> функция от размера
+COMPLEXITY_MODELS: Dict[str, Callable[[int], float]] = {
+    'O(1)': lambda n: 1.0,
+    'O(log N)': lambda n: math.log2(n),
+    'O(N)': lambda n: float(n),
+    'O(N log N)': lambda n: n * math.log2(n),
+    'O(N²)': lambda n: float(n) * n,
+}
+
+# Модель попроще выбирается, если её ошибка хуже лучшей не более чем на столько
+SIMPLER_MODEL_TOLERANCE = 0.1
+
+# Функция или её путь в виде 'модуль:имя'
+FunctionSpec = Union[Callable[..., Any], str]
+
+
+def geometric_sizes(start: int, stop: int, count: int) -> List[int]:
+    """
+    Возвращает размеры входных данных в геометрической прогрессии.
+
+    Геометрическая сетка покрывает несколько порядков за малое число точек,
+    а для различения N и N log N важен именно широкий диапазон.
+
+    Аргументы:
+        start (int): Наименьший размер.
+        stop (int): Наибольший размер.
+        count (int): Количество размеров.
+
+    Возвращает:
+        List[int]: Возрастающие уникальные размеры от start до stop.
+    """
+    if count < 2 or start >= stop:
+        return [start]
+    ratio = (stop / start) ** (1 / (count - 1))
+    return sorted({round(start * ratio ** i) for i in range(count)})
+
+
+def random_list(size: int) -> List[int]:
+    """
+    Генерирует список случайных чисел - входные данные по умолчанию.
+
+    Аргументы:
+        size (int): Количество чисел.
+
+    Возвращает:
+        List[int]: Случайные числа от 1 до 1000 (зерно равно size).
+    """
+    return generate_data(size, seed=size).tolist()
+
+
+def resolve(spec: FunctionSpec) -> Callable[..., Any]:
+    """
+    Возвращает функцию по её пути 'модуль:имя' (или саму функцию).
+
+    Аргументы:
+        spec (FunctionSpec): Функция или строка вида 'sum_analysis:sum_array'.
+
+    Возвращает:
+        Callable: Найденная функция.
+
+    Исключения:
+        ValueError: Если строка имеет неверный формат.
+    """
+    if callable(spec):
+        return spec
+    module_name, separator, attribute = spec.partition(':')
+    if not separator or not attribute:
+        raise ValueError(f"Ожидается путь вида 'модуль:функция', получено '{spec}'")
+    target = importlib.import_module(module_name)
+    for part in attribute.split('.'):
+        target = getattr(target, part)
+    return target
+
+
+class ComplexityFit:
+    """
+    Подгонка замеров под модель t(N) = a + b * f(N).
+
+    Атрибуты:
+        model (str): Имя модели из COMPLEXITY_MODELS.
+        a (float): Постоянная составляющая в мс.
+        b (float): Коэффициент при f(N) в мс.
+        r2 (float): Коэффициент детерминации.
+        relative_rmse (float): Среднеквадратичная относительная ошибка.
+    """
+
+    def __init__(self, model: str, a: float, b: float, r2: float,
+                 relative_rmse: float) -> None:
+        """
+        Инициализирует результат подгонки.
+
+        Аргументы:
+            model (str): Имя модели.
+            a (float): Постоянная составляющая в мс.
+            b (float): Коэффициент при f(N) в мс.
+            r2 (float): Коэффициент детерминации.
+            relative_rmse (float): Среднеквадратичная относительная ошибка.
+        """
+        self.model = model
+        self.a = a
+        self.b = b
+        self.r2 = r2
+        self.relative_rmse = relative_rmse
+
+    def predict(self, size: int) -> float:
+        """Возвращает предсказанное время в мс для размера size."""
+        return self.a + self.b * COMPLEXITY_MODELS[self.model](size)
+
+    def __str__(self) -> str:
+        """Возвращает краткую сводку подгонки."""
+        return (f"{self.model:<10} R²={self.r2:.4f}, "
+                f"отн. ошибка={self.relative_rmse:.1%}")
+
+
+def _fit_model(model: str, sizes: List[int], times: List[float]) -> ComplexityFit:
+    """
+    Подгоняет одну модель взвешенным методом наименьших квадратов.
+
+    Веса 1 / t² минимизируют относительную, а не абсолютную ошибку, иначе
+    подгонку определяли бы только самые большие размеры. Отрицательный
+    коэффициент b не имеет смысла, в этом случае модель вырождается в O(1).
+    """
+    f = COMPLEXITY_MODELS[model]
+    xs = [f(size) for size in sizes]
+    ws = [1 / (t * t) if t > 0 else 1.0 for t in times]
+    s = sum(ws)
+    sx = sum(w * x for w, x in zip(ws, xs))
+    sy = sum(w * t for w, t in zip(ws, times))
+    sxx = sum(w * x * x for w, x in zip(ws, xs))
+    sxy = sum(w * x * t for w, x, t in zip(ws, xs, times))
+    det = s * sxx - sx * sx
+    b = (s * sxy - sx * sy) / det if det > 1e-12 * s * sxx else 0.0
+    if b < 0:
+        b = 0.0
+    a = (sy - b * sx) / s
+
+    predicted = [a + b * x for x in xs]
+    mean_time = sum(times) / len(times)
+    ss_total = sum((t - mean_time) ** 2 for t in times)
+    ss_residual = sum((t - p) ** 2 for t, p in zip(times, predicted))
+    r2 = 1 - ss_residual / ss_total if ss_total > 0 else 1.0
+    relative_rmse = math.sqrt(sum(
+        ((t - p) / t) ** 2 for t, p in zip(times, predicted) if t > 0
+    ) / len(times))
+    return ComplexityFit(model, a, b, r2, relative_rmse)
+
+
+def fit_complexity(sizes: List[int], times: List[float]) -> List[ComplexityFit]:
+    """
+    Подгоняет замеры под все модели сложности.
+
+    Аргументы:
+        sizes (List[int]): Размеры входных данных.
+        times (List[float]): Время выполнения в мс для каждого размера.
+
+    Возвращает:
+        List[ComplexityFit]: Подгонки; первой идёт лучшая модель - самая
+            простая из тех, чья ошибка не более чем на
+            SIMPLER_MODEL_TOLERANCE хуже минимальной.
+
+    Исключения:
+        ValueError: Если замеров меньше трёх.
+    """
+    if len(sizes) != len(times) or len(sizes) < 3:
+        raise ValueError("Для оценки сложности нужно не меньше трёх замеров.")
+    fits = [_fit_model(model, sizes, times) for model in COMPLEXITY_MODELS]
+    best_error = min(fit.relative_rmse for fit in fits)
+    best = next(
+        fit for fit in fits
+        if fit.relative_rmse <= best_error * (1 + SIMPLER_MODEL_TOLERANCE) + 1e-12
+    )
+    return [best] + sorted((fit for fit in fits if fit is not best),
+                           key=lambda fit: fit.relative_rmse)
+
+
+def _measure_size(func: FunctionSpec, make_input: FunctionSpec, size: int,
+                  benchmark_options: Dict[str, Any]) -> Dict[str, Any]:
+    """Готовит данные и замеряет одну точку (выполняется в отдельном процессе)."""
+    function = resolve(func)
+    data = resolve(make_input)(size)
+    result = run_benchmark(function, data, name=getattr(function, '__name__', str(func)),
+                           **benchmark_options)
+    result.size = size
+    return result.to_dict()
+
+
+def measure_sizes(func: FunctionSpec, sizes: List[int],
+                  make_input: FunctionSpec = random_list, isolate: bool = True,
+                  **benchmark_options: Any) -> List[BenchmarkResult]:
+    """
+    Замеряет время выполнения func для каждого размера входных данных.
+
+    При isolate=True каждый размер замеряется в новом процессе (spawn),
+    поэтому память и состояние сборщика мусора от одного размера не
+    влияют на следующий. Функции должны быть доступны по импорту: либо
+    переданы строкой 'модуль:имя', либо определены на уровне модуля.
+
+    Аргументы:
+        func (FunctionSpec): Замеряемая функция, принимает результат make_input.
+        sizes (List[int]): Размеры входных данных.
+        make_input (FunctionSpec): Функция size -> входные данные.
+        isolate (bool): Замерять ли каждый размер в отдельном процессе.
+        **benchmark_options: Параметры run_benchmark.
+
+    Возвращает:
+        List[BenchmarkResult]: Результаты в порядке sizes.
+    """
+    results = []
+    for size in sizes:
+        if isolate:
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+                data = pool.submit(_measure_size, func, make_input, size,
+                                   benchmark_options).result()
+        else:
+            data = _measure_size(func, make_input, size, benchmark_options)
+        results.append(BenchmarkResult.from_dict(data))
+    return results
+
+
+def analyze_complexity(func: FunctionSpec, make_input: FunctionSpec = random_list,
+                       min_size: int = 1000, max_size: int = 1_000_000,
+                       points: int = 8, isolate: bool = True,
+                       **benchmark_options: Any) -> Tuple[List[BenchmarkResult], List[ComplexityFit]]:
+    """
+    Замеряет функцию на геометрической сетке размеров и оценивает её сложность.
+
+    Аргументы:
+        func (FunctionSpec): Замеряемая функция.
+        make_input (FunctionSpec): Функция size -> входные данные.
+        min_size (int): Наименьший размер.
+        max_size (int): Наибольший размер.
+        points (int): Количество размеров.
+        isolate (bool): Замерять ли каждый размер в отдельном процессе.
+        **benchmark_options: Параметры run_benchmark.
+
+    Возвращает:
+        Tuple[List[BenchmarkResult], List[ComplexityFit]]: Замеры и подгонки
+            (первая - лучшая модель).
+    """
+    sizes = geometric_sizes(min_size, max_size, points)
+    results = measure_sizes(func, sizes, make_input, isolate, **benchmark_options)
+    fits = fit_complexity([result.size for result in results],
+                          [result.median for result in results])
+    return results, fits
+
+
+def print_fits(fits: List[ComplexityFit]) -> None:
+    """
+    Выводит подгонки, начиная с лучшей.
+
+    Аргументы:
+        fits (List[ComplexityFit]): Результат fit_complexity.
+    """
+    print(f"Лучшая модель: {fits[0].model} (R²={fits[0].r2:.4f}, "
+          f"отн. ошибка={fits[0].relative_rmse:.1%})")
+    for fit in fits:
+        print(f"  {fit}")
+
+
+def main(argv: List[str] = None) -> None:
+    """
+    Командная строка: оценка сложности произвольной функции.
+
+    Пример:
+        python complexity.py sum_analysis:sum_array --max 1000000 --points 8
+
+    Аргументы:
+        argv (List[str]): Аргументы командной строки (по умолчанию sys.argv[1:]).
+    """
+    parser = argparse.ArgumentParser(description="Эмпирическая оценка сложности функции.")
+    parser.add_argument('func', help="Функция в виде 'модуль:имя'.")
+    parser.add_argument('--input', default='complexity:random_list',
+                        help="Генератор входных данных 'модуль:имя' (size -> данные).")
+    parser.add_argument('--min', type=int, default=1000, help="Наименьший размер.")
+    parser.add_argument('--max', type=int, default=1_000_000, help="Наибольший размер.")
+    parser.add_argument('--points', type=int, default=8, help="Количество размеров.")
+    parser.add_argument('--no-isolate', action='store_true',
+                        help="Замерять все размеры в текущем процессе.")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, '')  # Модули из текущего каталога
+    results, fits = analyze_complexity(args.func, args.input, args.min, args.max,
+                                       args.points, not args.no_isolate)
+    print("{:>10} | {:>12} | {:>10}".format("Размер (N)", "Медиана (мс)", "p95 (мс)"))
+    print("-" * 38)
+    for result in results:
+        print("{:>10} | {:>12.4f} | {:>10.4f}".format(result.size, result.median, result.p95))
+    print_fits(fits)
+
+
+if __name__ == "__main__":
+    main()
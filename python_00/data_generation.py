@@ -0,0 +1,220 @@
+# data_generation.py
+"""Модуль для быстрой генерации и кеширования входных данных для замеров."""
+
+
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+from typing import List, Union
+
+try:
+    import numpy as np
+except ImportError:  # Без NumPy доступна медленная генерация int64 через random
+    np = None
+
+
+# Поддерживаемые распределения и типы элементов
+DISTRIBUTIONS = ('uniform', 'normal', 'exponential', 'zipf', 'sequential', 'constant')
+DTYPES = ('int32', 'int64', 'float64')
+
+# Каталог кеша сгенерированных данных
+DEFAULT_CACHE_DIR = '.data_cache'
+
+# Данные генерируются блоками фиксированного размера, у каждого блока свой
+# поток случайных чисел (seed, номер блока). Поэтому результат не зависит
+# от того, генерируются ли данные в память или в файл кеша.
+GENERATION_BLOCK = 1 << 20
+
+GeneratedData = Union['np.ndarray', array]
+
+
+def _check_arguments(distribution: str, dtype: str, low: int, high: int) -> None:
+    """Проверяет параметры генерации."""
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Неизвестное распределение: {distribution}")
+    if dtype not in DTYPES:
+        raise ValueError(f"Неизвестный тип элементов: {dtype}")
+    if low > high:
+        raise ValueError("Нижняя граница больше верхней.")
+    if np is None and (dtype != 'int64' or distribution == 'zipf'):
+        raise ValueError(f"Для dtype='{dtype}' и distribution='{distribution}' "
+                         "требуется установленный NumPy.")
+
+
+def _numpy_block(rng: 'np.random.Generator', start: int, count: int,
+                 distribution: str, dtype: str, low: int, high: int) -> 'np.ndarray':
+    """Генерирует блок из count элементов, начинающийся с позиции start."""
+    is_int = dtype != 'float64'
+    if distribution == 'uniform':
+        if is_int:
+            return rng.integers(low, high + 1, count, dtype=dtype)
+        block = rng.uniform(low, high, count)
+    elif distribution == 'normal':
+        block = rng.normal((low + high) / 2, (high - low) / 6 or 1, count)
+    elif distribution == 'exponential':
+        block = low + rng.exponential((high - low) / 5 or 1, count)
+    elif distribution == 'zipf':
+        block = low - 1 + rng.zipf(2.0, count).astype(np.float64)
+    elif distribution == 'sequential':
+        block = low + np.arange(start, start + count) % (high - low + 1)
+    else:  # constant
+        block = np.full(count, low)
+    block = np.clip(block, low, high)
+    return np.rint(block).astype(dtype) if is_int else block.astype(dtype)
+
+
+def _fill(out: Union['np.ndarray', array], distribution: str, dtype: str,
+          seed: int, low: int, high: int) -> None:
+    """Заполняет out поблочно; у каждого блока свой генератор."""
+    size = len(out)
+    for index, start in enumerate(range(0, size, GENERATION_BLOCK)):
+        count = min(GENERATION_BLOCK, size - start)
+        if np is not None:
+            rng = np.random.default_rng([seed, index])
+            out[start:start + count] = _numpy_block(rng, start, count, distribution,
+                                                    dtype, low, high)
+            continue
+        rng = random.Random(seed * 1_000_003 + index)
+        if distribution == 'uniform':
+            values = rng.choices(range(low, high + 1), k=count)
+        elif distribution == 'normal':
+            sigma = (high - low) / 6 or 1
+            values = [round(rng.gauss((low + high) / 2, sigma)) for _ in range(count)]
+        elif distribution == 'exponential':
+            scale = (high - low) / 5 or 1
+            values = [round(low + rng.expovariate(1 / scale)) for _ in range(count)]
+        elif distribution == 'sequential':
+            values = [low + i % (high - low + 1) for i in range(start, start + count)]
+        else:  # constant
+            values = [low] * count
+        out[start:start + count] = array('q', [min(max(v, low), high) for v in values])
+
+
+def generate_data(size: int, seed: int = 0, distribution: str = 'uniform',
+                  dtype: str = 'int64', low: int = 1, high: int = 1000) -> GeneratedData:
+    """
+    Генерирует воспроизводимый массив случайных данных.
+
+    С NumPy генерация векторная (np.random.Generator), без него - через
+    random и только для int64. Результаты двух путей различаются, но
+    при одинаковых параметрах каждый из них воспроизводим.
+
+    Аргументы:
+        size (int): Количество элементов.
+        seed (int): Зерно генератора.
+        distribution (str): Распределение из DISTRIBUTIONS.
+        dtype (str): Тип элементов из DTYPES.
+        low (int): Минимальное значение.
+        high (int): Максимальное значение.
+
+    Возвращает:
+        GeneratedData: np.ndarray (или array('q') без NumPy).
+
+    Исключения:
+        ValueError: Неизвестные параметры или отсутствие NumPy.
+
+    Сложность: O(N).
+    """
+    _check_arguments(distribution, dtype, low, high)
+    out = np.empty(size, dtype=dtype) if np is not None else array('q', bytes(8 * size))
+    _fill(out, distribution, dtype, seed, low, high)
+    return out
+
+
+def cache_path(size: int, seed: int = 0, distribution: str = 'uniform',
+               dtype: str = 'int64', low: int = 1, high: int = 1000,
+               cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """
+    Возвращает путь к файлу кеша для набора параметров генерации.
+
+    Аргументы:
+        Те же, что у cached_data.
+
+    Возвращает:
+        str: Путь к файлу .npy (или .bin без NumPy).
+    """
+    extension = 'npy' if np is not None else 'bin'
+    name = f"{distribution}_{dtype}_{low}-{high}_n{size}_s{seed}.{extension}"
+    return os.path.join(cache_dir, name)
+
+
+def cached_data(size: int, seed: int = 0, distribution: str = 'uniform',
+                dtype: str = 'int64', low: int = 1, high: int = 1000,
+                cache_dir: str = DEFAULT_CACHE_DIR) -> GeneratedData:
+    """
+    Возвращает данные из кеша на диске, генерируя их при первом обращении.
+
+    Файл кеша отображается в память (mmap) только для чтения, поэтому
+    повторные запуски не тратят время на генерацию, а наборы до 10^8
+    элементов не требуют столько же оперативной памяти. Генерация идёт
+    прямо в файл поблочно и завершается атомарным переименованием, так
+    что прерванный запуск не оставляет испорченный кеш.
+
+    Аргументы:
+        size (int): Количество элементов.
+        seed (int): Зерно генератора.
+        distribution (str): Распределение из DISTRIBUTIONS.
+        dtype (str): Тип элементов из DTYPES.
+        low (int): Минимальное значение.
+        high (int): Максимальное значение.
+        cache_dir (str): Каталог кеша.
+
+    Возвращает:
+        GeneratedData: np.memmap (или memoryview 'q' без NumPy),
+            совпадающий с generate_data при тех же параметрах.
+    """
+    _check_arguments(distribution, dtype, low, high)
+    path = cache_path(size, seed, distribution, dtype, low, high, cache_dir)
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        if np is not None:
+            out = np.lib.format.open_memmap(temporary, mode='w+', dtype=dtype, shape=(size,))
+            _fill(out, distribution, dtype, seed, low, high)
+            out.flush()
+            del out
+        else:
+            with open(temporary, 'wb') as file:
+                generate_data(size, seed, distribution, dtype, low, high).tofile(file)
+        os.replace(temporary, path)
+
+    if np is not None:
+        return np.load(path, mmap_mode='r')
+    from sum_analysis import load_binary_numbers  # Импорт здесь: модули ссылаются друг на друга
+    return load_binary_numbers(path)
+
+
+def main(argv: List[str] = None) -> None:
+    """
+    Командная строка: заранее заполняет кеш данных для замеров.
+
+    Пример:
+        python data_generation.py 1000 1000000 100000000 --distribution zipf
+
+    Аргументы:
+        argv (List[str]): Аргументы командной строки (по умолчанию sys.argv[1:]).
+    """
+    parser = argparse.ArgumentParser(description="Генерация данных для замеров в кеш.")
+    parser.add_argument('sizes', type=int, nargs='+', help="Размеры наборов данных.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--dtype', choices=DTYPES, default='int64')
+    parser.add_argument('--low', type=int, default=1)
+    parser.add_argument('--high', type=int, default=1000)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        start = time.perf_counter()
+        options = (size, args.seed, args.distribution, args.dtype, args.low, args.high,
+                   args.cache_dir)
+        cached_data(*options)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>12} -> {cache_path(*options)} ({elapsed:.2f} с)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
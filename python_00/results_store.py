@@ -0,0 +1,340 @@
+# results_store.py
+"""Модуль для хранения результатов замеров и поиска регрессий между запусками."""
+
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from benchmark import BenchmarkResult
+
+
+# Файл хранилища по умолчанию: одна строка JSON на один запуск
+DEFAULT_STORE = 'benchmark_runs.jsonl'
+
+# Уровень значимости и минимальное замедление, начиная с которых
+# изменение считается регрессией
+DEFAULT_ALPHA = 0.05
+DEFAULT_THRESHOLD = 0.05
+
+
+def collect_machine_info() -> Dict[str, Any]:
+    """
+    Собирает характеристики машины, влияющие на время выполнения.
+
+    Возвращает:
+        Dict[str, Any]: ОС, процессор, число ядер, объём памяти и версия Python.
+    """
+    memory_bytes = None
+    try:
+        memory_bytes = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):  # Например, на Windows
+        pass
+    return {
+        'system': platform.system(),
+        'release': platform.release(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'memory_gb': round(memory_bytes / 1024 ** 3, 1) if memory_bytes else None,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+    }
+
+
+def machine_fingerprint(info: Dict[str, Any]) -> str:
+    """
+    Возвращает короткий отпечаток машины по её характеристикам.
+
+    Запуски с одинаковым отпечатком и версией Python можно сравнивать.
+
+    Аргументы:
+        info (Dict[str, Any]): Результат collect_machine_info.
+
+    Возвращает:
+        str: 12 шестнадцатеричных символов.
+    """
+    keys = ('system', 'machine', 'processor', 'cpu_count', 'memory_gb')
+    raw = json.dumps([info.get(key) for key in keys])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+
+def format_pc_info(info: Dict[str, Any]) -> str:
+    """
+    Форматирует характеристики машины для вывода в отчёте.
+
+    Аргументы:
+        info (Dict[str, Any]): Результат collect_machine_info.
+
+    Возвращает:
+        str: Многострочное описание машины.
+    """
+    memory = f"{info['memory_gb']} GB" if info.get('memory_gb') else "неизвестно"
+    return f"""
+    Характеристики ПК для тестирования:
+    - Процессор: {info['processor']} ({info['cpu_count']} логических ядер)
+    - Оперативная память: {memory}
+    - OC: {info['system']} {info['release']}
+    - Python: {info['python']} ({info['implementation']})
+    """
+
+
+def current_git_commit() -> str:
+    """
+    Возвращает хеш текущего коммита git.
+
+    Возвращает:
+        str: Хеш коммита (с суффиксом '-dirty' при незакоммиченных
+            изменениях) или 'unknown', если git недоступен.
+    """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f"{commit}-dirty" if status else commit
+
+
+def append_run(results: List[BenchmarkResult], store: str = DEFAULT_STORE,
+               meta: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Добавляет запуск в хранилище.
+
+    Аргументы:
+        results (List[BenchmarkResult]): Результаты замеров запуска.
+        store (str): Файл хранилища.
+        meta (Dict[str, Any]): Дополнительные сведения о запуске.
+
+    Возвращает:
+        Dict[str, Any]: Сохранённая запись о запуске.
+    """
+    info = collect_machine_info()
+    commit = current_git_commit()
+    timestamp = datetime.now().isoformat(timespec='seconds')
+    run = {
+        'run_id': f"{timestamp}-{commit[:7]}",
+        'timestamp': timestamp,
+        'commit': commit,
+        'fingerprint': machine_fingerprint(info),
+        'python': info['python'],
+        'machine': info,
+        'meta': meta or {},
+        'results': [result.to_dict() for result in results],
+    }
+    with open(store, 'a', encoding='utf-8') as file:
+        file.write(json.dumps(run, ensure_ascii=False) + '\n')
+    return run
+
+
+def load_runs(store: str = DEFAULT_STORE) -> List[Dict[str, Any]]:
+    """
+    Загружает все запуски из хранилища в порядке добавления.
+
+    Аргументы:
+        store (str): Файл хранилища.
+
+    Возвращает:
+        List[Dict[str, Any]]: Записи о запусках (пустой список, если файла нет).
+    """
+    if not os.path.exists(store):
+        return []
+    with open(store, 'r', encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def find_run(runs: List[Dict[str, Any]], ref: str) -> Dict[str, Any]:
+    """
+    Находит запуск по номеру, run_id или префиксу хеша коммита.
+
+    Номер может быть отрицательным: -1 - последний запуск. Если одному
+    коммиту соответствует несколько запусков, берётся последний.
+
+    Аргументы:
+        runs (List[Dict[str, Any]]): Запуски из load_runs.
+        ref (str): Номер, run_id или префикс коммита.
+
+    Возвращает:
+        Dict[str, Any]: Найденный запуск.
+
+    Исключения:
+        ValueError: Если запуск не найден.
+    """
+    if ref.lstrip('-').isdigit() and -len(runs) <= int(ref) < len(runs):
+        return runs[int(ref)]
+    for run in reversed(runs):
+        if run['run_id'] == ref or run['commit'].startswith(ref):
+            return run
+    raise ValueError(f"Запуск '{ref}' не найден.")
+
+
+def mann_whitney_greater(sample: Sequence[float], baseline: Sequence[float]) -> float:
+    """
+    Односторонний U-критерий Манна-Уитни: значения sample больше baseline?
+
+    Используется нормальное приближение с поправкой на связи и
+    непрерывность, так что распределение замеров может быть любым
+    (время выполнения обычно скошено вправо).
+
+    Аргументы:
+        sample (Sequence[float]): Новые замеры.
+        baseline (Sequence[float]): Базовые замеры.
+
+    Возвращает:
+        float: p-значение (малое - новые замеры значимо больше).
+    """
+    n1, n2 = len(sample), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    combined = sorted([(value, 0) for value in sample] + [(value, 1) for value in baseline])
+
+    # Средние ранги для связей
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tie_term += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare_runs(base: Dict[str, Any], new: Dict[str, Any],
+                 alpha: float = DEFAULT_ALPHA,
+                 threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Сравнивает два запуска по каждому замеру (имя функции и размер).
+
+    Замедление отмечается, если медиана выросла больше чем на threshold
+    и рост статистически значим (p < alpha по критерию Манна-Уитни).
+
+    Аргументы:
+        base (Dict[str, Any]): Базовый запуск.
+        new (Dict[str, Any]): Новый запуск.
+        alpha (float): Уровень значимости.
+        threshold (float): Минимальное относительное замедление медианы.
+
+    Возвращает:
+        List[Dict[str, Any]]: Строки сравнения для замеров, присутствующих в обоих запусках.
+    """
+    base_results = {
+        (item['name'], item['size']): BenchmarkResult.from_dict(item) for item in base['results']
+    }
+    rows = []
+    for item in new['results']:
+        key = (item['name'], item['size'])
+        if key not in base_results:
+            continue
+        old_result = base_results[key]
+        new_result = BenchmarkResult.from_dict(item)
+        change = new_result.median / old_result.median - 1 if old_result.median > 0 else 0.0
+        p_value = mann_whitney_greater(new_result.samples_ms, old_result.samples_ms)
+        rows.append({
+            'name': key[0],
+            'size': key[1],
+            'base_median_ms': old_result.median,
+            'new_median_ms': new_result.median,
+            'change': change,
+            'p_value': p_value,
+            'slowdown': change > threshold and p_value < alpha,
+        })
+    return rows
+
+
+def print_comparison(base: Dict[str, Any], new: Dict[str, Any],
+                     rows: List[Dict[str, Any]]) -> None:
+    """
+    Выводит таблицу сравнения двух запусков.
+
+    Аргументы:
+        base (Dict[str, Any]): Базовый запуск.
+        new (Dict[str, Any]): Новый запуск.
+        rows (List[Dict[str, Any]]): Результат compare_runs.
+    """
+    print(f"База:  {base['run_id']} ({base['commit'][:12]})")
+    print(f"Новый: {new['run_id']} ({new['commit'][:12]})")
+    if base['fingerprint'] != new['fingerprint'] or base['python'] != new['python']:
+        print("Внимание: запуски сделаны на разных машинах или версиях Python, "
+              "сравнение может быть некорректным.")
+    print("{:>12} | {:>10} | {:>12} | {:>12} | {:>9} | {:>8} |".format(
+        "Функция", "Размер (N)", "База (мс)", "Новый (мс)", "Изменение", "p"
+    ))
+    print("-" * 82)
+    for row in rows:
+        print("{:>12} | {:>10} | {:>12.4f} | {:>12.4f} | {:>+9.1%} | {:>8.4f} | {}".format(
+            row['name'], row['size'], row['base_median_ms'], row['new_median_ms'],
+            row['change'], row['p_value'], "ЗАМЕДЛЕНИЕ" if row['slowdown'] else ""
+        ))
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Командная строка хранилища результатов.
+
+    Примеры:
+        python results_store.py list
+        python results_store.py compare -2 -1
+        python results_store.py compare 3f2a1b0 9c41d2e --threshold 0.1
+
+    Аргументы:
+        argv (List[str]): Аргументы командной строки (по умолчанию sys.argv[1:]).
+
+    Возвращает:
+        int: Код возврата: 1, если найдены значимые замедления, иначе 0.
+    """
+    parser = argparse.ArgumentParser(description="Хранилище результатов замеров sum_analysis.")
+    parser.add_argument('--store', default=DEFAULT_STORE, help="Файл хранилища (JSONL).")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help="Показать сохранённые запуски.")
+    compare = commands.add_parser('compare', help="Сравнить два запуска.")
+    compare.add_argument('base', help="Номер, run_id или префикс коммита базового запуска.")
+    compare.add_argument('new', help="Номер, run_id или префикс коммита нового запуска.")
+    compare.add_argument('--alpha', type=float, default=DEFAULT_ALPHA,
+                         help="Уровень значимости.")
+    compare.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                         help="Минимальное относительное замедление медианы.")
+    args = parser.parse_args(argv)
+
+    runs = load_runs(args.store)
+    if args.command == 'list':
+        for index, run in enumerate(runs):
+            print(f"{index:>4} | {run['run_id']} | {run['fingerprint']} | "
+                  f"Python {run['python']} | замеров: {len(run['results'])}")
+        return 0
+
+    try:
+        base = find_run(runs, args.base)
+        new = find_run(runs, args.new)
+    except ValueError as error:
+        print(f"Ошибка: {error}")
+        return 2
+    rows = compare_runs(base, new, args.alpha, args.threshold)
+    print_comparison(base, new, rows)
+    return 1 if any(row['slowdown'] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,29 +2,313 @@
 """Модуль для анализа сложности алгоритма суммирования."""
 
 
-import matplotlib
-matplotlib.use('Agg')  # Используем неинтерактивный бэкенд
-
+import argparse
+import csv
+import functools
+import io
+import json
+import math
+import mmap
+import os
+import sys
+import time
 import timeit
-import random
-from typing import List, Callable
-import matplotlib.pyplot as plt
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Callable, Union
+
+# NumPy, пул процессов и модули замеров импортируются в функциях, которым
+# они нужны: импорт sum_analysis ради sum_array или чтения файла не
+# должен загружать их (см. measure_import_cost)
+if TYPE_CHECKING:
+    import numpy as np
+
+    from benchmark import BenchmarkResult
+
+
+# Размер блока, который читается из файла за один вызов read()
+DEFAULT_CHUNK_BYTES = 8 * 1024 * 1024
+
+# Размер одного числа в двоичном формате (little-endian int64)
+INT64_SIZE = 8
+
+# Файл с результатами замеров, по которому строится график
+BENCHMARK_JSON = 'benchmark_results.json'
+
+# Всё, что принимают sum_array и measure_time: список, array('q'),
+# memoryview над mmap или массив NumPy
+NumberBuffer = Union[List[int], array, memoryview, 'np.ndarray']
+
+# Размер блока (в элементах) для точного суммирования в NumPy:
+# суммы старших и младших 32 бит блока гарантированно помещаются в int64
+NUMPY_SUM_BLOCK = 1 << 20
+
+# Начиная с этого размера автоматический выбор отдаёт массив пулу процессов
+PARALLEL_MIN_SIZE = 20_000_000
+
+# Целые числа до 2**53 представляются в float без потери точности
+FLOAT_EXACT_LIMIT = 2 ** 53
+
+# Форматы memoryview, содержащие целые числа
+INT_BUFFER_FORMATS = 'bBhHiIlLqQ'
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy() -> Any:
+    """
+    Импортирует NumPy при первом обращении.
+
+    Возвращает:
+        module | None: Модуль numpy или None, если NumPy не установлен
+            (без него работают списки и array).
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _is_ndarray(arr: Any) -> bool:
+    """Проверяет, что arr - массив NumPy, не загружая NumPy без нужды."""
+    numpy = sys.modules.get('numpy')  # Если NumPy не загружен, массива нет
+    return numpy is not None and isinstance(arr, numpy.ndarray)
+
+
+class NumberParseError(ValueError):
+    """
+    Некорректное значение в блоке файла с числами.
+
+    Атрибуты:
+        parsed (List[int]): Числа блока, стоящие перед некорректным значением.
+    """
+
+    def __init__(self, message: str, parsed: List[int]) -> None:
+        """
+        Инициализирует ошибку.
+
+        Аргументы:
+            message (str): Описание ошибки.
+            parsed (List[int]): Числа блока перед некорректным значением.
+        """
+        super().__init__(message)
+        self.parsed = parsed
+
+
+def _parse_error(parts: List[bytes], int64: bool = False) -> NumberParseError:
+    """
+    Находит первое некорректное значение блока (после неудачного разбора).
+
+    Блок разбирается целиком одним вызовом, поэтому место ошибки ищется
+    повторным разбором по одному токену - только когда ошибка уже случилась.
+    При int64 некорректны и числа, не помещающиеся в int64.
+    """
+    parsed = []
+    for part in parts:
+        try:
+            value = int(part)
+        except ValueError as error:
+            return NumberParseError(str(error), parsed)
+        if int64 and not -2 ** 63 <= value < 2 ** 63:
+            return NumberParseError(f"Число {value} не помещается в int64.", parsed)
+        parsed.append(value)
+    return NumberParseError("Некорректные данные в блоке файла.", parsed)
+
+
+def _parse_list(parts: List[bytes]) -> List[int]:
+    """Преобразует токены блока в список int."""
+    try:
+        return list(map(int, parts))
+    except ValueError:
+        raise _parse_error(parts) from None
+
+
+def _parse_array(parts: List[bytes]) -> array:
+    """Преобразует токены блока в array('q') (int64 без объектов int)."""
+    try:
+        return array('q', map(int, parts))
+    except (ValueError, OverflowError):
+        raise _parse_error(parts, int64=True) from None
+
+
+def _parse_numpy(parts: List[bytes]) -> 'np.ndarray':
+    """Преобразует токены блока в массив NumPy типа int64."""
+    np = _numpy()
+    try:
+        return np.fromiter(map(int, parts), dtype=np.int64, count=len(parts))
+    except (ValueError, OverflowError):
+        raise _parse_error(parts, int64=True) from None
+
+
+# Поддерживаемые форматы блоков для iter_number_chunks
+CHUNK_PARSERS = {
+    'list': _parse_list,
+    'array': _parse_array,
+    'numpy': _parse_numpy,
+}
+
+
+def iter_number_chunks(filename: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+                       container: str = 'list') -> Iterator[Union[List[int], array]]:
+    """
+    Потоково читает целые числа из файла блоками.
+
+    Файл читается в двоичном режиме кусками по chunk_bytes байт, кусок
+    обрезается по последнему переводу строки, а остаток переносится в
+    следующий кусок. Поэтому в памяти одновременно находится только один
+    блок, а не весь файл.
+
+    Аргументы:
+        filename (str): Имя файла для чтения.
+        chunk_bytes (int): Размер читаемого куска в байтах.
+        container (str): Формат блока: 'list', 'array' (array('q'))
+            или 'numpy' (np.ndarray int64).
+
+    Возвращает:
+        Iterator: Блоки чисел в выбранном формате.
+
+    Исключения:
+        ValueError: Неизвестный формат блока или отсутствие NumPy.
+        NumberParseError: Некорректные данные в файле, а для 'array' и
+            'numpy' - также числа вне int64 (подкласс ValueError; parsed -
+            числа блока перед ошибкой).
+
+    Сложность: O(N) по времени, O(chunk_bytes) по памяти.
+    """
+    if container not in CHUNK_PARSERS:
+        raise ValueError(f"Неизвестный формат блока: {container}")
+    if container == 'numpy' and _numpy() is None:
+        raise ValueError("Для формата 'numpy' требуется установленный NumPy.")
+    parse = CHUNK_PARSERS[container]
+
+    with open(filename, 'rb') as file:
+        tail = b''
+        while True:
+            block = file.read(chunk_bytes)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b'\n')
+            if cut == -1:  # Строка длиннее куска - дочитываем дальше
+                tail = block
+                continue
+            tail = block[cut + 1:]
+            parts = block[:cut].split()
+            if parts:
+                yield parse(parts)
+        parts = tail.split()
+        if parts:
+            yield parse(parts)
+
+
+def iter_numbers(filename: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[int]:
+    """
+    Потоково возвращает числа из файла по одному.
+
+    Аргументы:
+        filename (str): Имя файла для чтения.
+        chunk_bytes (int): Размер читаемого куска в байтах.
+
+    Возвращает:
+        Iterator[int]: Числа из файла в исходном порядке.
+    """
+    for chunk in iter_number_chunks(filename, chunk_bytes):
+        yield from chunk
+
+
+class ReadStats:
+    """
+    Результат потокового чтения файла.
+
+    Атрибуты:
+        total (int): Сумма прочитанных чисел.
+        count (int): Количество прочитанных чисел.
+        n_bytes (int): Размер файла в байтах.
+        seconds (float): Время чтения в секундах.
+    """
+
+    def __init__(self, total: int, count: int, n_bytes: int, seconds: float) -> None:
+        """
+        Инициализирует результат чтения.
+
+        Аргументы:
+            total (int): Сумма прочитанных чисел.
+            count (int): Количество прочитанных чисел.
+            n_bytes (int): Размер файла в байтах.
+            seconds (float): Время чтения в секундах.
+        """
+        self.total = total
+        self.count = count
+        self.n_bytes = n_bytes
+        self.seconds = seconds
+
+    @property
+    def mb_per_s(self) -> float:
+        """Пропускная способность в мегабайтах в секунду."""
+        return self.n_bytes / (1024 * 1024) / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def numbers_per_s(self) -> float:
+        """Пропускная способность в числах в секунду."""
+        return self.count / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        """Возвращает строку с суммой и пропускной способностью."""
+        return (f"сумма={self.total}, чисел={self.count}, "
+                f"{self.mb_per_s:.1f} МБ/с, {self.numbers_per_s:,.0f} чисел/с")
+
+
+def stream_sum(filename: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+               container: str = 'list') -> ReadStats:
+    """
+    Считает сумму чисел из файла, не создавая общий список.
+
+    Аргументы:
+        filename (str): Имя файла для чтения.
+        chunk_bytes (int): Размер читаемого куска в байтах.
+        container (str): Формат промежуточных блоков (см. iter_number_chunks).
+
+    Возвращает:
+        ReadStats: Сумма, количество чисел и пропускная способность.
+
+    Сложность: O(N) по времени, O(chunk_bytes) по памяти.
+    """
+    start = time.perf_counter()
+    total = 0
+    count = 0
+    for chunk in iter_number_chunks(filename, chunk_bytes, container):
+        # Для блоков NumPy - точная векторная сумма без переполнения int64
+        total += sum_array(chunk, 'numpy') if container == 'numpy' else sum(chunk)
+        count += len(chunk)
+    seconds = time.perf_counter() - start
+    return ReadStats(total, count, os.path.getsize(filename), seconds)
 
 
-def read_numbers_from_file(filename: str) -> List[int]:
+def read_numbers_from_file(filename: str, echo: bool = False) -> List[int]:
     """
     Читает целые числа из файла и возвращает их в виде списка.
     
     Аргументы:
         filename (str): Имя файла для чтения.
+        echo (bool): Выводить ли каждую строку файла на экран.
+            Вывод на консоль многократно медленнее самого чтения,
+            поэтому по умолчанию он отключён.
         
     Возвращает:
-        List[int]: Список целых чисел из файла.
+        List[int]: Список целых чисел из файла. При некорректных данных -
+            числа, прочитанные до первого некорректного значения.
         
     Сложность: O(N), где N - количество чисел в файле.
     """
     numbers = []  # O(1) - инициализация списка
     try:
+        if not echo:
+            try:
+                for chunk in iter_number_chunks(filename):  # O(N) - блочное чтение
+                    numbers.extend(chunk)
+            except NumberParseError as e:
+                numbers.extend(e.parsed)  # Числа блока до ошибки, как при построчном чтении
+                raise
+            return numbers
         with open(filename, 'r') as file:  # O(1) - открытие файла
             print(f"Содержимое файла '{filename}':")
             for line in file:  # O(N) - чтение каждой строки файла
@@ -40,6 +324,122 @@ def read_numbers_from_file(filename: str) -> List[int]:
     return numbers  # O(1) - возврат результата
 
 
+def convert_text_to_binary(src: str, dst: str,
+                           chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> int:
+    """
+    Преобразует текстовый файл с числами в двоичный файл little-endian int64.
+
+    Аргументы:
+        src (str): Текстовый файл (одно число в строке).
+        dst (str): Двоичный файл для записи.
+        chunk_bytes (int): Размер читаемого куска в байтах.
+
+    Возвращает:
+        int: Количество записанных чисел.
+
+    Исключения:
+        NumberParseError: Если в файле некорректные данные или число не
+            помещается в int64 (подкласс ValueError).
+
+    Сложность: O(N) по времени, O(chunk_bytes) по памяти.
+    """
+    count = 0
+    with open(dst, 'wb') as out:
+        for chunk in iter_number_chunks(src, chunk_bytes, 'array'):
+            if sys.byteorder == 'big':
+                chunk.byteswap()  # Формат файла всегда little-endian
+            chunk.tofile(out)
+            count += len(chunk)
+    return count
+
+
+def load_binary_numbers(filename: str, as_numpy: bool = False) -> NumberBuffer:
+    """
+    Отображает двоичный файл int64 в память без копирования.
+
+    Файл открывается через mmap, поэтому данные подгружаются страницами
+    по мере обращения и могут превышать объём оперативной памяти.
+    Отображение живёт, пока жив возвращённый буфер.
+
+    Аргументы:
+        filename (str): Двоичный файл little-endian int64.
+        as_numpy (bool): Вернуть np.ndarray вместо memoryview.
+
+    Возвращает:
+        NumberBuffer: memoryview формата 'q' или np.ndarray типа '<i8'.
+
+    Исключения:
+        ValueError: Если размер файла не кратен 8 байтам, NumPy не
+            установлен или memoryview запрошен на big-endian машине.
+
+    Сложность: O(1) - данные не читаются до первого обращения.
+    """
+    size = os.path.getsize(filename)
+    if size % INT64_SIZE:
+        raise ValueError(f"Размер файла '{filename}' не кратен {INT64_SIZE} байтам.")
+    np = _numpy() if as_numpy else None
+    if as_numpy and np is None:
+        raise ValueError("Для as_numpy=True требуется установленный NumPy.")
+    if not as_numpy and sys.byteorder != 'little':
+        raise ValueError("memoryview доступен только на little-endian машине, "
+                         "используйте as_numpy=True.")
+
+    if size == 0:  # mmap не умеет отображать пустые файлы
+        return np.empty(0, dtype='<i8') if as_numpy else memoryview(array('q'))
+
+    with open(filename, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if as_numpy:
+        return np.frombuffer(mapped, dtype='<i8')
+    return memoryview(mapped).cast('q')
+
+
+def _as_python_iterable(arr: NumberBuffer) -> NumberBuffer:
+    """
+    Подготавливает массив NumPy к обходу циклом Python.
+
+    Обход memoryview над массивом даёт обычные int Python, поэтому сумма
+    не переполняется, как при сложении np.int64.
+    """
+    if _is_ndarray(arr):
+        np = _numpy()
+        native = np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder('='))
+        return memoryview(native.reshape(-1))
+    return arr
+
+
+def compare_readers(filename: str) -> Dict[str, ReadStats]:
+    """
+    Сравнивает пропускную способность способов чтения файла.
+
+    Аргументы:
+        filename (str): Имя файла с числами.
+
+    Возвращает:
+        Dict[str, ReadStats]: Результат для каждого способа чтения.
+    """
+    results = {}
+    n_bytes = os.path.getsize(filename)
+
+    start = time.perf_counter()
+    numbers = read_numbers_from_file(filename)
+    seconds = time.perf_counter() - start
+    results['read_numbers_from_file'] = ReadStats(sum(numbers), len(numbers), n_bytes, seconds)
+    del numbers
+
+    containers = ['list', 'array'] + (['numpy'] if _numpy() is not None else [])
+    for container in containers:
+        results[f'stream_sum[{container}]'] = stream_sum(filename, container=container)
+
+    print("{:>28} | {:>10} | {:>14}".format("Способ чтения", "МБ/с", "Чисел/с"))
+    print("-" * 58)
+    for name, stats in results.items():
+        print("{:>28} | {:>10.1f} | {:>14,.0f}".format(
+            name, stats.mb_per_s, stats.numbers_per_s
+        ))
+    return results
+
+
 def calculate_sum() -> None:
     """
     Считывает два целых числа из stdin и выводит их сумму.
@@ -53,18 +453,20 @@ def calculate_sum() -> None:
     print(result)  # O(1) - вывод одной строки
 
 
-def sum_array(arr: List[int]) -> int:
+def _sum_loop(arr: NumberBuffer) -> int:
     """
-    Возвращает сумму всех элементов массива.
+    Возвращает сумму всех элементов массива циклом Python.
 
     Аргументы:
-        arr (List[int]): Список целых чисел для суммирования.
+        arr (NumberBuffer): Список целых чисел, array('q'), memoryview
+            или массив NumPy (например, из load_binary_numbers).
 
     Возвращает:
         int: Сумма элементов массива.
 
     Сложность: O(N), где N - длина массива.
     """
+    arr = _as_python_iterable(arr)  # O(1) - без копирования для int64
     total = 0  # O(1) - инициализация переменной
     for num in arr:  # O(N) - цикл по всем N элементам массива
         total += num  # O(1) - операция сложения и присваивания на каждой итерации
@@ -72,13 +474,230 @@ def sum_array(arr: List[int]) -> int:
     # Общая сложность: O(1) + O(N) * O(1) + O(1) = O(N)
 
 
-def measure_time(func: Callable[[List[int]], int], data: List[int]) -> float:
+def _sum_builtin(arr: NumberBuffer) -> int:
+    """Суммирует встроенной функцией sum (цикл на C, точные int Python)."""
+    return sum(_as_python_iterable(arr))
+
+
+def _sum_fsum(arr: NumberBuffer) -> Union[int, float]:
+    """
+    Суммирует через math.fsum.
+
+    Для целых чисел fsum точен, только если и слагаемые, и сумма по модулю
+    меньше 2**53: тогда результат возвращается как int, а в остальных
+    случаях используется встроенный sum. Если среди данных есть дробные
+    числа, возвращается результат fsum как есть (float), без усечения.
+    """
+    arr = _as_python_iterable(arr)
+    if not len(arr):
+        return 0
+    if not set(map(type, arr)) <= {int}:
+        return math.fsum(arr)
+    if max(-min(arr), max(arr)) >= FLOAT_EXACT_LIMIT:
+        return sum(arr)
+    total = math.fsum(arr)
+    if abs(total) >= FLOAT_EXACT_LIMIT:
+        return sum(arr)
+    return int(total)
+
+
+def _as_int_ndarray(arr: NumberBuffer) -> 'np.ndarray | None':
+    """
+    Возвращает одномерный целочисленный массив NumPy без копирования
+    (для списков - с копированием) или None, если NumPy не подходит:
+    NumPy не установлен, элементы не целые или не помещаются в int64.
+    """
+    np = _numpy()
+    if np is None:
+        return None
+    if isinstance(arr, memoryview) and arr.format not in INT_BUFFER_FORMATS:
+        return None
+    try:
+        result = np.asarray(arr)
+    except OverflowError:  # В списке есть int больше int64
+        return None
+    if result.dtype.kind not in 'iu':
+        return None
+    return result.reshape(-1)
+
+
+def _sum_numpy(arr: NumberBuffer) -> int:
+    """
+    Суммирует через np.add.reduce без переполнения int64.
+
+    Каждое 64-битное число раскладывается на старшие (x >> 32) и младшие
+    (x & 0xFFFFFFFF) 32 бита. Суммы половин по блоку из NUMPY_SUM_BLOCK
+    элементов помещаются в int64, а общая сумма собирается в int Python:
+    total = (sum(hi) << 32) + sum(lo). Если массив не целочисленный,
+    используется встроенный sum.
+    """
+    data = _as_int_ndarray(arr)
+    if data is None:
+        return _sum_builtin(arr)
+    np = _numpy()
+    total = 0
+    for start in range(0, len(data), NUMPY_SUM_BLOCK):
+        block = data[start:start + NUMPY_SUM_BLOCK]
+        if block.dtype.itemsize < 8:
+            total += int(np.add.reduce(block, dtype=np.int64))
+            continue
+        high = np.add.reduce(np.right_shift(block, 32), dtype=np.int64)
+        low = np.add.reduce(np.bitwise_and(block, 0xFFFFFFFF), dtype=np.int64)
+        total += (int(high) << 32) + int(low)
+    return total
+
+
+def _sum_shared_block(name: str, dtype: str, length: int, start: int, stop: int) -> int:
+    """
+    Суммирует срез [start, stop) массива из разделяемой памяти (в воркере).
+
+    Воркеры пула используют resource_tracker родителя, поэтому повторная
+    регистрация блока не приводит к его удалению: блок удаляет родитель.
+    """
+    from multiprocessing import shared_memory
+
+    np = _numpy()
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        data = np.ndarray((length,), dtype=dtype, buffer=shm.buf)
+        result = _sum_numpy(data[start:stop])
+        del data  # Освобождаем буфер до shm.close()
+        return result
+    finally:
+        shm.close()
+
+
+def _sum_parallel(arr: NumberBuffer, workers: int | None = None) -> int:
+    """
+    Суммирует массив пулом процессов.
+
+    Массив один раз копируется в разделяемую память, каждый воркер
+    подключается к ней по имени и точно суммирует свой отрезок через
+    _sum_numpy, а частичные суммы складываются как int Python.
+    """
+    data = _as_int_ndarray(arr)
+    if data is None:
+        return _sum_builtin(arr)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(data) < workers * NUMPY_SUM_BLOCK:
+        return _sum_numpy(data)
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    np = _numpy()
+
+    shm = shared_memory.SharedMemory(create=True, size=data.nbytes)
+    try:
+        shared = np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)
+        shared[:] = data
+        del shared
+        step = -(-len(data) // workers)  # Деление с округлением вверх
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_sum_shared_block, shm.name, data.dtype.str,
+                            len(data), start, min(start + step, len(data)))
+                for start in range(0, len(data), step)
+            ]
+            return sum(future.result() for future in futures)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# Доступные способы суммирования; для целых данных все возвращают один и
+# тот же точный int
+SUM_BACKENDS: Dict[str, Callable[[NumberBuffer], int]] = {
+    'loop': _sum_loop,
+    'builtin': _sum_builtin,
+    'fsum': _sum_fsum,
+    'numpy': _sum_numpy,
+    'parallel': _sum_parallel,
+}
+
+
+def choose_sum_backend(arr: NumberBuffer) -> str:
+    """
+    Выбирает способ суммирования по типу и размеру данных.
+
+    Списки суммируются встроенным sum (перевод в NumPy дороже самой суммы),
+    целочисленные буферы и массивы NumPy - через NumPy, а очень большие
+    массивы - пулом процессов, если доступно больше одного ядра.
+
+    Аргументы:
+        arr (NumberBuffer): Данные для суммирования.
+
+    Возвращает:
+        str: Имя способа из SUM_BACKENDS.
+    """
+    is_buffer = isinstance(arr, (array, memoryview)) or _is_ndarray(arr)
+    if not is_buffer or _as_int_ndarray(arr) is None:
+        return 'builtin'
+    if len(arr) >= PARALLEL_MIN_SIZE and (os.cpu_count() or 1) > 1:
+        return 'parallel'
+    return 'numpy'
+
+
+def sum_array(arr: NumberBuffer, backend: str = 'loop') -> int:
+    """
+    Возвращает сумму всех элементов массива.
+
+    Аргументы:
+        arr (NumberBuffer): Список целых чисел, array('q'), memoryview
+            или массив NumPy (например, из load_binary_numbers).
+        backend (str): Способ суммирования: 'loop' (цикл Python, по
+            умолчанию), 'builtin', 'fsum', 'numpy', 'parallel' или 'auto'
+            (выбор через choose_sum_backend).
+
+    Возвращает:
+        int: Сумма элементов массива (точная, без переполнения).
+
+    Исключения:
+        ValueError: Неизвестный способ суммирования.
+
+    Сложность: O(N), где N - длина массива.
+    """
+    if backend == 'auto':
+        backend = choose_sum_backend(arr)
+    if backend not in SUM_BACKENDS:
+        raise ValueError(f"Неизвестный способ суммирования: {backend}")
+    return SUM_BACKENDS[backend](arr)
+
+
+def verify_sum_backends(arr: NumberBuffer) -> Dict[str, int]:
+    """
+    Проверяет, что все способы суммирования дают один и тот же результат.
+
+    Эталоном служит сумма int Python произвольной точности (цикл 'loop').
+
+    Аргументы:
+        arr (NumberBuffer): Данные для проверки.
+
+    Возвращает:
+        Dict[str, int]: Результат каждого способа.
+
+    Исключения:
+        ValueError: Если какой-либо способ вернул другой результат.
+    """
+    expected = _sum_loop(arr)
+    results = {}
+    for name, backend in SUM_BACKENDS.items():
+        if name in ('numpy', 'parallel') and _numpy() is None:
+            continue
+        results[name] = backend(arr)
+        if results[name] != expected or type(results[name]) is not int:
+            raise ValueError(f"Способ '{name}' вернул {results[name]!r}, "
+                             f"ожидалось {expected}")
+    return results
+
+
+def measure_time(func: Callable[[NumberBuffer], int], data: NumberBuffer) -> float:
     """
     Измеряет среднее время выполнения функции в миллисекундах.
 
     Аргументы:
         func (Callable): Функция, время выполнения которой измеряется.
-        data (List[int]): Данные для передачи в функцию.
+        data (NumberBuffer): Данные для передачи в функцию
+            (в том числе буфер из load_binary_numbers).
 
     Возвращает:
         float: Среднее время выполнения в миллисекундах.
@@ -89,85 +708,308 @@ def measure_time(func: Callable[[List[int]], int], data: List[int]) -> float:
     return average_time_ms
 
 
-def main() -> None:
-    """Основная функция для проведения экспериментов и анализа."""
-    # Характеристики ПК (ЗАПОЛНИТЕ СВОИМИ ДАННЫМИ!)
-    pc_info = """
-    Характеристики ПК для тестирования:
-    - Процессор: Intel Core i7-8700 @ 3.6GHz
-    - Оперативная память: 32 GB DDR4
-    - OC: Windows 11
-    - Python: 3.13.0
+def _load_pyplot() -> Any:
     """
-    print(pc_info)
-
-    # 1. Демонстрация работы базовой функции
-    print("=== Базовая задача: суммирование двух чисел ===")
-    
-    # calculate_sum()  # Раскомментировать для интерактивного ввода
-
-    # 1.1. Чтение чисел из файла 
-    print("\n=== Чтение чисел из файла ===")
-    filename = "numbers.txt"  # Имя файла с числами
-    numbers_from_file = read_numbers_from_file(filename)  # O(N) - чтение файла
-    
-    if numbers_from_file:
-        print(f"\nПрочитано чисел из файла: {len(numbers_from_file)}")
-        if len(numbers_from_file) >= 2:
-            # Вычисляем сумму первых двух чисел из файла
-            file_sum = numbers_from_file[0] + numbers_from_file[1]  # O(1)
-            print(f"Сумма первых двух чисел из файла: {file_sum}")
-        else:
-            print("В файле недостаточно чисел для вычисления суммы (нужно минимум 2)")
-    else:
-        print("Не удалось прочитать числа из файла.")
+    Импортирует matplotlib.pyplot при первом построении графика.
 
-    # 2. Анализ производительности усложненной задачи
-    print("\n=== Анализ производительности (sum_array) ===")
-    sizes = [1000, 5000, 10000, 50000, 100000,200000, 350000, 500000]  # Размеры массивов
-    times = []  # Список для хранения среднего времени выполнения для каждого размера
+    matplotlib загружается сотни миллисекунд и занимает десятки МБ памяти,
+    поэтому он не импортируется при запуске модуля: таблица замеров,
+    calculate_sum и остальные функции работают без него.
+    """
+    import matplotlib
+    matplotlib.use('Agg')  # Используем неинтерактивный бэкенд
+    import matplotlib.pyplot as plt
+    return plt
 
-    print("Замеры времени выполнения для алгоритма суммирования массива:")
-    print("{:>10} | {:>12} | {:>15}".format("Размер (N)", "Время (мс)", "Время/N (мкс)"))
-    print("-" * 45)
 
-    for size in sizes:
-        # Генерация случайного массива заданного размера
-        data = [random.randint(1, 1000) for _ in range(size)]  # O(N)
+def plot_benchmark_results(json_filename: str, png_filename: str) -> None:
+    """
+    Строит график зависимости времени от размера по JSON-файлу замеров.
 
-        # Замер времени выполнения с усреднением
-        execution_time = measure_time(sum_array, data)  # Замеряем время для sum_array
-        times.append(execution_time)
+    Точка - медиана, полоса - от медианы до 95-го перцентиля.
 
-        # Расчет времени на один элемент (в микросекундах)
-        time_per_element = (execution_time * 1000) / size if size > 0 else 0  # мкс на элемент
+    Аргументы:
+        json_filename (str): Файл, сохранённый save_results_json.
+        png_filename (str): Имя файла для сохранения графика.
+    """
+    from benchmark import load_results_json
 
-        # Форматированный вывод результатов замера
-        print("{:>10} | {:>12.4f} | {:>15.4f}".format(
-            size, execution_time, time_per_element
-        ))
+    plt = _load_pyplot()
+    _, results = load_results_json(json_filename)
+    sizes = [result.size for result in results]
+    medians = [result.median for result in results]
+    upper = [result.p95 - result.median for result in results]
 
-    # 3. Построение графика
     plt.figure(figsize=(10, 6))
-    plt.plot(sizes, times, 'bo-', label='Измеренное время')
+    plt.errorbar(sizes, medians, yerr=[[0] * len(upper), upper], fmt='bo-',
+                 capsize=3, label='Медиана (полоса до p95)')
     plt.xlabel('Размер массива (N)')
     plt.ylabel('Время выполнения (мс)')
     plt.title('Зависимость времени выполнения от размера массива\nСложность: O(N)')
     plt.grid(True, which='both', linestyle='--', linewidth=0.5)
     plt.legend()
     # Сохранение графика в файл
-    plt.savefig('time_complexity_plot.png', dpi=300, bbox_inches='tight')
-    
-    print("График сохранен в файл 'time_complexity_plot.png'")
+    plt.savefig(png_filename, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def run_sweep(sizes: List[int]) -> List['BenchmarkResult']:
+    """
+    Замеряет sum_array для каждого размера массива.
+
+    Аргументы:
+        sizes (List[int]): Размеры массивов.
+
+    Возвращает:
+        List[BenchmarkResult]: Результаты замеров в порядке sizes.
+    """
+    from benchmark import run_benchmark
+    from data_generation import cached_data
+
+    results = []  # Результаты замеров (BenchmarkResult) для каждого размера
+    for size in sizes:
+        # Случайный массив заданного размера: векторная генерация с зерном,
+        # при повторных запусках берётся из кеша на диске
+        data = cached_data(size, seed=size).tolist()  # O(N)
+
+        # Замер с прогревом, отбрасыванием выбросов и адаптивным числом запусков
+        results.append(run_benchmark(sum_array, data))
+    return results
+
+
+def format_results(results: List['BenchmarkResult'], output_format: str = 'table') -> str:
+    """
+    Форматирует результаты замеров для вывода.
+
+    Аргументы:
+        results (List[BenchmarkResult]): Результаты замеров.
+        output_format (str): 'table' (таблица для чтения), 'csv' или 'json'.
+
+    Возвращает:
+        str: Отформатированные результаты.
+
+    Исключения:
+        ValueError: Неизвестный формат.
+    """
+    rows = [{
+        'size': result.size,
+        'median_ms': result.median,
+        'p95_ms': result.p95,
+        'stdev_ms': result.stdev,
+        'relative_ci': result.relative_ci,
+        'us_per_element': result.median * 1000 / result.size if result.size > 0 else 0,
+        'runs': result.runs,
+    } for result in results]
+
+    if output_format == 'json':
+        return json.dumps(rows, ensure_ascii=False, indent=2)
+    if output_format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0]) if rows else [],
+                                lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue().rstrip('\n')
+    if output_format != 'table':
+        raise ValueError(f"Неизвестный формат вывода: {output_format}")
+
+    lines = [
+        "{:>10} | {:>12} | {:>10} | {:>10} | {:>8} | {:>13} | {:>7}".format(
+            "Размер (N)", "Медиана (мс)", "p95 (мс)", "σ (мс)", "±ДИ 95%",
+            "Время/N (мкс)", "Замеров"
+        ),
+        "-" * 90,
+    ]
+    for row in rows:
+        lines.append(
+            "{:>10} | {:>12.4f} | {:>10.4f} | {:>10.4f} | {:>8.1%} | {:>13.4f} | {:>7}".format(
+                row['size'], row['median_ms'], row['p95_ms'], row['stdev_ms'],
+                row['relative_ci'], row['us_per_element'], row['runs']
+            )
+        )
+    return "\n".join(lines)
+
+
+def measure_import_cost(statement: str = 'import sum_analysis') -> Dict[str, float]:
+    """
+    Измеряет стоимость импорта в новом интерпретаторе через -X importtime.
+
+    Аргументы:
+        statement (str): Код, выполняемый в дочернем процессе.
+
+    Возвращает:
+        Dict[str, float]: 'import_ms' - суммарное время импорта модулей
+            верхнего уровня, 'modules' - число загруженных модулей,
+            'max_rss_mb' - пиковая память процесса (None, если модуль
+            resource недоступен, например на Windows).
+    """
+    code = (
+        f"{statement}\n"
+        "try:\n"
+        "    import resource\n"
+        "    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+        "    print(rss / 1024 if sys.platform != 'darwin' else rss / 1024 ** 2)\n"
+        "except ImportError:\n"
+        "    print('')\n"
+    )
+    import subprocess
+
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import sys\n{code}"],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    import_us = 0
+    modules = 0
+    for line in completed.stderr.splitlines():
+        # Формат строки: "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules += 1
+        if not name.startswith('  '):  # Модуль верхнего уровня (без отступа)
+            import_us += int(cumulative)
+    rss = completed.stdout.strip().splitlines()[-1] if completed.stdout.strip() else ''
+    return {
+        'import_ms': import_us / 1000,
+        'modules': modules,
+        'max_rss_mb': float(rss) if rss else None,
+    }
+
+
+def report_import_cost() -> None:
+    """Сравнивает стоимость импорта sum_analysis с ленивым и немедленным matplotlib."""
+    lazy = measure_import_cost('import sum_analysis')
+    eager = measure_import_cost("import sum_analysis\nsum_analysis._load_pyplot()")
+    print("{:>28} | {:>12} | {:>8} | {:>10}".format("Вариант", "Импорт (мс)", "Модулей", "RSS (МБ)"))
+    print("-" * 68)
+    for name, cost in (("без matplotlib (по умолчанию)", lazy), ("с matplotlib", eager)):
+        rss = f"{cost['max_rss_mb']:.1f}" if cost['max_rss_mb'] is not None else "н/д"
+        print("{:>28} | {:>12.1f} | {:>8} | {:>10}".format(
+            name, cost['import_ms'], cost['modules'], rss
+        ))
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """
+    Разбирает аргументы командной строки.
+
+    Аргументы:
+        argv (List[str]): Аргументы (по умолчанию sys.argv[1:]).
+
+    Возвращает:
+        argparse.Namespace: Разобранные аргументы.
+    """
+    parser = argparse.ArgumentParser(description="Анализ сложности алгоритма суммирования.")
+    parser.add_argument('--format', choices=('table', 'csv', 'json'), default='table',
+                        help="Формат вывода замеров. В csv/json выводятся только замеры.")
+    parser.add_argument('--plot', action='store_true',
+                        help="Построить график (загружает matplotlib).")
+    parser.add_argument('--import-cost', action='store_true',
+                        help="Измерить время и память импорта модуля и выйти.")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> None:
+    """
+    Основная функция для проведения экспериментов и анализа.
+
+    Аргументы:
+        argv (List[str]): Аргументы командной строки (см. parse_args).
+    """
+    args = parse_args(argv)
+    if args.import_cost:
+        report_import_cost()
+        return
+    from benchmark import save_results_json
+    from complexity import fit_complexity, geometric_sizes, print_fits
+    from data_generation import cached_data
+    from results_store import DEFAULT_STORE, append_run, collect_machine_info, format_pc_info
+
+    verbose = args.format == 'table'  # В csv/json выводим только данные
+
+    if verbose:
+        # Характеристики ПК определяются автоматически, чтобы запуски были сравнимы
+        pc_info = format_pc_info(collect_machine_info())
+        print(pc_info)
+
+        # 1. Демонстрация работы базовой функции
+        print("=== Базовая задача: суммирование двух чисел ===")
+
+        # calculate_sum()  # Раскомментировать для интерактивного ввода
+
+        # 1.1. Чтение чисел из файла
+        print("\n=== Чтение чисел из файла ===")
+        filename = "numbers.txt"  # Имя файла с числами
+        numbers_from_file = read_numbers_from_file(filename, echo=True)  # O(N) - чтение файла
+
+        if numbers_from_file:
+            print(f"\nПрочитано чисел из файла: {len(numbers_from_file)}")
+            if len(numbers_from_file) >= 2:
+                # Вычисляем сумму первых двух чисел из файла
+                file_sum = numbers_from_file[0] + numbers_from_file[1]  # O(1)
+                print(f"Сумма первых двух чисел из файла: {file_sum}")
+            else:
+                print("В файле недостаточно чисел для вычисления суммы (нужно минимум 2)")
+            print("\nПропускная способность чтения:")
+            compare_readers(filename)
+
+            # Двоичный формат: чтение через mmap без копирования
+            binary_filename = "numbers.bin"
+            convert_text_to_binary(filename, binary_filename)
+            binary_numbers = load_binary_numbers(binary_filename)
+            print(f"Сумма чисел из двоичного файла '{binary_filename}': "
+                  f"{sum_array(binary_numbers)}")
+        else:
+            print("Не удалось прочитать числа из файла.")
+
+        # 2. Анализ производительности усложненной задачи
+        print("\n=== Анализ производительности (sum_array) ===")
+        print("Замеры времени выполнения для алгоритма суммирования массива:")
+
+    sizes = geometric_sizes(1000, 500000, 10)  # Размеры массивов (геометрическая сетка)
+    results = run_sweep(sizes)
+    print(format_results(results, args.format))
+
+    save_results_json(results, BENCHMARK_JSON)
+    run = append_run(results, DEFAULT_STORE)
+    if verbose:
+        print(f"Результаты замеров сохранены в файл '{BENCHMARK_JSON}'")
+        print(f"Запуск {run['run_id']} добавлен в хранилище '{DEFAULT_STORE}' "
+              "(сравнение: python results_store.py compare -2 -1)")
+
+    if args.plot:
+        # 3. Построение графика по сохранённым результатам
+        plot_benchmark_results(BENCHMARK_JSON, 'time_complexity_plot.png')
+        if verbose:
+            print("График сохранен в файл 'time_complexity_plot.png'")
+
+    if not verbose:
+        return
+
+    # 2.1. Сравнение способов суммирования на самом большом массиве
+    data = cached_data(sizes[-1], seed=sizes[-1]).tolist()
+    print("\n=== Способы суммирования (N = {}) ===".format(sizes[-1]))
+    for backend in SUM_BACKENDS:
+        if backend in ('numpy', 'parallel') and _numpy() is None:
+            continue
+        backend_time = measure_time(lambda arr: sum_array(arr, backend), data)
+        print("{:>10} | {:>12.4f} мс".format(backend, backend_time))
+    print(f"Автоматический выбор: {choose_sum_backend(data)}")
+
+    # Проверка точности на числах, близких к границам int64
+    edge_values = array('q', [2 ** 63 - 1, 2 ** 63 - 1, -2 ** 63, 12345] * 1000)
+    verify_sum_backends(edge_values)
+    print("Все способы дают одинаковую точную сумму на граничных значениях int64")
 
     # 4. Анализ результатов
     print("\n=== Анализ результатов ===")
     print("1. Теоретическая сложность алгоритма sum_array: O(N)")
-    print("2. Практические замеры показывают линейную зависимость времени от N, "
-          "что подтверждается графиком.")
-   
+    fits = fit_complexity(sizes, [result.median for result in results])
+    print("2. Подгонка замеров под модели сложности:")
+    print_fits(fits)
 
 
 # Точка входа в программу
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
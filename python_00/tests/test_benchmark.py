@@ -0,0 +1,110 @@
+from itertools import cycle
+
+import pytest
+
+import benchmark
+from benchmark import (BenchmarkResult, load_results_json, reject_outliers,
+                       run_benchmark, save_results_json)
+
+
+class FakeClock:
+    """Часы, которые идут только при замерах FakeTimer."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_timer(monkeypatch):
+    """
+    Подменяет timeit.Timer и time.perf_counter в benchmark.
+
+    Возвращает функцию, задающую время одного вызова в секундах для
+    каждого следующего замера (включая подбор числа вызовов и прогрев).
+    """
+    clock = FakeClock()
+    durations = iter(())
+
+    class FakeTimer:
+        def __init__(self, stmt, setup='pass'):
+            pass
+
+        def timeit(self, number):
+            elapsed = next(durations) * number
+            clock.now += elapsed
+            return elapsed
+
+    def use(per_call):
+        nonlocal durations
+        durations = iter(per_call)
+
+    monkeypatch.setattr(benchmark.timeit, 'Timer', FakeTimer)
+    monkeypatch.setattr(benchmark.time, 'perf_counter', clock)
+    return use
+
+
+def test_reject_outliers():
+    kept, rejected = reject_outliers([1.0, 1.1, 0.9, 1.0, 1.05, 10.0])
+    assert rejected == [10.0]
+    assert kept == [1.0, 1.1, 0.9, 1.0, 1.05]
+    assert reject_outliers([1.0, 100.0, 1.0]) == ([1.0, 100.0, 1.0], []), (
+        'Меньше четырёх замеров выбросы не отбрасываются.'
+    )
+
+
+def test_loops_are_calibrated_to_min_sample(fake_timer):
+    fake_timer(cycle([0.001]))
+    result = run_benchmark(len, [1, 2, 3], min_sample_s=0.005)
+    assert result.loops == 8, 'Замер должен длиться не меньше min_sample_s.'
+    assert result.median == pytest.approx(1.0)
+    assert result.size == 3 and result.name == 'len'
+
+
+def test_stops_when_confidence_interval_is_narrow(fake_timer):
+    fake_timer(cycle([0.001, 0.00101]))
+    result = run_benchmark(len, [], min_sample_s=0, min_runs=10)
+    assert result.runs == 10, (
+        'При узком доверительном интервале хватает min_runs замеров.'
+    )
+    assert result.relative_ci <= 0.02
+
+
+def test_noisy_samples_run_until_max_runs(fake_timer):
+    fake_timer(cycle([0.001, 0.002]))
+    result = run_benchmark(len, [], min_sample_s=0, max_runs=50)
+    assert result.runs == 50 and not result.rejected_ms
+    assert result.relative_ci > 0.02
+
+
+def test_max_total_time_caps_measurement(fake_timer):
+    fake_timer(cycle([0.001, 0.002]))
+    result = run_benchmark(len, [], min_sample_s=0, warmup=0,
+                           max_total_s=0.0495)
+    # Подбор числа вызовов берёт 1 мс, затем замеры 2, 1, 2, ... мс:
+    # после 32 замеров прошло 49 мс, после 33 - 50 мс > max_total_s
+    assert result.runs + len(result.rejected_ms) == 33
+
+
+def test_spikes_are_rejected(fake_timer):
+    fake_timer(cycle([0.001] * 9 + [0.05]))
+    result = run_benchmark(len, [], min_sample_s=0, warmup=0)
+    # Девятый замер - выброс 50 мс; без него остальные одинаковы, и
+    # доверительный интервал сужается уже на min_runs замерах
+    assert result.rejected_ms == [pytest.approx(50.0)]
+    assert result.runs == 9 and result.stdev == 0
+    assert result.median == pytest.approx(1.0)
+
+
+def test_results_json_round_trip(tmp_path):
+    path = tmp_path / 'results.json'
+    results = [BenchmarkResult('sum', 100, [1.0, 1.5, 2.0], [9.0], loops=4,
+                               warmup=2, gc_disabled=False)]
+    save_results_json(results, path, meta={'run': 1})
+    meta, loaded = load_results_json(path)
+    assert meta == {'run': 1}
+    assert [item.to_dict() for item in loaded] == [
+        item.to_dict() for item in results
+    ]
@@ -0,0 +1,58 @@
+import math
+import random
+
+import pytest
+
+from complexity import fit_complexity, geometric_sizes, resolve
+
+SIZES = geometric_sizes(1000, 1_000_000, 12)
+
+# Синтетическое время в мс: постоянная часть плюс член сложности
+TIMINGS = {
+    'O(1)': lambda n: 0.5,
+    'O(N)': lambda n: 0.05 + 2e-5 * n,
+    'O(N log N)': lambda n: 0.05 + 1e-6 * n * math.log2(n),
+    'O(N²)': lambda n: 0.01 + 1e-9 * n * n,
+}
+
+
+@pytest.mark.parametrize('model', TIMINGS)
+@pytest.mark.parametrize('noise', [0.0, 0.03])
+def test_fit_picks_true_model(model, noise):
+    rng = random.Random(0)
+    times = [TIMINGS[model](n) * (1 + rng.uniform(-noise, noise))
+             for n in SIZES]
+    fits = fit_complexity(SIZES, times)
+    assert fits[0].model == model, (
+        f'Для замеров {model} выбрана модель {fits[0].model}.'
+    )
+    assert len(fits) == 5
+    if not noise:
+        assert fits[0].relative_rmse < 1e-9
+        assert fits[0].predict(SIZES[-1]) == pytest.approx(
+            TIMINGS[model](SIZES[-1])
+        )
+
+
+def test_fit_weights_relative_error():
+    # Без весов подгонку определял бы только самый большой размер
+    times = [0.05 + 2e-5 * n for n in SIZES]
+    times[-1] *= 1.2
+    fit = fit_complexity(SIZES, times)[0]
+    assert fit.model == 'O(N)'
+    assert fit.predict(SIZES[0]) == pytest.approx(times[0], rel=0.1)
+
+
+def test_fit_needs_three_points():
+    with pytest.raises(ValueError):
+        fit_complexity([10, 100], [1.0, 2.0])
+    with pytest.raises(ValueError):
+        fit_complexity([10, 100, 1000], [1.0, 2.0])
+
+
+def test_geometric_sizes_and_resolve():
+    assert geometric_sizes(10, 1000, 3) == [10, 100, 1000]
+    assert geometric_sizes(5, 5, 4) == [5]
+    assert resolve('math:sqrt') is math.sqrt
+    with pytest.raises(ValueError):
+        resolve('math.sqrt')
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+import data_generation
+from data_generation import (DISTRIBUTIONS, cache_path, cached_data,
+                             generate_data)
+
+np = pytest.importorskip('numpy')
+
+
+@pytest.mark.parametrize('distribution', DISTRIBUTIONS)
+@pytest.mark.parametrize('dtype', ['int32', 'int64', 'float64'])
+def test_generation_is_reproducible(distribution, dtype):
+    first = generate_data(5000, seed=7, distribution=distribution, dtype=dtype,
+                          low=10, high=500)
+    second = generate_data(5000, seed=7, distribution=distribution,
+                           dtype=dtype, low=10, high=500)
+    assert first.dtype == np.dtype(dtype)
+    assert np.array_equal(first, second), (
+        'Одинаковые параметры должны давать одинаковые данные.'
+    )
+    assert first.min() >= 10 and first.max() <= 500
+    if distribution not in ('sequential', 'constant'):
+        other = generate_data(5000, seed=8, distribution=distribution,
+                              dtype=dtype, low=10, high=500)
+        assert not np.array_equal(first, other)
+
+
+def test_blocks_do_not_depend_on_size(monkeypatch):
+    monkeypatch.setattr(data_generation, 'GENERATION_BLOCK', 64)
+    short = generate_data(64, seed=3)
+    long = generate_data(1000, seed=3)
+    assert np.array_equal(long[:64], short), (
+        'Блок должен зависеть только от зерна и своего номера.'
+    )
+
+
+def test_cache_is_created_and_reused(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_generation, 'GENERATION_BLOCK', 1000)
+    cache_dir = str(tmp_path / 'cache')
+    data = cached_data(4500, seed=2, distribution='zipf', cache_dir=cache_dir)
+    path = cache_path(4500, seed=2, distribution='zipf', cache_dir=cache_dir)
+    assert os.listdir(cache_dir) == [os.path.basename(path)], (
+        'В кеше должен остаться только готовый файл, без временных.'
+    )
+    assert isinstance(data, np.memmap) and not data.flags.writeable
+    assert np.array_equal(data, generate_data(4500, seed=2,
+                                              distribution='zipf'))
+
+    def fail(*args, **kwargs):
+        raise AssertionError('Данные из кеша не должны генерироваться заново.')
+
+    monkeypatch.setattr(data_generation, '_fill', fail)
+    again = cached_data(4500, seed=2, distribution='zipf', cache_dir=cache_dir)
+    assert np.array_equal(again, data)
+    assert cache_path(4500, seed=3, cache_dir=cache_dir) != path
+
+
+def test_generation_without_numpy(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_generation, 'np', None)
+    data = generate_data(3000, seed=4)
+    assert data.typecode == 'q'
+    assert list(data) == list(generate_data(3000, seed=4))
+    assert 1 <= min(data) and max(data) <= 1000
+    cached = cached_data(3000, seed=4, cache_dir=str(tmp_path))
+    assert list(cached) == list(data)
+    with pytest.raises(ValueError):
+        generate_data(10, dtype='float64')
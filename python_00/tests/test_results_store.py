@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+import results_store
+from benchmark import BenchmarkResult
+from results_store import (append_run, compare_runs, find_run, load_runs,
+                           mann_whitney_greater)
+
+
+def samples(median, count=30, seed=0):
+    """Замеры около median с разбросом около 2%."""
+    rng = random.Random(seed)
+    return [median * rng.uniform(0.98, 1.02) for _ in range(count)]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    commits = iter(['a' * 40, 'b' * 40, 'c' * 40])
+    monkeypatch.setattr(results_store, 'current_git_commit',
+                        lambda: next(commits))
+    return str(tmp_path / 'runs.jsonl')
+
+
+def test_store_round_trip(store):
+    assert load_runs(store) == []
+    first = append_run([BenchmarkResult('sum_array', 100, samples(1.0))],
+                       store, meta={'note': 'base'})
+    second = append_run([BenchmarkResult('sum_array', 100, samples(1.0, seed=1))],
+                        store)
+    runs = load_runs(store)
+    assert runs == [first, second], (
+        'Хранилище должно возвращать запуски в порядке добавления.'
+    )
+    assert runs[0]['meta'] == {'note': 'base'}
+    assert runs[0]['fingerprint'] == runs[1]['fingerprint']
+    restored = BenchmarkResult.from_dict(runs[0]['results'][0])
+    assert restored.samples_ms == first['results'][0]['samples_ms']
+
+
+def test_find_run(store):
+    for _ in range(3):
+        append_run([], store)
+    runs = load_runs(store)
+    assert find_run(runs, '-1') is runs[2]
+    assert find_run(runs, '0') is runs[0]
+    assert find_run(runs, 'bbbb') is runs[1]
+    assert find_run(runs, runs[2]['run_id']) is runs[2]
+    with pytest.raises(ValueError):
+        find_run(runs, 'deadbeef')
+
+
+def test_mann_whitney_greater():
+    assert mann_whitney_greater([4, 5, 6], [1, 2, 3]) == pytest.approx(
+        0.0404, abs=1e-4
+    )
+    assert mann_whitney_greater(samples(1.2), samples(1.0, seed=1)) < 1e-6
+    assert mann_whitney_greater(samples(1.0), samples(1.2, seed=1)) > 0.99
+    assert mann_whitney_greater([1.0] * 10, [1.0] * 10) == 1.0, (
+        'Одинаковые замеры не дают значимого отличия.'
+    )
+    assert mann_whitney_greater([], [1.0]) == 1.0
+
+
+def run_with(median, seed):
+    return {'run_id': str(seed), 'commit': 'x', 'fingerprint': 'f',
+            'python': '3', 'results': [
+                BenchmarkResult('sum_array', 1000,
+                                samples(median, seed=seed)).to_dict()
+            ]}
+
+
+@pytest.mark.parametrize('new_median, slowdown', [
+    (1.2, True),    # Значимое замедление на 20%
+    (1.0, False),   # Те же замеры
+    (1.03, False),  # Значимо, но меньше порога 5%
+    (0.8, False),   # Ускорение
+])
+def test_compare_runs_detects_regression(new_median, slowdown):
+    rows = compare_runs(run_with(1.0, seed=0), run_with(new_median, seed=1))
+    assert len(rows) == 1
+    assert rows[0]['slowdown'] is slowdown
+    assert rows[0]['change'] == pytest.approx(new_median - 1, abs=0.02)
+
+
+def test_cli_exit_code(store, capsys):
+    append_run([BenchmarkResult('sum_array', 100, samples(1.0))], store)
+    append_run([BenchmarkResult('sum_array', 100, samples(1.5, seed=1))],
+               store)
+    assert results_store.main(['--store', store, 'compare', '-2', '-1']) == 1
+    assert 'ЗАМЕДЛЕНИЕ' in capsys.readouterr().out
+    assert results_store.main(['--store', store, 'compare', '-1', '-2']) == 0
+    assert results_store.main(['--store', store, 'compare', '0', 'zzz']) == 2
@@ -0,0 +1,226 @@
+import subprocess
+import sys
+from array import array
+
+import pytest
+
+import sum_analysis
+from conftest import BASE_DIR
+
+# Модули, которые не должны загружаться при import sum_analysis
+HEAVY_MODULES = ('matplotlib', 'numpy', 'benchmark', 'complexity',
+                 'data_generation', 'results_store')
+
+
+def test_import_does_not_load_heavy_modules():
+    code = ('import sys, sum_analysis\n'
+            f'print(*[name for name in {HEAVY_MODULES!r} '
+            'if name in sys.modules])')
+    completed = subprocess.run([sys.executable, '-c', code], cwd=BASE_DIR,
+                               capture_output=True, text=True, check=True)
+    assert completed.stdout.split() == [], (
+        'import sum_analysis не должен загружать '
+        f'{completed.stdout.strip()}.'
+    )
+
+
+def test_measure_import_cost_sees_matplotlib():
+    pytest.importorskip('matplotlib')
+    lazy = sum_analysis.measure_import_cost()
+    eager = sum_analysis.measure_import_cost(
+        'import sum_analysis\nsum_analysis._load_pyplot()'
+    )
+    assert lazy['import_ms'] > 0 and lazy['modules'] > 0
+    assert eager['modules'] > lazy['modules'] + 50, (
+        'Загрузка matplotlib должна быть видна в -X importtime.'
+    )
+    assert eager['import_ms'] > lazy['import_ms']
+    if lazy['max_rss_mb'] is not None:
+        assert eager['max_rss_mb'] > lazy['max_rss_mb'], (
+            'matplotlib должен увеличивать пиковую память процесса.'
+        )
+
+
+def test_fsum_backend_keeps_fractions():
+    data = [1.5, 2]
+    assert sum_analysis.sum_array(data, 'fsum') == 3.5, (
+        'fsum не должен усекать дробную сумму.'
+    )
+    assert (sum_analysis.sum_array(data, 'fsum')
+            == sum_analysis.sum_array(data, 'builtin'))
+    assert sum_analysis.sum_array([0.1] * 10, 'fsum') == 1.0
+    result = sum_analysis.sum_array([1, 2, 3], 'fsum')
+    assert result == 6 and type(result) is int
+
+
+@pytest.mark.parametrize('echo', [False, True])
+def test_read_numbers_keeps_numbers_before_bad_line(tmp_path, capsys, echo):
+    path = tmp_path / 'numbers.txt'
+    path.write_text('1\n2\nx\n4\n')
+    assert sum_analysis.read_numbers_from_file(str(path), echo=echo) == [1, 2], (
+        'Числа до некорректной строки должны сохраняться.'
+    )
+    assert 'некорректные данные' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('container', ['array', 'numpy'])
+def test_int64_overflow_is_value_error(tmp_path, container):
+    pytest.importorskip('numpy')
+    path = tmp_path / 'numbers.txt'
+    path.write_text(f'1\n{2 ** 63 - 1}\n{2 ** 63}\n')
+    with pytest.raises(sum_analysis.NumberParseError) as error:
+        list(sum_analysis.iter_number_chunks(str(path), container=container))
+    assert isinstance(error.value, ValueError)
+    assert error.value.parsed == [1, 2 ** 63 - 1]
+    assert list(sum_analysis.iter_numbers(str(path))) == [1, 2 ** 63 - 1,
+                                                          2 ** 63], (
+        'Списки int не ограничены int64.'
+    )
+
+
+NUMBERS = [12345, -7, 0, 987654321, 42, -2 ** 63, 2 ** 63 - 1, 5]
+
+
+def write_numbers(path, numbers, end='\n'):
+    path.write_text('\n'.join(map(str, numbers)) + end)
+    return str(path)
+
+
+@pytest.mark.parametrize('chunk_bytes', [1, 3, 7, 64])
+def test_chunks_split_numbers_across_boundaries(tmp_path, chunk_bytes):
+    path = write_numbers(tmp_path / 'numbers.txt', NUMBERS)
+    chunks = list(sum_analysis.iter_number_chunks(path, chunk_bytes))
+    assert [number for chunk in chunks for number in chunk] == NUMBERS, (
+        'Числа на границе кусков не должны разрываться.'
+    )
+    if chunk_bytes == 7:
+        assert len(chunks) > 1
+
+
+def test_line_longer_than_chunk(tmp_path):
+    long_number = int('9' * 200)
+    path = write_numbers(tmp_path / 'numbers.txt', [1, long_number, 2])
+    assert list(sum_analysis.iter_numbers(path, chunk_bytes=16)) == [
+        1, long_number, 2
+    ]
+
+
+@pytest.mark.parametrize('chunk_bytes', [4, 1024])
+def test_file_without_trailing_newline(tmp_path, chunk_bytes):
+    path = write_numbers(tmp_path / 'numbers.txt', NUMBERS, end='')
+    assert list(sum_analysis.iter_numbers(path, chunk_bytes)) == NUMBERS
+
+
+@pytest.mark.parametrize('container', ['list', 'array', 'numpy'])
+def test_stream_sum_for_each_container(tmp_path, container):
+    if container == 'numpy':
+        pytest.importorskip('numpy')
+    path = write_numbers(tmp_path / 'numbers.txt', NUMBERS * 50, end='')
+    stats = sum_analysis.stream_sum(path, chunk_bytes=64, container=container)
+    assert stats.total == sum(NUMBERS) * 50
+    assert type(stats.total) is int
+    assert stats.count == len(NUMBERS) * 50
+    assert stats.n_bytes == (tmp_path / 'numbers.txt').stat().st_size
+    assert stats.mb_per_s >= 0 and stats.numbers_per_s >= 0
+    assert f'чисел={stats.count}' in str(stats)
+
+
+INT64_EDGES = [0, 1, -1, -123456789, 2 ** 63 - 1, -2 ** 63, 2 ** 62, 7]
+
+
+def test_binary_round_trip(tmp_path):
+    text = write_numbers(tmp_path / 'numbers.txt', INT64_EDGES)
+    binary = str(tmp_path / 'numbers.bin')
+    count = sum_analysis.convert_text_to_binary(text, binary, chunk_bytes=8)
+    assert count == len(INT64_EDGES)
+    assert (tmp_path / 'numbers.bin').stat().st_size == 8 * count
+    view = sum_analysis.load_binary_numbers(binary)
+    assert isinstance(view, memoryview) and view.format == 'q'
+    back = write_numbers(tmp_path / 'back.txt', list(view))
+    assert list(sum_analysis.iter_numbers(back)) == INT64_EDGES, (
+        'Текст -> двоичный файл -> текст должен сохранять числа.'
+    )
+
+
+def test_binary_as_numpy(tmp_path):
+    np = pytest.importorskip('numpy')
+    text = write_numbers(tmp_path / 'numbers.txt', INT64_EDGES)
+    binary = str(tmp_path / 'numbers.bin')
+    sum_analysis.convert_text_to_binary(text, binary)
+    data = sum_analysis.load_binary_numbers(binary, as_numpy=True)
+    assert data.dtype == np.dtype('<i8')
+    assert data.tolist() == INT64_EDGES
+
+
+def test_binary_empty_file(tmp_path):
+    text = str(tmp_path / 'empty.txt')
+    open(text, 'w').close()
+    binary = str(tmp_path / 'empty.bin')
+    assert sum_analysis.convert_text_to_binary(text, binary) == 0
+    assert len(sum_analysis.load_binary_numbers(binary)) == 0
+    if sum_analysis._numpy() is not None:
+        assert len(sum_analysis.load_binary_numbers(binary, as_numpy=True)) == 0
+
+
+def test_binary_size_must_be_multiple_of_8(tmp_path):
+    path = tmp_path / 'broken.bin'
+    path.write_bytes(b'\x00' * 12)
+    with pytest.raises(ValueError):
+        sum_analysis.load_binary_numbers(str(path))
+
+
+@pytest.mark.parametrize('as_numpy', [False, True])
+def test_sum_and_measure_accept_binary_buffers(tmp_path, as_numpy):
+    if as_numpy:
+        pytest.importorskip('numpy')
+    numbers = list(range(-500, 1500)) + [2 ** 63 - 1, 2 ** 63 - 1]
+    text = write_numbers(tmp_path / 'numbers.txt', numbers)
+    binary = str(tmp_path / 'numbers.bin')
+    sum_analysis.convert_text_to_binary(text, binary)
+    data = sum_analysis.load_binary_numbers(binary, as_numpy=as_numpy)
+    for backend in ('loop', 'builtin', 'fsum', 'numpy', 'auto'):
+        assert sum_analysis.sum_array(data, backend) == sum(numbers), (
+            f'sum_array(..., {backend!r}) должен принимать буфер напрямую.'
+        )
+    assert sum_analysis.measure_time(sum_analysis.sum_array, data) > 0
+
+
+@pytest.mark.parametrize('dtype, values', [
+    ('<i8', [2 ** 63 - 1] * 5 + [-2 ** 63] * 2 + [12345]),
+    ('>i8', [2 ** 63 - 1] * 5 + [-2 ** 63] * 2 + [12345]),
+    ('<u8', [2 ** 64 - 1] * 5 + [1]),
+    ('>u8', [2 ** 64 - 1] * 5 + [1]),
+])
+def test_numpy_sums_are_exact(dtype, values):
+    np = pytest.importorskip('numpy')
+    data = np.array(values, dtype=dtype)
+    expected = sum(values)
+    results = sum_analysis.verify_sum_backends(data)
+    assert set(results.values()) == {expected}, (
+        f'Сумма {dtype} должна быть точной во всех способах.'
+    )
+    assert sum_analysis.sum_array(data, 'numpy') == expected
+
+
+def test_parallel_sum_with_two_workers():
+    np = pytest.importorskip('numpy')
+    size = 2 * sum_analysis.NUMPY_SUM_BLOCK + 12345
+    data = np.full(size, 2 ** 63 - 1, dtype='>i8')
+    data[::3] = -2 ** 63
+    expected = (2 ** 63 - 1) * (size - len(data[::3])) - 2 ** 63 * len(data[::3])
+    assert sum_analysis._sum_parallel(data, workers=2) == expected
+
+
+def test_verify_sum_backends_detects_mismatch(monkeypatch):
+    monkeypatch.setitem(sum_analysis.SUM_BACKENDS, 'builtin',
+                        lambda arr: sum(arr) + 1)
+    with pytest.raises(ValueError, match='builtin'):
+        sum_analysis.verify_sum_backends([1, 2, 3])
+
+
+def test_choose_sum_backend():
+    np = pytest.importorskip('numpy')
+    assert sum_analysis.choose_sum_backend([1, 2, 3]) == 'builtin'
+    assert sum_analysis.choose_sum_backend(array('q', [1, 2, 3])) == 'numpy'
+    assert sum_analysis.choose_sum_backend(np.array([1.5, 2.0])) == 'builtin'
+    assert sum_analysis.choose_sum_backend(np.arange(10)) == 'numpy'
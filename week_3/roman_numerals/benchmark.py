@@ -0,0 +1,485 @@
+"""
+Проверка и замеры скорости преобразований римских чисел.
+
+Сначала все числа 1..3999 сверяются с прежним алгоритмом (перебор
+значений с конкатенацией строк и посимвольный разбор), затем замеряется
+скорость на всём диапазоне. Скрипт завершается с ошибкой, если проверка
+не прошла.
+
+Запуск: python benchmark.py [имя_замера ...]
+"""
+import argparse
+import io
+import random
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List
+
+import bulk
+import roman
+from roman import (MAX_EXTENDED_ROMAN, MAX_ROMAN, VINCULUM, Roman, parse_extended, parse_strict,
+                   write_roman)
+
+
+def legacy_int_to_roman(num: int) -> str:
+    """
+    Прежний алгоритм Roman.int_to_roman (эталон для проверки).
+
+    Параметры:
+        num (int): Целое число от 1 до 3999.
+
+    Возвращает:
+        str: Римское число в виде строки.
+    """
+    val = [1000, 900, 500, 400, 100, 90, 50, 40, 10, 9, 5, 4, 1]
+    syms = ["M", "CM", "D", "CD", "C", "XC", "L", "XL", "X", "IX", "V", "IV", "I"]
+    roman_num = ''
+    i = 0
+    while num > 0:
+        for _ in range(num // val[i]):
+            roman_num += syms[i]
+            num -= val[i]
+        i += 1
+    return roman_num
+
+
+def legacy_roman_to_int(s: str) -> int:
+    """
+    Прежний алгоритм Roman.roman_to_int (эталон для проверки).
+
+    Параметры:
+        s (str): Римское число в виде строки.
+
+    Возвращает:
+        int: Целое число.
+    """
+    roman_dict = {'I': 1, 'V': 5, 'X': 10, 'L': 50, 'C': 100, 'D': 500, 'M': 1000}
+    total = 0
+    prev_value = 0
+    for char in reversed(s):
+        value = roman_dict[char]
+        total = total - value if value < prev_value else total + value
+        prev_value = value
+    return total
+
+
+def reference_extended(num: int) -> str:
+    """
+    Расширенная запись по определению, сложением строк (эталон для проверки).
+
+    Параметры:
+        num (int): Целое число от 1 до MAX_EXTENDED_ROMAN.
+
+    Возвращает:
+        str: Старшая часть num // 1000 с чертой над каждым символом и
+            младшие три разряда без черты (числа до 3999 - как обычно).
+    """
+    if num <= MAX_ROMAN:
+        return legacy_int_to_roman(num)
+    result = ''
+    for char in reference_extended(num // 1000):
+        result += char
+        if char != VINCULUM:
+            result += VINCULUM
+    return result + legacy_int_to_roman(num % 1000)
+
+
+class LegacyRoman:
+    """Прежний объект Roman: значение в __dict__, строка вычисляется каждый раз."""
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def __add__(self, other: 'LegacyRoman') -> 'LegacyRoman':
+        return LegacyRoman(self.value + other.value)
+
+    def __str__(self) -> str:
+        return Roman.int_to_roman(self.value)
+
+
+def check_round_trip() -> List[str]:
+    """
+    Сверяет оба направления преобразования с прежним алгоритмом.
+
+    Проверяются все числа 1..3999, а также неканонические записи
+    (например, "IIII"), которые прежний разбор принимал.
+
+    Возвращает:
+        List[str]: Описания расхождений (пустой список - всё совпадает).
+    """
+    errors = []
+    for n in range(1, MAX_ROMAN + 1):
+        numeral = Roman.int_to_roman(n)
+        if numeral != legacy_int_to_roman(n):
+            errors.append(f'int_to_roman({n}) = {numeral!r}, ожидалось {legacy_int_to_roman(n)!r}')
+        if Roman.roman_to_int(numeral) != n:
+            errors.append(f'roman_to_int({numeral!r}) = {Roman.roman_to_int(numeral)}, ожидалось {n}')
+    for numeral in ('IIII', 'VX', 'IM', 'MMMM', 'XIIX', 'IVI', ''):
+        if Roman.roman_to_int(numeral) != legacy_roman_to_int(numeral):
+            errors.append(f'roman_to_int({numeral!r}) отличается от прежнего разбора')
+    return errors
+
+
+def check_bulk() -> List[str]:
+    """
+    Сверяет пакетные функции bulk с поштучным преобразованием Roman.
+
+    Возвращает:
+        List[str]: Описания расхождений (пустой список - всё совпадает).
+    """
+    errors = []
+    numbers = list(range(1, MAX_ROMAN + 1))
+    numerals = [Roman.int_to_roman(n) for n in numbers]
+    if bulk.to_roman_many(numbers, workers=2, chunk_size=500) != (numerals, []):
+        errors.append('to_roman_many отличается от int_to_roman')
+    if bulk.from_roman_many(numerals) != (numbers, []):
+        errors.append('from_roman_many отличается от roman_to_int')
+    mixed = [5, 0, 'x', 4000, '12', 3.7, True, 2.0, None, ' 7 ', '3.0']
+    numerals_mixed, mixed_errors = bulk.to_roman_many(mixed)
+    rows = [error.row for error in mixed_errors]
+    if rows != [1, 2, 3, 5, 6, 7, 8, 10]:
+        errors.append(f'to_roman_many: ошибки в строках {rows}, ожидались [1, 2, 3, 5, 6, 7, 8, 10]')
+    if [numerals_mixed[row] for row in (0, 4, 9)] != ['V', 'XII', 'VII']:
+        errors.append('to_roman_many неверно преобразует целые числа и их строковую запись')
+    try:
+        import numpy as np
+    except ImportError:
+        return errors
+    scalars, scalar_errors = bulk.to_roman_many([np.int64(9), np.uint16(40), np.float64(3.0), np.bool_(True)])
+    if scalars != ['IX', 'XL', None, None] or [error.row for error in scalar_errors] != [2, 3]:
+        errors.append('to_roman_many неверно обрабатывает скаляры NumPy')
+    array, array_errors = bulk.to_roman_array(np.array(numbers))
+    if array.tolist() != numerals or array_errors:
+        errors.append('to_roman_array отличается от int_to_roman')
+    values, array_errors = bulk.from_roman_array(np.array(numerals + ['IIII', 'Q']))
+    if values.tolist() != numbers + [4, 0] or [e.row for e in array_errors] != [MAX_ROMAN + 1]:
+        errors.append('from_roman_array отличается от roman_to_int')
+    return errors
+
+
+def check_strict() -> List[str]:
+    """
+    Проверяет, что строгий разбор принимает ровно канонические записи.
+
+    Автомат обходится целиком: множество принимаемых им строк должно
+    совпасть с записями int_to_roman, а значения - с числами. Кроме того,
+    случайные строки из римских символов сверяются с определением
+    «каноническая запись - та, что получается обратным преобразованием».
+
+    Возвращает:
+        List[str]: Описания расхождений (пустой список - всё совпадает).
+    """
+    errors = []
+    parser = roman._build_parser()
+    accepted = {}
+    stack = [(0, '', 0)]
+    while stack:
+        state, text, value = stack.pop()
+        if text:
+            accepted[text] = value
+        for char, (target, step) in parser[state].items():
+            stack.append((target, text + char, value + step))
+    expected = {Roman.int_to_roman(n): n for n in range(1, MAX_ROMAN + 1)}
+    if accepted != expected:
+        errors.append(f'Автомат принимает {len(accepted)} строк, ожидалось {len(expected)}')
+    rng = random.Random(0)
+    for _ in range(20_000):
+        text = ''.join(rng.choice('IVXLCDM') for _ in range(rng.randint(1, 8)))
+        canonical = text in expected
+        try:
+            strict_ok = parse_strict(text) == expected.get(text)
+        except ValueError:
+            strict_ok = False
+        if strict_ok != canonical:
+            errors.append(f'parse_strict({text!r}) ошибается')
+    for text, position in (('IIII', 3), ('VX', 1), ('IM', 1), ('MMMCMXCIXI', 9), ('XQ', 1), ('', 0)):
+        try:
+            parse_strict(text)
+            errors.append(f'parse_strict({text!r}) не отклонил строку')
+        except roman.RomanParseError as error:
+            if error.position != position:
+                errors.append(f'parse_strict({text!r}): позиция {error.position}, ожидалась {position}')
+    return errors
+
+
+def check_extended() -> List[str]:
+    """
+    Сверяет расширенную запись с определением и разбор с записью.
+
+    Проверяются все числа 1..3999, границы уровней черт и случайные числа
+    до MAX_EXTENDED_ROMAN; случайные строки с чертами должны либо
+    отклоняться, либо совпадать с записью разобранного числа.
+
+    Возвращает:
+        List[str]: Описания расхождений (пустой список - всё совпадает).
+    """
+    errors = []
+    rng = random.Random(3)
+    numbers = list(range(1, MAX_ROMAN + 1)) + [rng.randint(MAX_ROMAN + 1, MAX_EXTENDED_ROMAN) for _ in range(20_000)]
+    numbers += [n + d for n in (4000, 1_000_000, 4_000_000, 10 ** 9) for d in (-1, 0, 1)] + [MAX_EXTENDED_ROMAN]
+    for n in numbers:
+        numeral = Roman.int_to_roman(n, extended=True)
+        if numeral != reference_extended(n):
+            errors.append(f'int_to_roman({n}, extended=True) = {numeral!r}, ожидалось {reference_extended(n)!r}')
+        elif parse_extended(numeral) != n or Roman.roman_to_int(numeral) != n:
+            errors.append(f'parse_extended({numeral!r}) не равно {n}')
+    for n in (0, MAX_EXTENDED_ROMAN + 1):
+        try:
+            Roman.int_to_roman(n, extended=True)
+            errors.append(f'int_to_roman({n}, extended=True) не отклонил число')
+        except ValueError:
+            pass
+    for _ in range(20_000):
+        text = ''.join(rng.choice('IVXLCDM') + VINCULUM * rng.choice((0, 0, 1, 2)) for _ in range(rng.randint(1, 8)))
+        try:
+            value = parse_extended(text)
+        except ValueError:
+            continue
+        if Roman.int_to_roman(value, extended=True) != text:
+            errors.append(f'parse_extended({text!r}) принял неканоническую запись')
+    return errors
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Возвращает лучшее время одного вызова func в секундах.
+
+    Параметры:
+        func (Callable[[], object]): Замеряемая функция.
+        repeat (int): Количество повторений замера.
+
+    Возвращает:
+        float: Время вызова в секундах.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def bench_int_to_roman() -> Dict[str, float]:
+    """Замеряет int_to_roman на всём диапазоне: новая таблица и прежний алгоритм."""
+    numbers = range(1, MAX_ROMAN + 1)
+    table = measure(lambda: [Roman.int_to_roman(n) for n in numbers])
+    legacy = measure(lambda: [legacy_int_to_roman(n) for n in numbers])
+    return {
+        'table_ns': table / len(numbers) * 1e9,
+        'legacy_ns': legacy / len(numbers) * 1e9,
+        'speedup': legacy / table,
+    }
+
+
+def bench_roman_to_int() -> Dict[str, float]:
+    """Замеряет roman_to_int на всём диапазоне: новая таблица и прежний разбор."""
+    numerals = [Roman.int_to_roman(n) for n in range(1, MAX_ROMAN + 1)]
+    table = measure(lambda: [Roman.roman_to_int(s) for s in numerals])
+    legacy = measure(lambda: [legacy_roman_to_int(s) for s in numerals])
+    return {
+        'table_ns': table / len(numerals) * 1e9,
+        'legacy_ns': legacy / len(numerals) * 1e9,
+        'speedup': legacy / table,
+    }
+
+
+def bench_bulk(size: int = 1_000_000) -> Dict[str, float]:
+    """
+    Сравнивает поштучное и пакетное преобразование столбца чисел.
+
+    Параметры:
+        size (int): Количество значений.
+
+    Возвращает:
+        Dict[str, float]: Миллионов значений в секунду для каждого способа.
+    """
+    rng = random.Random(0)
+    numbers = [rng.randint(1, MAX_ROMAN) for _ in range(size)]
+    numerals = [Roman.int_to_roman(n) for n in numbers]
+    ways = {
+        'objects_to': lambda: [str(Roman(n)) for n in numbers],
+        'many_to': lambda: bulk.to_roman_many(numbers),
+        'objects_from': lambda: [Roman(s).value for s in numerals],
+        'many_from': lambda: bulk.from_roman_many(numerals),
+    }
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None:
+        number_array = np.array(numbers)
+        numeral_array = np.array(numerals)
+        ways['array_to'] = lambda: bulk.to_roman_array(number_array)
+        ways['array_from'] = lambda: bulk.from_roman_array(numeral_array)
+    return {
+        f'{name}_mps': size / min(timeit.repeat(func, number=1, repeat=3)) / 1e6
+        for name, func in ways.items()
+    }
+
+
+def bench_strict() -> Dict[str, float]:
+    """
+    Сравнивает нестрогий и строгий разбор на правильных и ошибочных строках.
+
+    Проверка через обратное преобразование (roman_to_int, затем сравнение
+    с int_to_roman) - прежний способ строгой проверки. Ошибочные строки:
+    случайные неканонические записи и длинные строки из одинаковых
+    символов, которые строгий разбор отклоняет на четвёртом символе.
+
+    Возвращает:
+        Dict[str, float]: Время разбора одной строки в наносекундах.
+    """
+    valid = [Roman.int_to_roman(n) for n in range(1, MAX_ROMAN + 1)]
+    rng = random.Random(1)
+    canonical = set(valid)
+    invalid = []
+    while len(invalid) < 2000:
+        text = ''.join(rng.choice('IVXLCDM') for _ in range(rng.randint(2, 15)))
+        if text not in canonical:
+            invalid.append(text)
+    long_invalid = ['I' * 10_000, 'M' * 10_000, 'X' * 5_000 + 'Q']
+
+    def lenient(texts: List[str]) -> None:
+        for text in texts:
+            try:
+                Roman.roman_to_int(text)
+            except ValueError:
+                pass
+
+    def round_trip(texts: List[str]) -> None:
+        for text in texts:
+            try:
+                Roman.int_to_roman(Roman.roman_to_int(text)) == text
+            except ValueError:
+                pass
+
+    def strict(texts: List[str]) -> None:
+        for text in texts:
+            try:
+                Roman.roman_to_int(text, strict=True)
+            except ValueError:
+                pass
+
+    def dfa_only(texts: List[str]) -> None:
+        for text in texts:
+            try:
+                parse_strict(text)
+            except ValueError:
+                pass
+
+    result = {}
+    for data_name, texts in (('valid', valid), ('invalid', invalid), ('long', long_invalid)):
+        for name, func in (('lenient', lenient), ('round_trip', round_trip), ('strict', strict),
+                           ('dfa', dfa_only)):
+            result[f'{name}_{data_name}_ns'] = measure(lambda: func(texts), repeat=3) / len(texts) * 1e9
+    return result
+
+
+def bench_value_type(count: int = 100_000) -> Dict[str, float]:
+    """
+    Сравнивает память и скорость операций Roman и прежнего объекта с __dict__.
+
+    Память замеряется tracemalloc для count объектов с различными значениями
+    вне 1..3999 (они не интернируются) и для count объектов из 1..3999.
+
+    Параметры:
+        count (int): Количество объектов.
+
+    Возвращает:
+        Dict[str, float]: Байт на объект и миллионов операций в секунду.
+    """
+    result = {}
+    for name, cls in (('roman', Roman), ('legacy', LegacyRoman)):
+        for range_name, values in (('large', range(MAX_ROMAN + 1, MAX_ROMAN + 1 + count)),
+                                   ('small', [n % MAX_ROMAN + 1 for n in range(count)])):
+            tracemalloc.start()
+            objects = [cls(n) for n in values]
+            size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del objects
+            result[f'{name}_{range_name}_bytes'] = size / count
+
+    rng = random.Random(2)
+    pairs = [(rng.randint(1, 1999), rng.randint(1, 2000)) for _ in range(1000)]
+    for name, cls in (('roman', Roman), ('legacy', LegacyRoman)):
+        objects = [(cls(a), cls(b)) for a, b in pairs]
+        add = measure(lambda: [a + b for a, b in objects]) / len(objects)
+        text = measure(lambda: [str(a) for a, _ in objects]) / len(objects)
+        result[f'{name}_add_mops'] = 1e-6 / add
+        result[f'{name}_str_mops'] = 1e-6 / text
+    romans = [Roman(a) for a, _ in pairs]
+    result['roman_sum_mops'] = 1e-6 * len(romans) / measure(lambda: sum(romans))
+    result['roman_sorted_mops'] = 1e-6 * len(romans) / measure(lambda: sorted(romans))
+    result['roman_dict_mops'] = 1e-6 * len(romans) / measure(lambda: {r: None for r in romans})
+    return result
+
+
+def bench_extended(size: int = 100_000) -> Dict[str, float]:
+    """
+    Замеряет расширенную запись и обычный диапазон 1..3999 рядом с ней.
+
+    Запись в поток (write_roman в общий io.StringIO) сравнивается с
+    int_to_roman(extended=True) и записью по определению сложением строк.
+    Замер fast_ns - int_to_roman для 1..3999, его можно сравнить с
+    table_ns замера int_to_roman.
+
+    Параметры:
+        size (int): Количество случайных чисел до MAX_EXTENDED_ROMAN.
+
+    Возвращает:
+        Dict[str, float]: Время на одно число в наносекундах.
+    """
+    rng = random.Random(4)
+    numbers = [rng.randint(MAX_ROMAN + 1, MAX_EXTENDED_ROMAN) for _ in range(size)]
+    numerals = [Roman.int_to_roman(n, extended=True) for n in numbers]
+    small = range(1, MAX_ROMAN + 1)
+
+    def stream() -> str:
+        out = io.StringIO()
+        for n in numbers:
+            write_roman(n, out)
+            out.write('\n')
+        return out.getvalue()
+
+    ways = {
+        'stream': stream,
+        'strings': lambda: [Roman.int_to_roman(n, extended=True) for n in numbers],
+        'reference': lambda: [reference_extended(n) for n in numbers],
+        'parse': lambda: [parse_extended(s) for s in numerals],
+    }
+    result = {f'{name}_ns': min(timeit.repeat(func, number=1, repeat=3)) / size * 1e9 for name, func in ways.items()}
+    result['fast_ns'] = measure(lambda: [Roman.int_to_roman(n) for n in small]) / len(small) * 1e9
+    result['fast_extended_ns'] = measure(lambda: [Roman.int_to_roman(n, extended=True) for n in small]) / len(small) * 1e9
+    return result
+
+
+BENCHMARKS: Dict[str, Callable[[], Dict[str, float]]] = {
+    'int_to_roman': bench_int_to_roman,
+    'roman_to_int': bench_roman_to_int,
+    'bulk': bench_bulk,
+    'strict': bench_strict,
+    'value_type': bench_value_type,
+    'extended': bench_extended,
+}
+
+
+def main() -> None:
+    """Проверяет преобразования и выполняет выбранные замеры."""
+    parser = argparse.ArgumentParser(description='Замеры римских чисел.')
+    parser.add_argument('names', nargs='*', help=f'Имена замеров: {", ".join(BENCHMARKS)} (по умолчанию все).')
+    args = parser.parse_args()
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f'неизвестные замеры: {", ".join(sorted(unknown))}')
+
+    errors = check_round_trip() + check_bulk() + check_strict() + check_extended()
+    if errors:
+        print('\n'.join(errors))
+        sys.exit(1)
+    print(f'Проверка: все числа 1..{MAX_ROMAN} совпадают с прежним алгоритмом, пакетные функции - с поштучными, '
+          'строгий разбор принимает ровно канонические записи, расширенная запись совпадает с определением.')
+    for name in args.names or BENCHMARKS:
+        result = BENCHMARKS[name]()
+        print(f'{name}: ' + ', '.join(f'{key}={value:,.1f}' for key, value in result.items()))
+
+
+if __name__ == '__main__':
+    main()
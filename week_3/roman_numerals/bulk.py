@@ -0,0 +1,365 @@
+"""
+Пакетное преобразование римских чисел для больших наборов данных.
+
+Функции работают поверх таблиц roman.numeral_tables(), не создавая объект
+Roman на каждое значение: списки и итераторы, массивы NumPy, текстовые
+файлы построчно и, для очень больших данных, пул процессов. Ошибочные
+строки не прерывают преобразование: на их месте стоит пустое значение,
+а описание ошибки попадает в список RowError.
+
+Запуск: python bulk.py входной.txt выходной.txt [--from-roman [--strict]] [--workers 4]
+"""
+import argparse
+import operator
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice, repeat
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+
+from roman import MAX_NUMERAL_LENGTH, MAX_ROMAN, Roman, numeral_tables
+
+# Сколько значений обрабатывается за раз (и отправляется процессу пула):
+CHUNK_SIZE = 10_000
+
+# Таблица чисел для NumPy: строится при первом вызове to_roman_array.
+_NUMPY_TABLE: Any = None
+
+
+class RowError(NamedTuple):
+    """
+    Ошибка преобразования одной строки данных.
+
+    Атрибуты:
+        row (int): Номер строки (индекс в данных, в файле - номер строки с 1).
+        value (Any): Исходное значение.
+        message (str): Описание ошибки.
+    """
+
+    row: int
+    value: Any
+    message: str
+
+
+Converted = tuple[list[Any], list[RowError]]
+
+
+def _to_roman_chunk(values: list[Any], start: int = 0) -> Converted:
+    """
+    Преобразует часть данных в римские числа.
+
+    Параметры:
+        values (list[Any]): Целые числа (int, целые скаляры NumPy) или их
+            строковая запись. bool, float и прочие значения - ошибки строк.
+        start (int): Номер первой строки части.
+
+    Возвращает:
+        Converted: Римские числа (None для ошибочных строк) и ошибки.
+    """
+    numerals = numeral_tables()[0]
+    results: list[str | None] = []
+    errors = []
+    for row, value in enumerate(values, start):
+        number = value
+        if type(number) is not int:
+            try:
+                if isinstance(value, bool):
+                    raise TypeError(value)
+                # Строка - запись целого числа; иначе - целый тип с __index__
+                # (например, np.int64), но не float: 3.7 не округляется до 3
+                number = int(value) if isinstance(value, str) else operator.index(value)
+            except (TypeError, ValueError):
+                results.append(None)
+                errors.append(RowError(row, value, f'Не целое число: {value!r}'))
+                continue
+        if 1 <= number <= MAX_ROMAN:
+            results.append(numerals[number])
+        else:
+            results.append(None)
+            errors.append(RowError(row, value, f'Число {number} вне диапазона 1..{MAX_ROMAN}'))
+    return results, errors
+
+
+def _from_roman_chunk(values: list[Any], start: int = 0, strict: bool = False) -> Converted:
+    """
+    Преобразует часть данных из римских чисел в целые.
+
+    Канонические записи берутся из таблицы, остальные разбираются
+    Roman.roman_to_int (нестрого или, при strict, строго).
+
+    Параметры:
+        values (list[Any]): Римские числа в виде строк.
+        start (int): Номер первой строки части.
+        strict (bool): Считать ошибкой неканонические записи.
+
+    Возвращает:
+        Converted: Целые числа (None для ошибочных строк) и ошибки.
+    """
+    lookup = numeral_tables()[1].get
+    results: list[int | None] = []
+    errors = []
+    for row, value in enumerate(values, start):
+        number = lookup(value) if isinstance(value, str) else None
+        if number is None:
+            if not isinstance(value, str) or not value:
+                errors.append(RowError(row, value, f'Не римское число: {value!r}'))
+            else:
+                try:
+                    number = Roman.roman_to_int(value, strict)
+                except ValueError as error:
+                    errors.append(RowError(row, value, str(error)))
+        results.append(number)
+    return results, errors
+
+
+CONVERTERS: dict[str, Callable[[list[Any], int], Converted]] = {
+    'to_roman': _to_roman_chunk,
+    'from_roman': _from_roman_chunk,
+    'from_roman_strict': partial(_from_roman_chunk, strict=True),
+}
+
+
+def _chunks(values: Iterable[Any], chunk_size: int, start: int = 0) -> Iterator[tuple[list[Any], int]]:
+    """
+    Делит данные на части, не читая их целиком.
+
+    Параметры:
+        values (Iterable[Any]): Данные.
+        chunk_size (int): Размер части.
+        start (int): Номер первой строки.
+
+    Возвращает:
+        Iterator[tuple[list[Any], int]]: Части и номера их первых строк.
+    """
+    iterator = iter(values)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk, start
+        start += len(chunk)
+
+
+def _map_chunks(direction: str, chunks: Iterable[tuple[list[Any], int]], workers: int) -> Iterator[Converted]:
+    """
+    Преобразует части по порядку, при workers > 1 - в пуле процессов.
+
+    В пул одновременно отправляется не больше 2 * workers частей, поэтому
+    память не растёт с объёмом данных, даже если они читаются из файла.
+
+    Параметры:
+        direction (str): 'to_roman' или 'from_roman'.
+        chunks (Iterable[tuple[list[Any], int]]): Части данных.
+        workers (int): Количество процессов (1 - без пула).
+
+    Возвращает:
+        Iterator[Converted]: Результаты частей в исходном порядке.
+    """
+    convert = CONVERTERS[direction]
+    if workers <= 1:
+        for chunk, start in chunks:
+            yield convert(chunk, start)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        pending: deque = deque()
+        for chunk, start in chunks:
+            pending.append(pool.submit(convert, chunk, start))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def convert_many(values: Iterable[Any], direction: str = 'to_roman', workers: int = 1,
+                 chunk_size: int = CHUNK_SIZE) -> Converted:
+    """
+    Преобразует набор значений целиком.
+
+    Параметры:
+        values (Iterable[Any]): Числа или римские записи.
+        direction (str): 'to_roman' (числа в римские), 'from_roman' или
+            'from_roman_strict' (только канонические записи).
+        workers (int): Количество процессов (1 - без пула).
+        chunk_size (int): Размер части для пула.
+
+    Возвращает:
+        Converted: Результаты (None для ошибочных строк) и ошибки по строкам.
+
+    Исключения:
+        ValueError: Если направление неизвестно.
+    """
+    if direction not in CONVERTERS:
+        raise ValueError(f'Неизвестное направление преобразования: {direction}')
+    results: list[Any] = []
+    errors: list[RowError] = []
+    for part, part_errors in _map_chunks(direction, _chunks(values, chunk_size), workers):
+        results.extend(part)
+        errors.extend(part_errors)
+    return results, errors
+
+
+def to_roman_many(values: Iterable[Any], workers: int = 1, chunk_size: int = CHUNK_SIZE) -> Converted:
+    """
+    Преобразует числа в римские записи.
+
+    Параметры:
+        values (Iterable[Any]): Целые числа (или строки с ними).
+        workers (int): Количество процессов (1 - без пула).
+        chunk_size (int): Размер части для пула.
+
+    Возвращает:
+        Converted: Римские записи (None для ошибочных строк) и ошибки.
+    """
+    return convert_many(values, 'to_roman', workers, chunk_size)
+
+
+def from_roman_many(values: Iterable[Any], workers: int = 1, chunk_size: int = CHUNK_SIZE,
+                    strict: bool = False) -> Converted:
+    """
+    Преобразует римские записи в числа.
+
+    Параметры:
+        values (Iterable[Any]): Римские числа в виде строк.
+        workers (int): Количество процессов (1 - без пула).
+        chunk_size (int): Размер части для пула.
+        strict (bool): Считать ошибкой неканонические записи ("IIII").
+
+    Возвращает:
+        Converted: Целые числа (None для ошибочных строк) и ошибки.
+    """
+    return convert_many(values, 'from_roman_strict' if strict else 'from_roman', workers, chunk_size)
+
+
+def _numpy_table() -> Any:
+    """Возвращает таблицу римских записей 0..3999 как массив NumPy."""
+    global _NUMPY_TABLE
+    if _NUMPY_TABLE is None:
+        import numpy as np
+
+        _NUMPY_TABLE = np.array(numeral_tables()[0], dtype=f'<U{MAX_NUMERAL_LENGTH}')
+    return _NUMPY_TABLE
+
+
+def to_roman_array(values: Any) -> tuple[Any, list[RowError]]:
+    """
+    Преобразует массив целых чисел NumPy в массив римских записей.
+
+    Записи выбираются из таблицы одной операцией индексирования, без
+    цикла на Python по элементам.
+
+    Параметры:
+        values (Any): Массив целых чисел (или то, что np.asarray превращает в него).
+
+    Возвращает:
+        tuple[Any, list[RowError]]: Массив строк той же формы (пустая строка
+            для ошибочных элементов) и ошибки с номерами элементов в
+            развёрнутом массиве.
+
+    Исключения:
+        TypeError: Если массив не целочисленный.
+    """
+    import numpy as np
+
+    values = np.asarray(values)
+    if not np.issubdtype(values.dtype, np.integer):
+        raise TypeError(f'Ожидался целочисленный массив, получен {values.dtype}')
+    valid = (values >= 1) & (values <= MAX_ROMAN)
+    result = _numpy_table()[np.where(valid, values, 0)]
+    flat = values.ravel()
+    errors = [
+        RowError(int(row), int(flat[row]), f'Число {flat[row]} вне диапазона 1..{MAX_ROMAN}')
+        for row in np.flatnonzero(~valid)
+    ]
+    return result, errors
+
+
+def from_roman_array(numerals: Any, strict: bool = False) -> tuple[Any, list[RowError]]:
+    """
+    Преобразует массив римских записей NumPy в массив чисел.
+
+    Канонические записи ищутся в таблице одним проходом map(dict.get)
+    прямо в np.fromiter, без промежуточного списка результатов. Только
+    не найденные в таблице элементы разбираются поштучно.
+
+    Параметры:
+        numerals (Any): Массив строк (или то, что np.asarray превращает в него).
+        strict (bool): Считать ошибкой неканонические записи ("IIII").
+
+    Возвращает:
+        tuple[Any, list[RowError]]: Массив int64 той же формы (0 для
+            ошибочных элементов) и ошибки с номерами элементов в
+            развёрнутом массиве.
+    """
+    import numpy as np
+
+    numerals = np.asarray(numerals)
+    flat = numerals.ravel().tolist()
+    lookup = numeral_tables()[1].get
+    result = np.fromiter(map(lookup, flat, repeat(0, len(flat))), dtype=np.int64, count=len(flat))
+    errors = []
+    for row in np.flatnonzero(result == 0).tolist():
+        converted, row_errors = _from_roman_chunk([flat[row]], row, strict)
+        result[row] = converted[0] or 0
+        errors.extend(row_errors)
+    return result.reshape(numerals.shape), errors
+
+
+def convert_file(source: str, target: str, direction: str = 'to_roman', workers: int = 1,
+                 chunk_size: int = CHUNK_SIZE) -> list[RowError]:
+    """
+    Преобразует текстовый файл построчно: одно значение в строке.
+
+    Файл читается и записывается частями, поэтому размер файла не
+    ограничен памятью. Ошибочная строка записывается пустой, чтобы номера
+    строк совпадали.
+
+    Параметры:
+        source (str): Входной файл.
+        target (str): Выходной файл.
+        direction (str): 'to_roman' (числа в римские), 'from_roman' или
+            'from_roman_strict' (только канонические записи).
+        workers (int): Количество процессов (1 - без пула).
+        chunk_size (int): Сколько строк обрабатывается за раз.
+
+    Возвращает:
+        list[RowError]: Ошибки с номерами строк (с 1).
+
+    Исключения:
+        ValueError: Если направление неизвестно.
+    """
+    if direction not in CONVERTERS:
+        raise ValueError(f'Неизвестное направление преобразования: {direction}')
+    errors: list[RowError] = []
+    with open(source, encoding='utf-8') as src, open(target, 'w', encoding='utf-8') as dst:
+        lines = (line.strip() for line in src)
+        for part, part_errors in _map_chunks(direction, _chunks(lines, chunk_size, 1), workers):
+            dst.write(''.join('\n' if value is None else f'{value}\n' for value in part))
+            errors.extend(part_errors)
+    return errors
+
+
+def main() -> None:
+    """Командная строка: преобразование файла с выводом ошибок."""
+    parser = argparse.ArgumentParser(description='Пакетное преобразование римских чисел.')
+    parser.add_argument('source', help='Входной файл (одно значение в строке).')
+    parser.add_argument('target', help='Выходной файл.')
+    parser.add_argument('--from-roman', action='store_true', help='Римские записи в числа (по умолчанию наоборот).')
+    parser.add_argument('--strict', action='store_true', help='Только канонические римские записи.')
+    parser.add_argument('--workers', type=int, default=1, help='Количество процессов.')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Строк в одной части.')
+    args = parser.parse_args()
+
+    direction = 'to_roman'
+    if args.from_roman:
+        direction = 'from_roman_strict' if args.strict else 'from_roman'
+    errors = convert_file(args.source, args.target, direction, args.workers, args.chunk_size)
+    for error in errors[:20]:
+        print(f'Строка {error.row}: {error.message}', file=sys.stderr)
+    if len(errors) > 20:
+        print(f'... и ещё {len(errors) - 20} ошибок', file=sys.stderr)
+    print(f'Ошибок: {len(errors)}')
+
+
+if __name__ == '__main__':
+    main()
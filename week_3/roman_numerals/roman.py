@@ -1,36 +1,356 @@
+import io
+from functools import total_ordering
+from typing import TextIO
+
+# Римские цифры разрядов: индекс - цифра разряда (0..9).
+THOUSANDS = ('', 'M', 'MM', 'MMM')
+HUNDREDS = ('', 'C', 'CC', 'CCC', 'CD', 'D', 'DC', 'DCC', 'DCCC', 'CM')
+TENS = ('', 'X', 'XX', 'XXX', 'XL', 'L', 'LX', 'LXX', 'LXXX', 'XC')
+ONES = ('', 'I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX')
+
+# Значения римских символов:
+ROMAN_VALUES = {'I': 1, 'V': 5, 'X': 10, 'L': 50, 'C': 100, 'D': 500, 'M': 1000}
+
+# Наибольшее число, записываемое римскими цифрами:
+MAX_ROMAN = 3999
+
+# Длина самой длинной записи 1..MAX_ROMAN (MMMDCCCLXXXVIII):
+MAX_NUMERAL_LENGTH = 15
+
+# Черта над символом (комбинируемый надчерк): каждая черта умножает
+# значение символа на 1000, например V̅ = 5000, M̅̅ = 1000000000.
+VINCULUM = '\u0305'
+
+# Наибольшее число черт над символом в расширенной записи:
+MAX_VINCULUM_LEVEL = 2
+
+# Наибольшее число в расширенной записи (MMMCMXCIX с двумя чертами,
+# затем CMXCIX с одной и CMXCIX без черт):
+MAX_EXTENDED_ROMAN = (MAX_ROMAN + 1) * 1000 ** MAX_VINCULUM_LEVEL - 1
+
+# Таблицы str.translate, добавляющие к каждому символу level черт:
+_VINCULUM_TABLES = tuple(
+    {ord(char): char + VINCULUM * level for char in ROMAN_VALUES}
+    for level in range(MAX_VINCULUM_LEVEL + 1)
+)
+
+# Таблицы всех чисел 1..MAX_ROMAN: строится при первом преобразовании.
+_TABLES: tuple[tuple[str, ...], dict[str, int]] | None = None
+
+
+def numeral_tables() -> tuple[tuple[str, ...], dict[str, int]]:
+    """
+    Возвращает таблицы римских чисел, при первом вызове строит их.
+
+    Строка числа n собирается из таблиц разрядов, поэтому построение
+    занимает O(MAX_ROMAN) один раз, а каждое преобразование потом - один
+    доступ к кортежу или словарю.
+
+    Возвращает:
+        tuple[tuple[str, ...], dict[str, int]]: Кортеж строк (индекс -
+            число, нулевой элемент - пустая строка) и словарь строка -> число.
+    """
+    global _TABLES
+    if _TABLES is None:
+        numerals = tuple(
+            THOUSANDS[n // 1000] + HUNDREDS[n // 100 % 10]
+            + TENS[n // 10 % 10] + ONES[n % 10]
+            for n in range(MAX_ROMAN + 1)
+        )
+        _TABLES = (numerals, {numeral: n for n, numeral in enumerate(numerals) if n})
+    return _TABLES
+
+
+def write_roman(num: int, out: TextIO) -> None:
+    """
+    Записывает число в расширенной римской записи в поток out.
+
+    Числа 1..3999 записываются как обычно. Для больших чисел старшая часть
+    n // 1000 записывается так же (рекурсивно) с чертой над каждым
+    символом, а младшие три разряда - без черты: 4000 = I̅V̅,
+    1234567 = M̅C̅C̅X̅X̅X̅I̅V̅DLXVII. Запись разряда берётся из таблицы и
+    передаётся в out.write целиком, без склеивания строк.
+
+    Параметры:
+        num (int): Целое число от 1 до MAX_EXTENDED_ROMAN.
+        out (TextIO): Поток с методом write (файл, io.StringIO и т. п.).
+
+    Исключения:
+        ValueError: Если число вне диапазона 1..MAX_EXTENDED_ROMAN.
+    """
+    numerals = numeral_tables()[0]
+    if 1 <= num <= MAX_ROMAN:
+        out.write(numerals[num])
+        return
+    if not MAX_ROMAN < num <= MAX_EXTENDED_ROMAN:
+        raise ValueError(f"Расширенные римские числа могут быть только в диапазоне от 1 до {MAX_EXTENDED_ROMAN}.")
+    groups = []
+    while num > MAX_ROMAN:
+        num, low = divmod(num, 1000)
+        groups.append(low)
+    out.write(numerals[num].translate(_VINCULUM_TABLES[len(groups)]))
+    for level in range(len(groups) - 1, -1, -1):
+        out.write(numerals[groups[level]].translate(_VINCULUM_TABLES[level]))
+
+
+class RomanParseError(ValueError):
+    """
+    Ошибка строгого разбора римского числа с позицией ошибки.
+
+    Атрибуты:
+        text (str): Разбираемая строка.
+        position (int): Индекс первого недопустимого символа (len(text),
+            если строка оборвалась).
+    """
+
+    def __init__(self, text: str, position: int, message: str) -> None:
+        """
+        Создаёт ошибку.
+
+        Параметры:
+            text (str): Разбираемая строка.
+            position (int): Индекс первого недопустимого символа.
+            message (str): Описание ошибки.
+        """
+        shown = text if len(text) <= 40 else text[:40] + '...'
+        super().__init__(f'{message} (позиция {position} в {shown!r})')
+        self.text = text
+        self.position = position
+
+
+def _build_parser() -> tuple[dict[str, tuple[int, int]], ...]:
+    """
+    Строит конечный автомат строгого разбора из таблиц разрядов.
+
+    Состояние - разряд и уже прочитанная часть его записи (префикс одной из
+    строк THOUSANDS, HUNDREDS, TENS, ONES; у римских цифр любой префикс
+    записи разряда сам является записью цифры). Из состояния можно
+    продолжить запись текущего разряда или начать любой младший разряд.
+    Переход хранит прибавку к значению, поэтому автомат за один проход и
+    проверяет строку, и вычисляет число.
+
+    Возвращает:
+        tuple[dict[str, tuple[int, int]], ...]: Для каждого состояния
+            словарь символ -> (следующее состояние, прибавка к значению).
+            Состояние 0 - начальное.
+    """
+    groups = ((THOUSANDS, 1000), (HUNDREDS, 100), (TENS, 10), (ONES, 1))
+    # Состояния: (номер разряда, префикс) -> номер; 0 - начало строки
+    states = {(-1, ''): 0}
+    for index, (digits, _) in enumerate(groups):
+        for digit in digits[1:]:
+            states.setdefault((index, digit), len(states))
+    transitions: list[dict[str, tuple[int, int]]] = [{} for _ in states]
+    for (index, prefix), state in states.items():
+        current = groups[index][0].index(prefix) * groups[index][1] if index >= 0 else 0
+        # Продолжение записи текущего разряда
+        if index >= 0:
+            for digit, text in enumerate(groups[index][0]):
+                if len(text) == len(prefix) + 1 and text.startswith(prefix):
+                    step = (states[(index, text)], digit * groups[index][1] - current)
+                    transitions[state][text[-1]] = step
+        # Начало записи любого младшего разряда
+        for later in range(index + 1, len(groups)):
+            for digit, text in enumerate(groups[later][0]):
+                if len(text) == 1:
+                    transitions[state].setdefault(text, (states[(later, text)], digit * groups[later][1]))
+    return tuple(transitions)
+
+
+# Интернированные объекты Roman для чисел 1..MAX_ROMAN (создаются по мере
+# обращения):
+_INTERNED: dict = {}
+
+# Автомат строгого разбора: строится при первом строгом разборе.
+_PARSER: tuple[dict[str, tuple[int, int]], ...] | None = None
+
+
+def parse_strict(s: str) -> int:
+    """
+    Строго разбирает римское число 1..3999 за один проход автомата.
+
+    Принимаются только канонические записи, которые выдаёт int_to_roman:
+    "IIII", "VX", "IM" и т. п. отклоняются на первом недопустимом символе,
+    поэтому длинная ошибочная строка отклоняется, не дочитываясь до конца.
+
+    Параметры:
+        s (str): Римское число в виде строки.
+
+    Возвращает:
+        int: Целое число.
+
+    Исключения:
+        RomanParseError: Если строка не является канонической записью
+            (ValueError с позицией ошибки).
+    """
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    parser = _PARSER
+    state = 0
+    total = 0
+    for position, char in enumerate(s):
+        step = parser[state].get(char)
+        if step is None:
+            if char not in ROMAN_VALUES:
+                raise RomanParseError(s, position, f'Недопустимый символ в римском числе: {char}')
+            raise RomanParseError(s, position, f'Символ {char} не может стоять после {s[:position]!r}')
+        state, value = step
+        total += value
+    if not total:
+        raise RomanParseError(s, 0, 'Пустая строка не является римским числом')
+    return total
+
+
+def parse_extended(s: str) -> int:
+    """
+    Строго разбирает римское число в расширенной записи с чертами.
+
+    Строка делится за один проход на группы символов с одинаковым числом
+    черт; число черт должно убывать от группы к группе. Каждая группа
+    ищется в таблице канонических записей (её длина не больше
+    MAX_NUMERAL_LENGTH), поэтому разбор линеен по длине строки и
+    принимает ровно те записи, которые выдаёт write_roman.
+
+    Параметры:
+        s (str): Римское число, возможно с чертами (VINCULUM).
+
+    Возвращает:
+        int: Целое число.
+
+    Исключения:
+        RomanParseError: Если строка не является канонической расширенной
+            записью (ValueError с позицией ошибки).
+    """
+    # Группы символов с одинаковым числом черт: (черт, символы, позиции)
+    groups: list[tuple[int, list[str], list[int]]] = []
+    length = len(s)
+    i = 0
+    while i < length:
+        char = s[i]
+        if char not in ROMAN_VALUES:
+            raise RomanParseError(s, i, f'Недопустимый символ в римском числе: {char}')
+        end = i + 1
+        while end < length and s[end] == VINCULUM:
+            end += 1
+        level = end - i - 1
+        if level > MAX_VINCULUM_LEVEL:
+            raise RomanParseError(s, i, f'Над символом {char} больше {MAX_VINCULUM_LEVEL} черт')
+        if not groups or level < groups[-1][0]:
+            groups.append((level, [], []))
+        elif level > groups[-1][0]:
+            raise RomanParseError(s, i, f'Над символом {char} больше черт, чем над предыдущими')
+        _, chars, positions = groups[-1]
+        if len(chars) == MAX_NUMERAL_LENGTH:
+            raise RomanParseError(s, i, 'Слишком длинная запись разряда')
+        chars.append(char)
+        positions.append(i)
+        i = end
+    if not groups:
+        raise RomanParseError(s, 0, 'Пустая строка не является римским числом')
+
+    table = numeral_tables()[1]
+    total = 0
+    for index, (level, chars, positions) in enumerate(groups):
+        text = ''.join(chars)
+        value = table.get(text)
+        if value is None:
+            try:
+                value = parse_strict(text)
+            except RomanParseError as error:
+                raise RomanParseError(s, positions[error.position], f'Недопустимая запись разряда: {text}') from None
+        if index == 0:
+            if level and value < 4:
+                raise RomanParseError(s, positions[0], f'Число {text} с чертой записывается без неё')
+        elif value > 999:
+            raise RomanParseError(s, positions[0], f'Младший разряд {text} больше 999')
+        total += value * 1000 ** level
+    return total
+
+
+def _roman_of(value: int) -> 'Roman':
+    """Возвращает Roman для результата операции, сначала ищет интернированный."""
+    return _INTERNED.get(value) or Roman(value)
+
+
+@total_ordering
 class Roman:
     """
     Класс Roman представляет римское число и поддерживает основные арифметические операции:
     сложение (+), вычитание (-), умножение (*) и деление (/).
 
+    Объект неизменяемый и хранит только значение и строку числа в
+    __slots__ (без __dict__). Объекты можно сравнивать, сортировать и
+    использовать как ключи словаря (Roman(5) == 5, hash(Roman(5)) == hash(5)).
+    Числа 1..3999 интернируются: Roman(10) is Roman("X"), поэтому
+    арифметика в этом диапазоне не создаёт новых объектов.
+
     Атрибуты:
         value (int): Целое число, представляющее значение римского числа.
 
     Методы:
-        __init__: Инициализирует объект Roman.
-        __add__: Реализует операцию сложения.
-        __sub__: Реализует операцию вычитания.
-        __mul__: Реализует операцию умножения.
-        __truediv__: Реализует операцию деления.
+        __new__: Создаёт объект Roman (или возвращает интернированный).
+        __add__, __radd__: Реализуют операцию сложения.
+        __sub__, __rsub__: Реализуют операцию вычитания.
+        __mul__, __rmul__: Реализуют операцию умножения.
+        __truediv__, __rtruediv__: Реализуют операцию деления.
+        __eq__, __lt__, __hash__: Сравнение и хеширование по значению.
         __str__: Возвращает строковое представление римского числа.
         roman_to_int: Преобразует римское число (строку) в целое число.
         int_to_roman: Преобразует целое число в римское число (строку).
     """
 
-    def __init__(self, value: str | int) -> None:
+    __slots__ = ('_value', '_numeral')
+
+    def __new__(cls, value: 'str | int | Roman', strict: bool = False) -> 'Roman':
         """
-        Инициализирует объект Roman.
+        Создаёт объект Roman.
 
         Параметры:
-            value (str | int): Римское число в виде строки (например, "X") или целое число (например, 10).
+            value (str | int | Roman): Римское число в виде строки (например, "X") или целое число (например, 10).
+            strict (bool): Принимать только канонические записи (см. parse_strict).
+
+        Возвращает:
+            Roman: Новый объект или интернированный объект того же значения.
 
         Исключения:
             ValueError: Если переданная строка не является допустимым римским числом.
         """
         if isinstance(value, str):
-            self.value = self.roman_to_int(value)
-        else:
-            self.value = value
+            value = cls.roman_to_int(value, strict)
+        elif isinstance(value, Roman):
+            value = value._value
+        if cls is Roman and type(value) is int and 1 <= value <= MAX_ROMAN:
+            interned = _INTERNED.get(value)
+            if interned is None:
+                interned = _INTERNED[value] = cls._make(value)
+            return interned
+        return cls._make(value)
+
+    @classmethod
+    def _make(cls, value: int) -> 'Roman':
+        """Создаёт новый объект без разбора и интернирования."""
+        self = object.__new__(cls)
+        object.__setattr__(self, '_value', value)
+        object.__setattr__(self, '_numeral', None)
+        return self
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Запрещает изменение объекта."""
+        raise AttributeError(f'Объект Roman неизменяем: нельзя задать {name}')
+
+    def __delattr__(self, name: str) -> None:
+        """Запрещает изменение объекта."""
+        raise AttributeError(f'Объект Roman неизменяем: нельзя удалить {name}')
+
+    def __reduce__(self) -> tuple:
+        """Позволяет копировать и сериализовать объект (pickle, copy)."""
+        return (Roman, (self._value,))
+
+    @property
+    def value(self) -> int:
+        """Целое число, представляющее значение римского числа."""
+        return self._value
 
     def __add__(self, other: 'Roman | int') -> 'Roman':
         """
@@ -43,9 +363,16 @@ class Roman:
             Roman: Новый объект Roman, представляющий сумму.
         """
         if isinstance(other, Roman):
-            return Roman(self.value + other.value)
-        else:
-            return Roman(self.value + other)
+            return _roman_of(self._value + other._value)
+        if isinstance(other, int):
+            return _roman_of(self._value + other)
+        return NotImplemented
+
+    def __radd__(self, other: int) -> 'Roman':
+        """Реализует сложение с числом слева (например, sum(список Roman))."""
+        if isinstance(other, int):
+            return _roman_of(other + self._value)
+        return NotImplemented
 
     def __sub__(self, other: 'Roman | int') -> 'Roman':
         """
@@ -58,9 +385,16 @@ class Roman:
             Roman: Новый объект Roman, представляющий разность.
         """
         if isinstance(other, Roman):
-            return Roman(self.value - other.value)
-        else:
-            return Roman(self.value - other)
+            return _roman_of(self._value - other._value)
+        if isinstance(other, int):
+            return _roman_of(self._value - other)
+        return NotImplemented
+
+    def __rsub__(self, other: int) -> 'Roman':
+        """Реализует вычитание из числа (число - Roman)."""
+        if isinstance(other, int):
+            return _roman_of(other - self._value)
+        return NotImplemented
 
     def __mul__(self, other: 'Roman | int') -> 'Roman':
         """
@@ -73,9 +407,16 @@ class Roman:
             Roman: Новый объект Roman, представляющий произведение.
         """
         if isinstance(other, Roman):
-            return Roman(self.value * other.value)
-        else:
-            return Roman(self.value * other)
+            return _roman_of(self._value * other._value)
+        if isinstance(other, int):
+            return _roman_of(self._value * other)
+        return NotImplemented
+
+    def __rmul__(self, other: int) -> 'Roman':
+        """Реализует умножение числа на Roman."""
+        if isinstance(other, int):
+            return _roman_of(other * self._value)
+        return NotImplemented
 
     def __truediv__(self, other: 'Roman | int') -> 'Roman':
         """
@@ -88,34 +429,106 @@ class Roman:
             Roman: Новый объект Roman, представляющий результат деления (целочисленное деление).
         """
         if isinstance(other, Roman):
-            return Roman(self.value // other.value)
-        else:
-            return Roman(self.value // other)
+            return _roman_of(self._value // other._value)
+        if isinstance(other, int):
+            return _roman_of(self._value // other)
+        return NotImplemented
+
+    def __rtruediv__(self, other: int) -> 'Roman':
+        """Реализует деление числа на Roman (целочисленное)."""
+        if isinstance(other, int):
+            return _roman_of(other // self._value)
+        return NotImplemented
+
+    def __eq__(self, other: object) -> bool:
+        """Сравнивает значения с объектом Roman или целым числом."""
+        if isinstance(other, Roman):
+            return self._value == other._value
+        if isinstance(other, int):
+            return self._value == other
+        return NotImplemented
+
+    def __lt__(self, other: 'Roman | int') -> bool:
+        """Сравнивает значения с объектом Roman или целым числом."""
+        if isinstance(other, Roman):
+            return self._value < other._value
+        if isinstance(other, int):
+            return self._value < other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """Возвращает хеш значения (совпадает с хешем равного int)."""
+        return hash(self._value)
+
+    def __int__(self) -> int:
+        """Возвращает значение как int."""
+        return self._value
+
+    def __repr__(self) -> str:
+        """Возвращает запись вида Roman(14)."""
+        return f'Roman({self._value!r})'
 
     def __str__(self) -> str:
         """
         Возвращает строковое представление римского числа.
 
+        Строка вычисляется при первом вызове и запоминается в объекте.
+        Числа больше 3999 записываются с чертами (V̅ = 5000).
+
         Возвращает:
             str: Римское число в виде строки.
         """
-        return self.int_to_roman(self.value)
+        numeral = self._numeral
+        if numeral is None:
+            numeral = self.int_to_roman(self._value, extended=True)
+            object.__setattr__(self, '_numeral', numeral)
+        return numeral
 
     @staticmethod
-    def roman_to_int(s: str) -> int:
+    def roman_to_int(s: str, strict: bool = False) -> int:
         """
         Преобразует римское число (строку) в целое число.
 
+        Правильно записанные числа 1..3999 находятся в таблице за O(1).
+        Записи с чертами (например, "V̅") разбираются parse_extended.
+        Остальные строки (например, "IIII") разбираются посимвольно,
+        как и раньше, а в строгом режиме отклоняются с позицией ошибки.
+
         Параметры:
             s (str): Римское число в виде строки (например, "XIV").
+            strict (bool): Принимать только канонические записи.
 
         Возвращает:
             int: Целое число, соответствующее римскому числу.
 
+        Исключения:
+            ValueError: Если строка содержит недопустимые символы (в строгом
+                режиме - RomanParseError, если запись не каноническая).
+        """
+        value = numeral_tables()[1].get(s)
+        if value is not None:
+            return value
+        if VINCULUM in s:
+            return parse_extended(s)
+        if strict:
+            return parse_strict(s)
+        return Roman._scan_roman(s)
+
+    @staticmethod
+    def _scan_roman(s: str) -> int:
+        """
+        Разбирает римское число посимвольно справа налево.
+
+        Параметры:
+            s (str): Римское число в виде строки.
+
+        Возвращает:
+            int: Целое число (символ меньше следующего вычитается).
+
         Исключения:
             ValueError: Если строка содержит недопустимые символы.
         """
-        roman_dict = {'I': 1, 'V': 5, 'X': 10, 'L': 50, 'C': 100, 'D': 500, 'M': 1000}
+        roman_dict = ROMAN_VALUES
         total = 0
         prev_value = 0
         for char in reversed(s):
@@ -130,39 +543,28 @@ class Roman:
         return total
 
     @staticmethod
-    def int_to_roman(num: int) -> str:
+    def int_to_roman(num: int, extended: bool = False) -> str:
         """
         Преобразует целое число в римское число (строку).
 
+        Строка берётся из заранее построенной таблицы за O(1). Числа больше
+        3999 с extended=True записываются с чертами (см. write_roman).
+
         Параметры:
             num (int): Целое число для преобразования.
+            extended (bool): Разрешить числа до MAX_EXTENDED_ROMAN.
 
         Возвращает:
             str: Римское число в виде строки.
 
         Исключения:
-            ValueError: Если число меньше 1 или больше 3999.
-        """
-        if not 1 <= num <= 3999:
-            raise ValueError("Римские числа могут быть только в диапазоне от 1 до 3999.")
-
-        val = [
-            1000, 900, 500, 400,
-            100, 90, 50, 40,
-            10, 9, 5, 4,
-            1
-        ]
-        syms = [
-            "M", "CM", "D", "CD",
-            "C", "XC", "L", "XL",
-            "X", "IX", "V", "IV",
-            "I"
-        ]
-        roman_num = ''
-        i = 0
-        while num > 0:
-            for _ in range(num // val[i]):
-                roman_num += syms[i]
-                num -= val[i]
-            i += 1
-        return roman_num
+            ValueError: Если число меньше 1 или больше 3999 (с extended=True -
+                больше MAX_EXTENDED_ROMAN).
+        """
+        if not 1 <= num <= MAX_ROMAN:
+            if not extended:
+                raise ValueError("Римские числа могут быть только в диапазоне от 1 до 3999.")
+            out = io.StringIO()
+            write_roman(num, out)
+            return out.getvalue()
+        return numeral_tables()[0][num]